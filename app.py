@@ -1,8 +1,19 @@
-import tkinter as tk
-from ui.main_menu import MainMenu
+import sys
+from startup_trace import StartupTrace
+
+# Started before the imports so they are part of the trace
+trace = StartupTrace()
+
+import tkinter as tk  # noqa: E402
+trace.mark("import tkinter")
+import config  # noqa: E402
+import metrics  # noqa: E402
+from ui.main_menu import MainMenu  # noqa: E402
+trace.mark("import menu")
 
 def main():
     root = tk.Tk()
+    trace.mark("create window")
     root.title("Sequence Challenge Game")
 
     try:
@@ -11,8 +22,23 @@ def main():
         root.geometry(
             f"{root.winfo_screenwidth()}x{root.winfo_screenheight()-50}"
         )
+    trace.mark("size window")
 
     MainMenu(root)
+    trace.mark("build menu")
+
+    if config.METRICS_PORT:
+        metrics.serve_metrics(config.METRICS_PORT)
+        metrics.watch_event_loop(root)
+
+    if config.STARTUP_TRACE_FILE or "--trace-startup" in sys.argv:
+        def first_frame():
+            # Idle callbacks run after the pending redraws of the first frame
+            root.update_idletasks()
+            trace.mark("first frame")
+            trace.report(config.STARTUP_TRACE_FILE,
+                         sys.stderr if "--trace-startup" in sys.argv else None)
+        root.after_idle(first_frame)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -66,6 +66,10 @@ SIMILAR_MAP = {
 
 
 LEADERBOARD_FILE = "leaderboard.json"
+# Append-only leaderboard log (adds and delete tombstones), compacted once
+# tombstones outnumber live entries and LEADERBOARD_COMPACT_MIN
+LEADERBOARD_LOG_FILE = "leaderboard.log"
+LEADERBOARD_COMPACT_MIN = 100
 
 CHARSETS = {
     "Letters": string.ascii_letters,
@@ -73,4 +77,71 @@ CHARSETS = {
     "Alphanumeric": string.ascii_letters + string.digits,
 }
 
-QUESTIONS_PER_LEVEL = 5
\ No newline at end of file
+QUESTIONS_PER_LEVEL = 5
+
+# Sequence lengths per level for each challenge schedule
+LEVEL_SCHEDULES = {
+    "Standard": [10, 15, 20],
+    "Stress": [500, 1500, 3000],
+}
+
+# Long sequences are displayed in fixed-width rows
+SEQUENCE_WRAP_WIDTH = 100
+SEQUENCE_MAX_ROWS = 15
+
+QUESTION_BANK_FILE = "question_bank.bin"
+QUESTION_BANK_LENGTHS = [5, 10, 15, 20]
+
+DAILY_LEADERBOARD_DIR = "daily_leaderboards"
+DAILY_RETENTION_DAYS = 30
+
+SPRINT_SECONDS = 60
+SPRINT_LENGTH = 10
+SPRINT_RING_SIZE = 32
+
+# Changed positions beyond this many share the last histogram bucket
+CONFUSION_POSITIONS = 32
+
+PROFILES_DIR = "profiles"
+
+EVENT_LOG_FILE = "events.ndjson"
+
+# Most points drawn in a Trends chart, longer histories are downsampled
+TREND_MAX_POINTS = 200
+# Daily trend buckets kept, counted back from the newest; weekly ones are kept for good
+ROLLUP_DAILY_DAYS = 90
+
+# Optional shared score server for a kiosk fleet, e.g. "http://127.0.0.1:8765".
+# None keeps scores local only.
+SCORE_SERVER_URL = None
+SCORE_OUTBOX_FILE = "score_outbox.ndjson"
+SCORE_SERVER_TOP_K = 100
+SCORE_SNAPSHOT_FILE = "score_server_snapshot.json"
+SCORE_SNAPSHOT_SECONDS = 30
+
+# Serve Prometheus metrics on http://127.0.0.1:<port>/metrics, e.g. 9464.
+# None disables the endpoint.
+METRICS_PORT = None
+
+# Append each start's time-to-first-frame by phase to this file as a JSON
+# line, e.g. "startup_trace.ndjson". None disables it; `python app.py
+# --trace-startup` prints the same breakdown instead.
+STARTUP_TRACE_FILE = None
+
+# Challenge and practice sessions are recorded here for tools.replay_sessions.
+# Day files older than RECORDING_RETENTION_DAYS move to monthly zip archives.
+RECORDINGS_DIR = "recordings"
+RECORD_SESSIONS = True
+RECORDING_RETENTION_DAYS = 30
+
+# Drill mode: sequence length (one item per substitution and position) and
+# how many saved updates are kept before a player's drill state is compacted
+DRILL_LENGTH = 10
+DRILL_COMPACT_MIN = 500
+
+# Difficulty table written by tools.calibrate_difficulty. With target
+# accuracies set, e.g. [0.9, 0.8, 0.7], the Standard challenge picks level
+# lengths from the table so an average player scores about that on each
+# level; None keeps LEVEL_SCHEDULES.
+CALIBRATION_FILE = "calibration.json"
+LEVEL_TARGET_ACCURACY = None
@@ -0,0 +1,105 @@
+import json
+import os
+import zipfile
+from datetime import date, datetime, timedelta
+from config import DAILY_LEADERBOARD_DIR, DAILY_RETENTION_DAYS
+from data.file_lock import file_lock, atomic_write_json
+from metrics import STORE_WRITE_SECONDS
+
+ARCHIVE_DIR = os.path.join(DAILY_LEADERBOARD_DIR, "archive")
+# One lock for the store: adds read-modify-write a partition and may rotate others
+STORE_LOCK = os.path.join(DAILY_LEADERBOARD_DIR, "store")
+
+
+def partition_path(day):
+    """Path of the leaderboard partition for one day."""
+    return os.path.join(DAILY_LEADERBOARD_DIR, f"{day.isoformat()}.json")
+
+
+def load_daily_leaderboard(day=None):
+    """Load one day's leaderboard (defaults to today). Only that partition is read."""
+    path = partition_path(day or date.today())
+    if os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except:  # noqa: E722
+            return []
+    return []
+
+
+def save_daily_leaderboard(leaderboard, day=None):
+    """Save one day's leaderboard partition."""
+    os.makedirs(DAILY_LEADERBOARD_DIR, exist_ok=True)
+    atomic_write_json(partition_path(day or date.today()), leaderboard)
+
+
+def rotate_daily_leaderboards(today=None):
+    """
+    Move partitions older than DAILY_RETENTION_DAYS into monthly zip archives.
+
+    Archived days are stored as archive/YYYY-MM.zip members named after the
+    partition, so old boards stay available without being scanned again.
+    """
+    if not os.path.isdir(DAILY_LEADERBOARD_DIR):
+        return
+    cutoff = (today or date.today()) - timedelta(days=DAILY_RETENTION_DAYS)
+
+    for name in os.listdir(DAILY_LEADERBOARD_DIR):
+        if not name.endswith(".json"):
+            continue
+        try:
+            day = date.fromisoformat(name[:-len(".json")])
+        except ValueError:
+            continue
+        if day >= cutoff:
+            continue
+
+        os.makedirs(ARCHIVE_DIR, exist_ok=True)
+        path = os.path.join(DAILY_LEADERBOARD_DIR, name)
+        archive = os.path.join(ARCHIVE_DIR, f"{day:%Y-%m}.zip")
+        with zipfile.ZipFile(archive, 'a', compression=zipfile.ZIP_DEFLATED) as zf:
+            if name not in zf.namelist():
+                zf.write(path, arcname=name)
+        os.remove(path)
+
+
+def add_to_daily_leaderboard(username, accuracy, avg_time, detailed_results=None, day=None):
+    """
+    Add a score to a day's leaderboard partition.
+
+    The first score of a new day also rotates old partitions into the archive.
+
+    Args:
+        username: Player's username
+        accuracy: Accuracy percentage
+        avg_time: Average time in milliseconds
+        detailed_results: List of detailed results for each question
+        day: Day of the challenge (defaults to today)
+
+    Returns:
+        (rank, total) of the new entry on that day's board
+    """
+    day = day or date.today()
+
+    entry = {
+        'username': username,
+        'accuracy': accuracy,
+        'avg_time': avg_time,
+        'timestamp': datetime.now().isoformat(),
+        'detailed_results': detailed_results or []
+    }
+
+    os.makedirs(DAILY_LEADERBOARD_DIR, exist_ok=True)
+    with STORE_WRITE_SECONDS.labels("daily").time(), file_lock(STORE_LOCK):
+        if not os.path.exists(partition_path(day)):
+            rotate_daily_leaderboards(day)
+
+        leaderboard = load_daily_leaderboard(day)
+        leaderboard.append(entry)
+
+        # Same ordering as the main leaderboard
+        leaderboard.sort(key=lambda x: (-x['accuracy'], x['avg_time']))
+
+        save_daily_leaderboard(leaderboard, day)
+    return leaderboard.index(entry) + 1, len(leaderboard)
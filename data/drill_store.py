@@ -0,0 +1,138 @@
+import base64
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+from config import DRILL_LENGTH, DRILL_COMPACT_MIN
+from data.file_lock import file_lock, atomic_write_json
+from data.profile_store import player_drill_path
+from logic.drill import DrillScheduler, drill_items, item_priority, STRIDE, DUE
+from metrics import STORE_WRITE_SECONDS
+
+# A player's drill state is a snapshot plus an append-only update log:
+#   <name>.json      keys, state array (base64 little-endian doubles), generation
+#   <name>.<gen>.log one fixed-size record per answer: item, due, interval,
+#                    easiness, repetitions
+# Answers only append a record. When the log outgrows the item count the
+# snapshot is rewritten under a new generation and the old log removed, so
+# a crash in between never applies a log to the wrong snapshot.
+UPDATE = struct.Struct("<IdffH")
+
+
+def _encode(state):
+    if sys.byteorder != "little":
+        state = array("d", state)
+        state.byteswap()
+    return base64.b64encode(state.tobytes()).decode("ascii")
+
+
+def _decode(text):
+    state = array("d")
+    state.frombytes(base64.b64decode(text))
+    if sys.byteorder != "little":
+        state.byteswap()
+    return state
+
+
+class DrillStore:
+    def __init__(self, username, confusion=None, length=DRILL_LENGTH, now=None):
+        """
+        Load (or create) a player's drill schedule.
+
+        Items missing from the saved state (a new player, or new entries in
+        SIMILAR_MAP) are added in order of the player's recorded mistakes.
+
+        Args:
+            username: Player
+            confusion: Player's ConfusionMatrix used to prioritise new items, or None
+            length: Drill sequence length, one item per position
+            now: Current time (defaults to time.time())
+        """
+        now = now or time.time()
+        self.base = player_drill_path(username)
+        self.snapshot_path = self.base + ".json"
+        self.generation, keys, state, self.logged = self._load()
+
+        current = drill_items(length)
+        present = set(current)
+        retired = 0
+        for i, key in enumerate(keys):
+            if key not in present and state[i * STRIDE + DUE]:
+                # No longer drillable; dropped at the next compaction
+                state[i * STRIDE + DUE] = 0
+                retired += 1
+        self.scheduler = DrillScheduler(keys, state)
+        new = [key for key in current if key not in self.scheduler.index]
+        if new:
+            self.scheduler.add_items(new, [item_priority(key, confusion) for key in new], now)
+        if new or retired:
+            self.compact()
+
+    def log_path(self):
+        return f"{self.base}.{self.generation}.log"
+
+    def _load(self):
+        """Returns (generation, keys, state array, number of log records applied)."""
+        if not os.path.exists(self.snapshot_path):
+            return 0, [], array("d"), 0
+        try:
+            with open(self.snapshot_path, 'r') as f:
+                snapshot = json.load(f)
+            generation, keys, state = snapshot["generation"], snapshot["keys"], _decode(snapshot["state"])
+        except:  # noqa: E722
+            return 0, [], array("d"), 0
+        if len(state) != STRIDE * len(keys):
+            return 0, [], array("d"), 0
+
+        applied = 0
+        try:
+            with open(f"{self.base}.{generation}.log", 'rb') as f:
+                data = f.read()
+        except OSError:
+            data = b""
+        # A partial record at the end is an interrupted write
+        for offset in range(0, len(data) - UPDATE.size + 1, UPDATE.size):
+            i, due, interval, easiness, repetitions = UPDATE.unpack_from(data, offset)
+            if i < len(keys):
+                state[i * STRIDE:(i + 1) * STRIDE] = array("d", (due, interval, easiness, repetitions))
+                applied += 1
+        return generation, keys, state, applied
+
+    def record(self, i):
+        """Persist item `i`'s current state by appending one update record."""
+        due, interval, easiness, repetitions = self.scheduler.state[i * STRIDE:(i + 1) * STRIDE]
+        path = self.log_path()
+        with STORE_WRITE_SECONDS.labels("drill").time(), file_lock(self.base):
+            with open(path, 'ab') as f:
+                f.write(UPDATE.pack(i, due, interval, easiness, int(repetitions)))
+        self.logged += 1
+        if self.logged >= max(DRILL_COMPACT_MIN, len(self.scheduler)):
+            self.compact()
+
+    def compact(self):
+        """Rewrite the snapshot without retired items and start a new, empty log."""
+        scheduler = self.scheduler
+        live = [i for i in range(len(scheduler)) if scheduler.state[i * STRIDE + DUE]]
+        keys = [scheduler.keys[i] for i in live]
+        state = array("d")
+        for i in live:
+            state.extend(scheduler.state[i * STRIDE:(i + 1) * STRIDE])
+
+        old_log = self.log_path()
+        generation = self.generation + 1
+        os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+        # One lock for the snapshot and every generation of the log
+        with STORE_WRITE_SECONDS.labels("drill").time(), file_lock(self.base):
+            atomic_write_json(self.snapshot_path, {
+                "generation": generation,
+                "keys": keys,
+                "state": _encode(state),
+            }, None)
+            if os.path.exists(old_log):
+                os.remove(old_log)
+        self.generation = generation
+        self.logged = 0
+        if len(live) != len(scheduler):
+            self.scheduler = DrillScheduler(keys, state)
@@ -0,0 +1,133 @@
+import json
+import os
+import uuid
+from datetime import datetime
+from config import EVENT_LOG_FILE
+from data.file_lock import file_lock
+from metrics import STORE_WRITE_SECONDS
+
+
+def new_session_id():
+    """Short random id grouping the answers of one game session."""
+    return uuid.uuid4().hex[:12]
+
+
+def answer_event(mode, session, user, question, level, seq_a, seq_b,
+                 correct_answer, user_guess, elapsed):
+    """
+    Build an answer event.
+
+    Args:
+        mode: "challenge", "daily", "stress", "sprint", "practice" or "drill"
+        session: Session id from new_session_id
+        user: Player's username, or None for anonymous modes
+        question: 0-based question number within the session
+        level: 0-based level index, or None for modes without levels
+        seq_a: First sequence (string)
+        seq_b: Second sequence (string)
+        correct_answer: True if the sequences differ
+        user_guess: True if the player answered "different"
+        elapsed: Response time in seconds
+    """
+    return {
+        'type': 'answer',
+        'ts': datetime.now().isoformat(),
+        'mode': mode,
+        'session': session,
+        'user': user,
+        'question': question,
+        'level': level,
+        'seq_a': seq_a,
+        'seq_b': seq_b,
+        'correct_answer': correct_answer,
+        'user_guess': user_guess,
+        'elapsed': elapsed,
+    }
+
+
+def session_event(mode, session, user, questions):
+    """Build the event closing a finished session."""
+    return {
+        'type': 'session',
+        'ts': datetime.now().isoformat(),
+        'mode': mode,
+        'session': session,
+        'user': user,
+        'questions': questions,
+    }
+
+
+def append_events(events, path=EVENT_LOG_FILE):
+    """
+    Append events to the log, one JSON object per line.
+
+    The batch is written with one call under the log's lock, so batches
+    from several game instances never interleave.
+    """
+    data = "".join(json.dumps(event, separators=(",", ":")) + "\n" for event in events).encode('utf-8')
+    with STORE_WRITE_SECONDS.labels("events").time(), file_lock(path):
+        with open(path, 'ab') as f:
+            f.write(data)
+
+
+def append_event(event, path=EVENT_LOG_FILE):
+    """Append a single event to the log."""
+    append_events([event], path)
+
+
+def log_size(path=EVENT_LOG_FILE):
+    """Current size of the log in bytes (the offset after the last event)."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def read_events(start=0, end=None, path=EVENT_LOG_FILE):
+    """
+    Read events from a byte offset.
+
+    A trailing line without a newline is still being written and is left
+    for the next read.
+
+    Yields:
+        (offset after the event, event)
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb') as f:
+        f.seek(start)
+        offset = start
+        for line in f:
+            if end is not None and offset >= end:
+                break
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            yield offset, event
+
+
+def split_ranges(parts, path=EVENT_LOG_FILE):
+    """
+    Split the log into about `parts` byte ranges that start on line boundaries.
+
+    Returns:
+        List of (start, end) offsets covering the whole log
+    """
+    size = log_size(path)
+    if size == 0:
+        return []
+    bounds = [0]
+    with open(path, 'rb') as f:
+        for i in range(1, parts):
+            f.seek(size * i // parts)
+            f.readline()
+            position = min(f.tell(), size)
+            if position > bounds[-1]:
+                bounds.append(position)
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
@@ -0,0 +1,50 @@
+import json
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, writes are still atomic renames
+    fcntl = None
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Hold an exclusive advisory lock for `path` while the block runs.
+
+    The lock is taken on a separate `path`.lock file, so the data file
+    itself can be replaced by a rename while locked. Locks are not
+    re-entrant: do not take the same lock twice in one process.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(path + ".lock", 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def file_version(path):
+    """Version token of a file, (mtime_ns, size), or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def atomic_write(path, data):
+    """Write bytes to a temporary file and rename it over `path`."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def atomic_write_json(path, obj, indent=2):
+    """Write JSON atomically, readers see either the old or the new file."""
+    atomic_write(path, json.dumps(obj, indent=indent).encode('utf-8'))
@@ -1,51 +1,242 @@
+import hashlib
 import json
 import os
+import uuid
 from datetime import datetime
+from config import LEADERBOARD_LOG_FILE, LEADERBOARD_COMPACT_MIN
+from logic.rank_index import RankIndex
+from data.file_lock import file_lock, atomic_write
+from data.score_client import submit_score
+from metrics import STORE_WRITE_SECONDS
 
 LEADERBOARD_FILE = "leaderboard.json"
 
-def load_leaderboard():
-    """Load leaderboard from file."""
-    if os.path.exists(LEADERBOARD_FILE):
+# Summary fields kept in memory for every entry; detailed results stay on disk
+SUMMARY_FIELDS = ('id', 'username', 'accuracy', 'avg_time', 'timestamp')
+
+# In-memory id index over the log, extended as the log grows:
+# id -> (offset, length, summary) of the entry's add record
+_index = {}
+_index_state = {'inode': None, 'size': 0, 'dead': 0}
+# Quantized scores of every live entry, kept in step with the index
+_ranks = RankIndex()
+
+def entry_id(entry):
+    """
+    Stable id of a leaderboard entry.
+
+    Entries saved before ids existed get one derived from their username
+    and timestamp, so it stays the same across loads.
+    """
+    if 'id' not in entry:
+        key = f"{entry['username']}|{entry.get('timestamp', '')}"
+        entry['id'] = hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+    return entry['id']
+
+def _summary(entry):
+    return {field: entry.get(field) for field in SUMMARY_FIELDS}
+
+def _record(op, **fields):
+    return (json.dumps({'op': op, **fields}, separators=(",", ":")) + "\n").encode('utf-8')
+
+def _write_log(entries):
+    """Rewrite the log with only the given entries. Caller holds the log lock."""
+    data = b"".join(_record('add', entry=entry) for entry in entries)
+    with STORE_WRITE_SECONDS.labels("leaderboard").time():
+        atomic_write(LEADERBOARD_LOG_FILE, data)
+
+def _migrate():
+    """Import the old leaderboard.json into the log the first time the log is used."""
+    if os.path.exists(LEADERBOARD_LOG_FILE) or not os.path.exists(LEADERBOARD_FILE):
+        return
+    with file_lock(LEADERBOARD_LOG_FILE):
+        # Another instance may have migrated while we waited
+        if os.path.exists(LEADERBOARD_LOG_FILE):
+            return
         try:
             with open(LEADERBOARD_FILE, 'r') as f:
-                return json.load(f)
+                entries = json.load(f)
         except:  # noqa: E722
-            return []
-    return []
+            entries = []
+        for entry in entries:
+            entry_id(entry)
+        _write_log(entries)
+
+def _reset_index(inode):
+    global _ranks
+    _index.clear()
+    _index_state.update(inode=inode, size=0, dead=0)
+    _ranks = RankIndex()
+
+def _load_index():
+    """
+    Bring the id index up to date with the log and return it.
+
+    Only records appended since the last call are read. A log that was
+    replaced (compacted or cleared) is indexed again from the start.
+    """
+    _migrate()
+    try:
+        stat = os.stat(LEADERBOARD_LOG_FILE)
+    except OSError:
+        _reset_index(None)
+        return _index
+
+    if stat.st_ino != _index_state['inode'] or stat.st_size < _index_state['size']:
+        _reset_index(stat.st_ino)
+    if stat.st_size == _index_state['size']:
+        return _index
+
+    # Scores are applied to the rank index in one batch after reading
+    added, removed = [], []
+    with open(LEADERBOARD_LOG_FILE, 'rb') as f:
+        f.seek(_index_state['size'])
+        offset = _index_state['size']
+        for line in f:
+            if not line.endswith(b"\n"):
+                # Still being written, read it next time
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = {}
+            if record.get('op') == 'add':
+                entry = record['entry']
+                _index[entry['id']] = (offset, len(line), _summary(entry))
+                added.append((entry['accuracy'], entry['avg_time']))
+            elif record.get('op') == 'delete':
+                location = _index.pop(record['id'], None)
+                if location is not None:
+                    removed.append((location[2]['accuracy'], location[2]['avg_time']))
+                    _index_state['dead'] += 1
+            offset += len(line)
+        _index_state['size'] = offset
+    if added or removed:
+        _ranks.update(added, removed)
+    return _index
+
+def load_leaderboard():
+    """
+    Load the leaderboard.
+
+    Returns:
+        Entry summaries (without detailed results), best first
+    """
+    summaries = [summary for _, _, summary in _load_index().values()]
+    summaries.sort(key=lambda x: (-x['accuracy'], x['avg_time'], x['timestamp'] or ''))
+    return summaries
+
+def get_entry(target_id):
+    """
+    Load one full entry, including its detailed results.
+
+    Only that entry's record is read from the log.
+
+    Returns:
+        The entry, or None if it does not exist or was deleted
+    """
+    location = _load_index().get(target_id)
+    if location is None:
+        return None
+    offset, length, _ = location
+    with open(LEADERBOARD_LOG_FILE, 'rb') as f:
+        f.seek(offset)
+        return json.loads(f.read(length))['entry']
+
+def leaderboard_rank(target_id):
+    """
+    Rank of one entry among every score on the board.
+
+    Answered from the in-memory rank index in O(log n), without loading
+    any entries.
+
+    Returns:
+        (rank, total, percent of the other runs beaten), or None if the
+        entry does not exist
+    """
+    location = _load_index().get(target_id)
+    if location is None:
+        return None
+    summary = location[2]
+    return _ranks.rank(summary['accuracy'], summary['avg_time'])
 
 def save_leaderboard(leaderboard):
-    """Save leaderboard to file."""
-    with open(LEADERBOARD_FILE, 'w') as f:
-        json.dump(leaderboard, f, indent=2)
+    """Replace the whole leaderboard with the given entries (used to clear it)."""
+    for entry in leaderboard:
+        entry_id(entry)
+    with file_lock(LEADERBOARD_LOG_FILE):
+        _write_log(leaderboard)
+
+def _append(data):
+    with STORE_WRITE_SECONDS.labels("leaderboard").time(), file_lock(LEADERBOARD_LOG_FILE):
+        with open(LEADERBOARD_LOG_FILE, 'a+b') as f:
+            # A torn earlier write leaves a line without its newline; end it
+            # so this record is not glued onto the fragment and lost with it
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    data = b"\n" + data
+            f.write(data)
 
 def add_to_leaderboard(username, accuracy, avg_time, detailed_results=None):
     """
     Add a score to the leaderboard.
-    
+
     Args:
         username: Player's username
         accuracy: Accuracy percentage
         avg_time: Average time in milliseconds
         detailed_results: List of detailed results for each question
+
+    Returns:
+        Id of the new entry
     """
-    leaderboard = load_leaderboard()
-    
+    _load_index()
+
     entry = {
+        'id': uuid.uuid4().hex[:12],
         'username': username,
         'accuracy': accuracy,
         'avg_time': avg_time,
         'timestamp': datetime.now().isoformat(),
         'detailed_results': detailed_results or []
     }
-    
-    leaderboard.append(entry)
-    
-    # Sort by accuracy (descending), then by avg_time (ascending - faster is better)
-    leaderboard.sort(key=lambda x: (-x['accuracy'], x['avg_time']))
-    
-    # Keep only top 50 scores
-    if len(leaderboard) > 50:
-        leaderboard = leaderboard[:50]
-    
-    save_leaderboard(leaderboard)
\ No newline at end of file
+
+    _append(_record('add', entry=entry))
+    # Also queue it for the fleet score server, if configured (never blocks)
+    submit_score(_summary(entry))
+
+    # Deletes are only tombstones; drop them once they outnumber live entries
+    if _index_state['dead'] >= max(LEADERBOARD_COMPACT_MIN, len(_index)):
+        compact_leaderboard()
+    return entry['id']
+
+def delete_from_leaderboard(target_id):
+    """
+    Delete one entry by id by appending a tombstone to the log.
+
+    Returns:
+        True if an entry was deleted
+    """
+    if target_id not in _load_index():
+        return False
+    _append(_record('delete', id=target_id, ts=datetime.now().isoformat()))
+    return True
+
+def compact_leaderboard():
+    """
+    Rewrite the log without deleted entries and tombstones.
+
+    Returns:
+        Number of live entries kept
+    """
+    with file_lock(LEADERBOARD_LOG_FILE):
+        # Index under the lock so records appended by other instances are kept
+        index = _load_index()
+        with open(LEADERBOARD_LOG_FILE, 'rb') as f:
+            live = []
+            for offset, length, _ in sorted(index.values(), key=lambda location: location[0]):
+                f.seek(offset)
+                live.append(f.read(length))
+        atomic_write(LEADERBOARD_LOG_FILE, b"".join(live))
+    return len(live)
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+from config import PROFILES_DIR
+from data.file_lock import file_lock, file_version, atomic_write_json
+from metrics import STORE_WRITE_SECONDS
+
+INDEX_FILE = os.path.join(PROFILES_DIR, "index.json")
+PLAYERS_DIR = os.path.join(PROFILES_DIR, "players")
+DRILL_DIR = os.path.join(PROFILES_DIR, "drill")
+
+# In-memory copy of the index, reloaded only when the file changes
+_index = {}
+_index_version = None
+
+
+def normalize_username(username):
+    """Key used for lookups: trimmed, inner whitespace collapsed, case-folded."""
+    return " ".join(username.split()).casefold()
+
+
+def _partition_name(key):
+    """Stable, filesystem-safe file name for a normalized username."""
+    slug = re.sub(r"[^a-z0-9]+", "_", key)[:32].strip("_") or "player"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:8]
+    return f"{slug}-{digest}.json"
+
+
+def player_stats_path(username):
+    """Path of a player's statistics partition. Computed, no index lookup needed."""
+    return os.path.join(PLAYERS_DIR, _partition_name(normalize_username(username)))
+
+
+def player_drill_path(username):
+    """Path of a player's drill state, without extension (see data.drill_store)."""
+    name = _partition_name(normalize_username(username))
+    return os.path.join(DRILL_DIR, os.path.splitext(name)[0])
+
+
+def load_index():
+    """Load the username index (normalized key -> profile)."""
+    global _index, _index_version
+    version = file_version(INDEX_FILE)
+    if version is None:
+        _index, _index_version = {}, None
+        return _index
+    if version != _index_version:
+        try:
+            with open(INDEX_FILE, 'r') as f:
+                _index = json.load(f)
+        except:  # noqa: E722
+            _index = {}
+        _index_version = version
+    return _index
+
+
+def save_index(index):
+    """Save the username index. Callers that read-modify-write hold the index lock."""
+    global _index, _index_version
+    os.makedirs(PROFILES_DIR, exist_ok=True)
+    with STORE_WRITE_SECONDS.labels("profiles").time():
+        atomic_write_json(INDEX_FILE, index)
+    _index, _index_version = index, file_version(INDEX_FILE)
+
+
+def get_profile(username):
+    """Return the profile for a username, or None if the player is unknown."""
+    return load_index().get(normalize_username(username))
+
+
+def register_profile(username):
+    """
+    Add a player to the index if needed.
+
+    The first spelling used becomes the display name.
+
+    Returns:
+        The player's profile
+    """
+    key = normalize_username(username)
+    index = load_index()
+    if key in index:
+        return index[key]
+
+    os.makedirs(PROFILES_DIR, exist_ok=True)
+    with file_lock(INDEX_FILE):
+        # Reload under the lock so players added by other instances are kept
+        index = load_index()
+        if key not in index:
+            index = dict(index)
+            index[key] = {
+                'username': " ".join(username.split()),
+                'file': _partition_name(key),
+                'created': datetime.now().isoformat(),
+            }
+            save_index(index)
+    return index[key]
+
+
+def list_profiles():
+    """Display names of every known player, sorted alphabetically."""
+    return sorted((p['username'] for p in load_index().values()), key=str.casefold)
@@ -0,0 +1,153 @@
+import http.client
+import json
+import os
+import threading
+from itertools import islice
+from urllib.parse import urlsplit
+from config import SCORE_SERVER_URL, SCORE_OUTBOX_FILE
+from data.file_lock import file_lock, atomic_write
+
+BATCH_SIZE = 100
+# Seconds to wait before each retry after consecutive failures
+RETRY_DELAYS = (1, 2, 5, 10, 30, 60)
+
+_client = None
+
+
+class ScoreClient:
+    def __init__(self, url, outbox=SCORE_OUTBOX_FILE, timeout=3.0):
+        """
+        Submits scores to a score server without blocking the game.
+
+        Scores are appended to a local outbox file and sent in batches by a
+        background thread over one reused keep-alive connection. A batch is
+        removed from the outbox only after the server accepted it, so scores
+        survive network outages and restarts; the server ignores repeats.
+
+        Args:
+            url: Server address, e.g. "http://127.0.0.1:8765"
+            outbox: Outbox file of scores not yet accepted
+            timeout: Socket timeout in seconds
+        """
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.outbox = outbox
+        self.timeout = timeout
+        self.connection = None
+        self.failures = 0
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        # Send anything left over from a previous run
+        self._wake.set()
+        self._thread = threading.Thread(target=self._run, name="score-client", daemon=True)
+        self._thread.start()
+
+    def submit(self, summary):
+        """Queue a score summary for the server. Returns immediately."""
+        line = (json.dumps(summary, separators=(",", ":")) + "\n").encode('utf-8')
+        with file_lock(self.outbox):
+            with open(self.outbox, 'ab') as f:
+                f.write(line)
+        self._wake.set()
+
+    def pending(self):
+        """Number of scores waiting in the outbox."""
+        try:
+            with open(self.outbox, 'rb') as f:
+                return sum(1 for line in f if line.endswith(b"\n"))
+        except OSError:
+            return 0
+
+    def close(self, timeout=None):
+        """Stop the sender thread."""
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        self._disconnect()
+
+    def _run(self):
+        while not self._stop.is_set():
+            delay = RETRY_DELAYS[min(self.failures, len(RETRY_DELAYS)) - 1] if self.failures else None
+            self._wake.wait(delay)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                while self.flush():
+                    pass
+                self.failures = 0
+            except (OSError, http.client.HTTPException):
+                self._disconnect()
+                self.failures += 1
+
+    def flush(self):
+        """
+        Send one batch from the outbox.
+
+        Returns:
+            Number of scores removed from the outbox
+        """
+        try:
+            with open(self.outbox, 'rb') as f:
+                lines = [line for line in islice(f, BATCH_SIZE) if line.endswith(b"\n")]
+        except FileNotFoundError:
+            return 0
+        if not lines:
+            return 0
+
+        body = b'{"scores":[' + b",".join(line.rstrip(b"\n") for line in lines) + b"]}"
+        status = self._post("/scores", body)
+        if status >= 500:
+            raise http.client.HTTPException(f"server error {status}")
+        # 2xx: accepted; 4xx: the batch can never succeed, drop it
+        self._remove(b"".join(lines))
+        return len(lines)
+
+    def _post(self, path, body):
+        if self.connection is None:
+            self.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        self.connection.request("POST", path, body, {"Content-Type": "application/json"})
+        response = self.connection.getresponse()
+        response.read()
+        if response.getheader("Connection", "").lower() == "close":
+            self._disconnect()
+        return response.status
+
+    def _disconnect(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def _remove(self, sent):
+        """Drop a sent prefix from the outbox, keeping scores queued meanwhile."""
+        with file_lock(self.outbox):
+            try:
+                with open(self.outbox, 'rb') as f:
+                    data = f.read()
+            except FileNotFoundError:
+                return
+            # Another instance sharing the outbox may have sent it already
+            if data.startswith(sent):
+                if len(data) == len(sent):
+                    os.remove(self.outbox)
+                else:
+                    atomic_write(self.outbox, data[len(sent):])
+
+
+def get_score_client():
+    """Shared client for SCORE_SERVER_URL, or None when no server is configured."""
+    global _client
+    if SCORE_SERVER_URL is None:
+        return None
+    if _client is None:
+        _client = ScoreClient(SCORE_SERVER_URL)
+    return _client
+
+
+def submit_score(summary):
+    """Queue a leaderboard entry summary for the score server, if one is configured."""
+    client = get_score_client()
+    if client is not None:
+        client.submit(summary)
@@ -0,0 +1,279 @@
+import os
+import struct
+import time
+import zipfile
+from datetime import date, timedelta
+from config import RECORDINGS_DIR, RECORD_SESSIONS, RECORDING_RETENTION_DAYS
+from data.file_lock import file_lock
+from logic.sequence import find_changed_index
+from metrics import STORE_WRITE_SECONDS
+
+# Recordings are day files of session blocks:
+#   block    : magic, payload length, then records
+#   records  : a type byte followed by its fields
+#     START    : wall-clock start, mutation probability, questions per level,
+#                mode, username, session id, level lengths
+#     QUESTION : onset, render time, level, changed index, seq_a, seq_b as a
+#                diff against seq_a
+#     INPUT    : time, guess, key (0 for a click)
+#     END      : time, accuracy and average time as shown to the player
+# Times are microseconds since the session started, 64-bit since a
+# practice screen can stay open for hours (EFS1 blocks used 32 bits, which
+# ran out after 71 minutes, and are still read). A session is written
+# as one block when it ends or is left, so a crash loses at most the
+# session in progress and a truncated block at the end is skipped.
+# Old day files are archived by rotate_recordings.
+MAGIC = b"EFS2"
+BLOCK = struct.Struct("<4sI")
+START = struct.Struct("<dfH")
+QUESTION = struct.Struct("<QfBi")
+INPUT = struct.Struct("<QBB")
+END = struct.Struct("<Qff")
+# Record layouts by block magic
+FORMATS = {
+    MAGIC: (QUESTION, INPUT, END),
+    b"EFS1": (struct.Struct("<IfBi"), struct.Struct("<IBB"), struct.Struct("<Iff")),
+}
+PAIR = struct.Struct("<BII")
+SHORT_TEXT = struct.Struct("<H")
+LONG_TEXT = struct.Struct("<I")
+
+T_START, T_QUESTION, T_INPUT, T_END = 1, 2, 3, 4
+NO_LEVEL = 255
+
+ARCHIVE_DIR = os.path.join(RECORDINGS_DIR, "archive")
+
+
+def recording_path(day):
+    """Recording file for one day."""
+    return os.path.join(RECORDINGS_DIR, f"{day.isoformat()}.efr")
+
+
+def rotate_recordings(today=None):
+    """
+    Move day files older than RECORDING_RETENTION_DAYS into monthly zip archives.
+
+    Archived days are stored as archive/YYYY-MM.zip members named after the
+    day file; extract one to replay it.
+    """
+    if not os.path.isdir(RECORDINGS_DIR):
+        return
+    cutoff = (today or date.today()) - timedelta(days=RECORDING_RETENTION_DAYS)
+
+    with file_lock(ARCHIVE_DIR):
+        for name in os.listdir(RECORDINGS_DIR):
+            if not name.endswith(".efr"):
+                continue
+            try:
+                day = date.fromisoformat(name[:-len(".efr")])
+            except ValueError:
+                continue
+            if day >= cutoff:
+                continue
+
+            os.makedirs(ARCHIVE_DIR, exist_ok=True)
+            path = os.path.join(RECORDINGS_DIR, name)
+            archive = os.path.join(ARCHIVE_DIR, f"{day:%Y-%m}.zip")
+            with zipfile.ZipFile(archive, 'a', compression=zipfile.ZIP_DEFLATED) as zf:
+                if name not in zf.namelist():
+                    zf.write(path, arcname=name)
+            os.remove(path)
+
+
+def _text(value, prefix=SHORT_TEXT):
+    data = (value or "").encode('utf-8')
+    return prefix.pack(len(data)) + data
+
+
+def _pair(seq_a, seq_b):
+    """seq_b stored as the part that differs from seq_a."""
+    if seq_a == seq_b:
+        return PAIR.pack(0, 0, 0)
+    prefix = find_changed_index(seq_a, seq_b)
+    suffix = min(find_changed_index(seq_a[::-1], seq_b[::-1]), min(len(seq_a), len(seq_b)) - prefix)
+    return PAIR.pack(1, prefix, suffix) + _text(seq_b[prefix:len(seq_b) - suffix], LONG_TEXT)
+
+
+class SessionRecorder:
+    def __init__(self, mode, username, session_id, levels=(), questions_per_level=0,
+                 probability=0.0, enabled=RECORD_SESSIONS):
+        """
+        Record one session as a compact binary stream for tools.replay_sessions.
+
+        Args:
+            mode: Game mode
+            username: Player, or None
+            session_id: Id shared with the session's events
+            levels: Sequence length of each level, empty for modes without levels
+            questions_per_level: Questions in each level
+            probability: Mutation probability of the questions
+            enabled: False makes every call a no-op
+        """
+        self.started = time.perf_counter()
+        self.day = date.today()
+        self.buffer = None
+        self.questions = 0
+        if not enabled:
+            return
+        self.buffer = bytearray()
+        self.buffer += bytes([T_START]) + START.pack(time.time(), probability, questions_per_level)
+        self.buffer += _text(mode) + _text(username) + _text(session_id)
+        self.buffer += bytes([len(levels)]) + b"".join(LONG_TEXT.pack(length) for length in levels)
+
+    def _micros(self, at):
+        return max(round((at - self.started) * 1e6), 0)
+
+    def question(self, seq_a, seq_b, changed_index, level, shown_at, render_ms):
+        """
+        Record a question becoming visible.
+
+        Args:
+            seq_a, seq_b: The two sequences (strings or lists of characters)
+            changed_index: Index of the change, or None
+            level: Level index, or None
+            shown_at: perf_counter time of the stimulus onset
+            render_ms: Time spent drawing it
+        """
+        if self.buffer is None:
+            return
+        seq_a = seq_a if isinstance(seq_a, str) else "".join(seq_a)
+        seq_b = seq_b if isinstance(seq_b, str) else "".join(seq_b)
+        self.buffer += bytes([T_QUESTION]) + QUESTION.pack(
+            self._micros(shown_at), render_ms, NO_LEVEL if level is None else level,
+            -1 if changed_index is None else changed_index)
+        self.buffer += _text(seq_a, LONG_TEXT) + _pair(seq_a, seq_b)
+        self.questions += 1
+
+    def input(self, guess, at, key=None):
+        """
+        Record a keypress or click, including ones the game ignores.
+
+        Args:
+            guess: True for "different", False for "same"
+            at: perf_counter time of the input
+            key: Key symbol for keyboard input, None for a click
+        """
+        if self.buffer is None:
+            return
+        code = ord(key[0]) if key and len(key) == 1 and ord(key[0]) < 256 else 0
+        self.buffer += bytes([T_INPUT]) + INPUT.pack(self._micros(at), bool(guess), code)
+
+    def finish(self, accuracy, avg_time):
+        """Record the score shown to the player and write the session."""
+        if self.buffer is None:
+            return
+        self.buffer += bytes([T_END]) + END.pack(self._micros(time.perf_counter()), accuracy, avg_time)
+        self.close()
+
+    def close(self):
+        """
+        Write the session if a question was shown. Later calls do nothing.
+
+        The first session of a new day also archives old day files.
+        """
+        if self.buffer is None:
+            return
+        data, self.buffer = self.buffer, None
+        if not self.questions:
+            return
+        path = recording_path(self.day)
+        os.makedirs(RECORDINGS_DIR, exist_ok=True)
+        if not os.path.exists(path):
+            rotate_recordings(self.day)
+        with STORE_WRITE_SECONDS.labels("recordings").time(), file_lock(path):
+            with open(path, 'ab') as f:
+                f.write(BLOCK.pack(MAGIC, len(data)) + data)
+
+
+def _read_text(buf, offset, prefix=SHORT_TEXT):
+    (length,) = prefix.unpack_from(buf, offset)
+    offset += prefix.size
+    return bytes(buf[offset:offset + length]).decode('utf-8'), offset + length
+
+
+def parse_session(buf, magic=MAGIC):
+    """
+    Decode one session block payload.
+
+    Args:
+        buf: Block payload
+        magic: Magic of the block, which selects the record layout
+
+    Returns:
+        Session dict: started_at, probability, questions_per_level, mode,
+        username, session, levels and records, a list of
+        ("question", t, render_ms, level, seq_a, seq_b, changed_index),
+        ("input", t, guess, key) and ("end", t, accuracy, avg_time) tuples
+        with t in seconds since the start
+    """
+    if buf[0] != T_START:
+        raise ValueError("session block does not start with START")
+    question_struct, input_struct, end_struct = FORMATS[magic]
+    started_at, probability, questions_per_level = START.unpack_from(buf, 1)
+    offset = 1 + START.size
+    mode, offset = _read_text(buf, offset)
+    username, offset = _read_text(buf, offset)
+    session, offset = _read_text(buf, offset)
+    count = buf[offset]
+    levels = list(struct.unpack_from(f"<{count}I", buf, offset + 1))
+    offset += 1 + LONG_TEXT.size * count
+
+    records = []
+    size = len(buf)
+    while offset < size:
+        kind = buf[offset]
+        offset += 1
+        if kind == T_QUESTION:
+            t, render_ms, level, changed = question_struct.unpack_from(buf, offset)
+            seq_a, offset = _read_text(buf, offset + question_struct.size, LONG_TEXT)
+            changed_flag, prefix, suffix = PAIR.unpack_from(buf, offset)
+            offset += PAIR.size
+            seq_b = seq_a
+            if changed_flag:
+                middle, offset = _read_text(buf, offset, LONG_TEXT)
+                seq_b = seq_a[:prefix] + middle + seq_a[len(seq_a) - suffix:]
+            records.append(("question", t / 1e6, render_ms, None if level == NO_LEVEL else level,
+                            seq_a, seq_b, None if changed < 0 else changed))
+        elif kind == T_INPUT:
+            t, guess, code = input_struct.unpack_from(buf, offset)
+            offset += input_struct.size
+            records.append(("input", t / 1e6, bool(guess), chr(code) if code else None))
+        elif kind == T_END:
+            t, accuracy, avg_time = end_struct.unpack_from(buf, offset)
+            offset += end_struct.size
+            records.append(("end", t / 1e6, accuracy, avg_time))
+        else:
+            raise ValueError(f"unknown record type {kind}")
+
+    return {
+        'started_at': started_at,
+        'probability': probability,
+        'questions_per_level': questions_per_level,
+        'mode': mode,
+        'username': username or None,
+        'session': session,
+        'levels': levels,
+        'records': records,
+    }
+
+
+def read_sessions(path):
+    """
+    Decode every complete session block of a recording file.
+
+    Yields:
+        Session dicts from parse_session
+    """
+    with open(path, 'rb') as f:
+        data = memoryview(f.read())
+    offset = 0
+    while offset + BLOCK.size <= len(data):
+        magic, length = BLOCK.unpack_from(data, offset)
+        if magic not in FORMATS:
+            raise ValueError(f"{path}: bad block at offset {offset}")
+        start = offset + BLOCK.size
+        if start + length > len(data):
+            # Still being written, or cut short by a crash
+            break
+        yield parse_session(data[start:start + length], magic)
+        offset = start + length
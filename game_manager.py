@@ -1,17 +1,322 @@
 import json
 import os
-from datetime import datetime
-from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 import statistics
 import config
+from logic.sequence import find_changed_index
+from logic.confusion import ConfusionMatrix
+from logic.rollups import empty_rollups, add_answer, merge_rollups, series
+from logic.latency import empty_latency, add_latency, merge_latency, describe_latency
+from data.profile_store import get_profile, normalize_username, player_stats_path, register_profile
+from data.file_lock import file_lock, file_version, atomic_write_json
+from metrics import STORE_WRITE_SECONDS, STATISTICS_CONFLICTS
+from data.event_log import (answer_event, session_event, append_events, read_events,
+                            split_ranges, log_size, new_session_id)
+
+GLOBAL_STATS_FILE = "statistics.json"
+
+# Modes whose questions are bucketed into levels
+LEVEL_MODES = ("challenge", "daily")
+# Modes that are logged but kept out of the aggregates
+IGNORED_MODES = ("stress",)
+# Player events the global catch-up holds before writing them to the partitions
+PARTITION_BATCH = 10000
+
+
+def create_default_stats():
+    """Create default statistics structure."""
+    return {
+        "total_games": 0,
+        "total_questions": 0,
+        "total_correct": 0,
+        "challenge_completions": 0,
+        "practice_sessions": 0,
+        "sprint_sessions": 0,
+        "drill_sessions": 0,
+        "by_level": {
+            "level_1": {"questions": 0, "correct": 0},
+            "level_2": {"questions": 0, "correct": 0},
+            "level_3": {"questions": 0, "correct": 0}
+        },
+        "by_type": {
+            "same": {"questions": 0, "correct": 0},
+            "different": {"questions": 0, "correct": 0}
+        },
+        "mistakes": {},
+        "confusion": ConfusionMatrix().to_dict(),
+        "response_times": [],
+        "latency": empty_latency(),
+        "challenge_latency": empty_latency(),
+        "rollups": empty_rollups(),
+        "last_played": None,
+        "event_offset": 0
+    }
+
+
+def apply_event(data, confusion, event):
+    """
+    Fold one logged event into the aggregates.
+    
+    This is the only place aggregates are computed, so a bucketing fix here
+    followed by a rebuild corrects every past result.
+    """
+    mode = event.get("mode")
+    if mode in IGNORED_MODES:
+        return
+    
+    if event["type"] == "session":
+        if mode == "practice":
+            data["practice_sessions"] += 1
+        elif mode == "drill":
+            data["drill_sessions"] = data.get("drill_sessions", 0) + 1
+        else:
+            data["total_games"] += 1
+            if mode in LEVEL_MODES:
+                data["challenge_completions"] += 1
+            elif mode == "sprint":
+                data["sprint_sessions"] = data.get("sprint_sessions", 0) + 1
+    
+    elif event["type"] == "answer":
+        correct_answer = event["correct_answer"]
+        user_guess = event["user_guess"]
+        was_correct = user_guess == correct_answer
+        
+        data["total_questions"] += 1
+        if was_correct:
+            data["total_correct"] += 1
+            # Record response time for correct answers
+            data["response_times"].append(event["elapsed"])
+            add_latency(data.setdefault("latency", empty_latency()), event["elapsed"])
+            # Ranked runs are checked against ranked runs only (see run_anomalies)
+            if mode in LEVEL_MODES:
+                add_latency(data.setdefault("challenge_latency", empty_latency()), event["elapsed"])
+        
+        # Daily and weekly trend buckets
+        if "rollups" not in data:
+            data["rollups"] = empty_rollups()
+        add_answer(data["rollups"], event["ts"], was_correct, event["elapsed"])
+        
+        # Record by level
+        level = event.get("level")
+        if mode in LEVEL_MODES and level is not None:
+            level_key = f"level_{level + 1}"
+            if level_key in data["by_level"]:
+                data["by_level"][level_key]["questions"] += 1
+                if was_correct:
+                    data["by_level"][level_key]["correct"] += 1
+        
+        # Record by type
+        type_key = "different" if correct_answer else "same"
+        data["by_type"][type_key]["questions"] += 1
+        if was_correct:
+            data["by_type"][type_key]["correct"] += 1
+        
+        # Record the substitution, and the mistake if it was missed
+        if correct_answer:
+            seq_a, seq_b = event["seq_a"], event["seq_b"]
+            changed_index = find_changed_index(seq_a, seq_b)
+            if changed_index is not None:
+                confusion.record(seq_a[changed_index], seq_b[changed_index], changed_index, not was_correct)
+                if not was_correct:
+                    mistake_key = f"{seq_a[changed_index]}→{seq_b[changed_index]}"
+                    data["mistakes"][mistake_key] = data["mistakes"].get(mistake_key, 0) + 1
+    else:
+        return
+    
+    if data["last_played"] is None or event["ts"] > data["last_played"]:
+        data["last_played"] = event["ts"]
+
+
+def merge_stats(data, confusion, other_data, other_confusion):
+    """Add partial aggregates (from a later part of the log) into `data`."""
+    for key in ("total_games", "total_questions", "total_correct", "challenge_completions",
+                "practice_sessions", "sprint_sessions", "drill_sessions"):
+        data[key] = data.get(key, 0) + other_data.get(key, 0)
+    for group in ("by_level", "by_type"):
+        for bucket, counts in other_data[group].items():
+            target = data[group].setdefault(bucket, {"questions": 0, "correct": 0})
+            target["questions"] += counts["questions"]
+            target["correct"] += counts["correct"]
+    for mistake, count in other_data["mistakes"].items():
+        data["mistakes"][mistake] = data["mistakes"].get(mistake, 0) + count
+    data["response_times"].extend(other_data["response_times"])
+    merge_rollups(data.setdefault("rollups", empty_rollups()), other_data.get("rollups", {}))
+    merge_latency(data.setdefault("latency", empty_latency()), other_data.get("latency", {}))
+    merge_latency(data.setdefault("challenge_latency", empty_latency()),
+                  other_data.get("challenge_latency", {}))
+    if other_data["last_played"] and (data["last_played"] is None
+                                      or other_data["last_played"] > data["last_played"]):
+        data["last_played"] = other_data["last_played"]
+    confusion.merge(other_confusion)
+
+
+def aggregate_range(start, end, path=config.EVENT_LOG_FILE):
+    """
+    Aggregate one byte range of the event log.
+    
+    Returns:
+        {partition key: (username, data, confusion)}; the key is None for the
+        combined totals and the normalized username for player partitions
+    """
+    partitions = {}
+    
+    def partition(key, username):
+        if key not in partitions:
+            partitions[key] = (username, create_default_stats(), ConfusionMatrix())
+        return partitions[key]
+    
+    for _, event in read_events(start, end, path):
+        _, data, confusion = partition(None, None)
+        apply_event(data, confusion, event)
+        if event.get("user"):
+            _, data, confusion = partition(normalize_username(event["user"]), event["user"])
+            apply_event(data, confusion, event)
+    return partitions
+
+
+def rebuild_partitions(workers=None, path=config.EVENT_LOG_FILE):
+    """
+    Recompute every partition from the whole event log in parallel.
+    
+    The log is split into line-aligned byte ranges, each range is
+    aggregated in a worker process and the partial results are merged in
+    log order.
+    
+    Returns:
+        ({partition key: (username, data, confusion)}, log offset covered)
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = split_ranges(workers, path)
+    end = ranges[-1][1] if ranges else 0
+    
+    if len(ranges) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            partials = list(pool.map(aggregate_range, *zip(*ranges), [path] * len(ranges)))
+    else:
+        partials = [aggregate_range(start, stop, path) for start, stop in ranges]
+    
+    merged = {None: (None, create_default_stats(), ConfusionMatrix())}
+    for partial in partials:
+        for key, (username, data, confusion) in partial.items():
+            if key not in merged:
+                merged[key] = (username, create_default_stats(), ConfusionMatrix())
+            merge_stats(merged[key][1], merged[key][2], data, confusion)
+    
+    for _, data, _ in merged.values():
+        data["event_offset"] = end
+    return merged, end
+
+
+def save_partition(path, username, data, confusion):
+    """
+    Write one statistics partition, registering the player's profile if needed.
+    
+    The file is replaced atomically; callers hold the partition's lock.
+    """
+    data["confusion"] = confusion.to_dict()
+    if username:
+        register_profile(username)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    atomic_write_json(path, data)
+
+
+def rebuild_all_statistics(workers=None):
+    """
+    Rebuild statistics.json and every player partition from the event log.
+    
+    Returns:
+        Number of partitions written
+    """
+    merged, _ = rebuild_partitions(workers)
+    for username, data, confusion in merged.values():
+        path = player_stats_path(username) if username else GLOBAL_STATS_FILE
+        if username:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with file_lock(path):
+            save_partition(path, username, data, confusion)
+    return len(merged)
+
+
+def global_offset():
+    """Event log offset of the global checkpoint, 0 without one."""
+    try:
+        with open(GLOBAL_STATS_FILE, 'r') as f:
+            return json.load(f).get("event_offset", 0)
+    except:  # noqa: E722
+        return 0
+
+
+def advance_partitions(touched, end):
+    """
+    Fold events read by the global catch-up into each player's partition.
+    
+    Every player's events before the global checkpoint offset are then in
+    their partition, so a player's own catch-up can start there. Partitions
+    that went missing for a known player are left for that player's
+    rebuild (see StatisticsManager.load_statistics).
+    
+    Args:
+        touched: {normalized username: [(offset after the event, event), ...]}
+        end: Offset the events were read up to
+    """
+    for events in touched.values():
+        username = events[0][1]["user"]
+        path = player_stats_path(username)
+        if not os.path.exists(path) and get_profile(username):
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with STORE_WRITE_SECONDS.labels("statistics").time(), file_lock(path):
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+            except:  # noqa: E722
+                data = create_default_stats()
+            confusion = ConfusionMatrix(data.get("confusion"))
+            start = data.get("event_offset", 0)
+            for offset, event in events:
+                if offset > start:
+                    apply_event(data, confusion, event)
+            data["event_offset"] = max(start, end)
+            save_partition(path, username, data, confusion)
+
 
 class StatisticsManager:
-    def __init__(self):
-        self.stats_file = "statistics.json"
+    def __init__(self, username=None, read_only=False):
+        """
+        Load statistics for one player, or the global totals.
+        
+        The saved file is a checkpoint of the aggregates; events logged
+        after its offset are applied on load.
+        
+        Args:
+            username: Player whose partition to use, None for all players combined
+            read_only: Apply new events in memory only; the checkpoint is not
+                saved, and a missing partition is not rebuilt
+        """
+        self.username = username
+        self.read_only = read_only
+        if username:
+            self.stats_file = player_stats_path(username)
+        else:
+            self.stats_file = GLOBAL_STATS_FILE
         self.load_statistics()
     
     def load_statistics(self):
         """Load statistics from file or create default structure."""
+        self._read_checkpoint()
+        if self.read_only:
+            self._catch_up()
+            return
+        if self.version is None and self.username and get_profile(self.username):
+            # A known player's partition went missing, their history is only in the log
+            self.rebuild()
+            return
+        self._catch_up()
+        self.save_statistics()
+    
+    def _read_checkpoint(self):
+        """Read the saved checkpoint and remember its version for conflict checks."""
+        self.version = file_version(self.stats_file)
         if os.path.exists(self.stats_file):
             try:
                 with open(self.stats_file, 'r') as f:
@@ -20,97 +325,121 @@ class StatisticsManager:
                 self.data = self._create_default_stats()
         else:
             self.data = self._create_default_stats()
-        self.save_statistics()
+        self.confusion = ConfusionMatrix(self.data.get("confusion"))
     
     def _create_default_stats(self):
         """Create default statistics structure."""
-        return {
-            "total_games": 0,
-            "total_questions": 0,
-            "total_correct": 0,
-            "challenge_completions": 0,
-            "practice_sessions": 0,
-            "by_level": {
-                "level_1": {"questions": 0, "correct": 0},
-                "level_2": {"questions": 0, "correct": 0},
-                "level_3": {"questions": 0, "correct": 0}
-            },
-            "by_type": {
-                "same": {"questions": 0, "correct": 0},
-                "different": {"questions": 0, "correct": 0}
-            },
-            "mistakes": {},
-            "response_times": [],
-            "last_played": None
-        }
-    
-    def save_statistics(self):
-        """Save statistics to file."""
-        with open(self.stats_file, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        return create_default_stats()
     
-
-    def record_challenge_result(self, results):
-        """Record results from a challenge mode session."""
-        self.data["total_games"] += 1
-        self.data["challenge_completions"] += 1
-        
-        for idx, (seq_a, seq_b, correct_answer, user_guess, elapsed) in enumerate(results):
-            self.data["total_questions"] += 1
-            
-            # Calculate level based on question index (0-4: level 1, 5-9: level 2, 10-14: level 3)
-            question_number = idx  # 0-based
-            level_index = min(question_number // config.QUESTIONS_PER_LEVEL, 2)  # Max level 2 (0,1,2)
-            level_key = f"level_{level_index + 1}"
-            
-            # Record by level
-            if level_key in self.data["by_level"]:
-                self.data["by_level"][level_key]["questions"] += 1
-                if user_guess == correct_answer:
-                    self.data["by_level"][level_key]["correct"] += 1
-                # Record by type
-                type_key = "different" if correct_answer else "same"
-                self.data["by_type"][type_key]["questions"] += 1
-
-                # Record mistake
-                if correct_answer:  # Different sequences
-                    changed_index = None
-                    # Find the changed character
-                    for i, (a, b) in enumerate(zip(seq_a, seq_b)):
-                        if a != b:
-                            changed_index = i  # noqa: F841
-                            mistake_key = f"{a}→{b}"
-                            self.data["mistakes"][mistake_key] = self.data["mistakes"].get(mistake_key, 0) + 1
-                            break
-            
-            # Record response time for correct answers
-            if user_guess == correct_answer:
-                self.data["response_times"].append(elapsed)
+    def save_statistics(self, force=False):
+        """
+        Save statistics to file.
         
-        self.data["last_played"] = datetime.now().isoformat()
-        self.save_statistics()
+        If another game instance saved this partition since we read it, its
+        checkpoint wins (it may have been cleared) and the event log is
+        replayed on top of it before saving, so neither instance's answers
+        are lost. The replay runs outside the lock, so the save is retried
+        until no other instance has saved in between.
+        
+        Args:
+            force: Overwrite whatever is on disk (clearing and rebuilding)
+        """
+        if self.read_only:
+            return
+        if self.username:
+            os.makedirs(os.path.dirname(self.stats_file), exist_ok=True)
+        while True:
+            with STORE_WRITE_SECONDS.labels("statistics").time(), file_lock(self.stats_file):
+                if force or file_version(self.stats_file) == self.version:
+                    save_partition(self.stats_file, self.username, self.data, self.confusion)
+                    self.version = file_version(self.stats_file)
+                    return
+            STATISTICS_CONFLICTS.labels().inc()
+            self._read_checkpoint()
+            self._catch_up()
     
-    def record_practice_result(self, was_correct, seq_a=None, seq_b=None, elapsed=None):
-        """Record results from practice mode."""
-        self.data["practice_sessions"] += 1
-        self.data["total_questions"] += 1
+    def _catch_up(self):
+        """
+        Apply events logged after the checkpoint offset. Returns how many were applied.
         
-        if was_correct:
-            self.data["total_correct"] += 1
-            if elapsed:
-                self.data["response_times"].append(elapsed)
+        The global catch-up also advances the partition of every player it
+        reads events of, so a player's catch-up starts at the global offset
+        when that is further along, and a new player's partition never
+        replays the log from the start.
+        """
+        key = normalize_username(self.username) if self.username else None
+        offset = self.data.get("event_offset", 0)
+        if key is not None:
+            offset = max(offset, global_offset())
+        applied = 0
+        touched, held = {}, 0
+        for offset, event in read_events(offset):
+            user = normalize_username(event["user"]) if event.get("user") else None
+            if key is None:
+                apply_event(self.data, self.confusion, event)
+                applied += 1
+                if user:
+                    touched.setdefault(user, []).append((offset, event))
+                    held += 1
+                    if held >= PARTITION_BATCH:
+                        advance_partitions(touched, offset)
+                        touched, held = {}, 0
+            elif user == key:
+                apply_event(self.data, self.confusion, event)
+                applied += 1
+        if touched:
+            advance_partitions(touched, offset)
+        self.data["event_offset"] = offset
+        return applied
+    
+    def refresh(self):
+        """Bring the aggregates up to date with the event log and save if anything changed."""
+        start = self.data.get("event_offset", 0)
+        applied = self._catch_up()
+        if applied or self.data["event_offset"] != start:
+            self.save_statistics()
+        return applied
+    
+    def rebuild(self, workers=None):
+        """Recompute this partition from the whole event log, discarding the checkpoint."""
+        key = normalize_username(self.username) if self.username else None
+        if key is None:
+            # Player partitions must hold their events up to the new global offset
+            rebuild_all_statistics(workers)
+            self._read_checkpoint()
+            return
+        merged, end = rebuild_partitions(workers)
+        if key in merged:
+            _, self.data, self.confusion = merged[key]
+        else:
+            self.data = self._create_default_stats()
+            self.data["event_offset"] = end
+            self.confusion = ConfusionMatrix()
+        self.save_statistics(force=True)
+    
+    def record_session(self, mode, results, levels=None):
+        """
+        Log a finished session's answers and update the aggregates.
         
-        self.data["last_played"] = datetime.now().isoformat()
-        self.save_statistics()
+        Args:
+            mode: Game mode of the session
+            results: List of (seq_a, seq_b, correct_answer, user_guess, elapsed)
+            levels: Level index of each answer, or None for modes without levels
+        """
+        session = new_session_id()
+        events = [
+            answer_event(mode, session, self.username, idx, levels[idx] if levels else None, *result)
+            for idx, result in enumerate(results)
+        ]
+        events.append(session_event(mode, session, self.username, len(results)))
+        append_events(events)
+        self.refresh()
     
-    def record_mistake(self, seq_a, seq_b, user_guess, correct_answer):
-        """Record a specific mistake."""
-        if user_guess != correct_answer and correct_answer:  # Different sequences
-            for i, (a, b) in enumerate(zip(seq_a, seq_b)):
-                if a != b:
-                    mistake_key = f"{a}→{b}"
-                    self.data["mistakes"][mistake_key] = self.data["mistakes"].get(mistake_key, 0) + 1
-                    break
+    def record_challenge_result(self, results):
+        """Record results from a challenge mode session."""
+        # Questions 0-4: level 1, 5-9: level 2, 10-14: level 3
+        levels = [min(idx // config.QUESTIONS_PER_LEVEL, 2) for idx in range(len(results))]
+        self.record_session("challenge", results, levels)
     
     def get_statistics(self):
         """Get formatted statistics."""
@@ -144,20 +473,30 @@ class StatisticsManager:
         else:
             stats["avg_response_time"] = 0
         
+        # Response time distribution (ms), None until there are enough answers
+        stats["latency_model"] = describe_latency(stats.get("latency", empty_latency()))
+        
         # Top 5 most common mistakes
-        if stats["mistakes"]:
-            top_mistakes = Counter(stats["mistakes"]).most_common(5)
-            stats["top_mistakes"] = [(mistake, count) for mistake, count in top_mistakes]
-        else:
-            stats["top_mistakes"] = []
+        stats["top_mistakes"] = [(f"{a}→{b}", missed) for a, b, missed, _ in self.confusion.top_pairs(5)]
+        stats["top_pairs"] = self.confusion.top_pairs(10)
+        stats["char_miss_rates"] = self.confusion.char_miss_rates()
+        stats["position_miss_rates"] = self.confusion.position_miss_rates()
+        
+        # Trend series: (date, questions, accuracy %, median ms, p90 ms)
+        rollups = stats.get("rollups", {})
+        stats["trends"] = {period: series(rollups, period) for period in ("daily", "weekly")}
         
         return stats
     
     def clear_statistics(self):
-        """Clear all statistics."""
+        """Clear all statistics. Events already in the log are not replayed."""
+        if self.username:
+            offset = log_size()
+        else:
+            # Players' partitions are kept, bring them up to the new global offset
+            self._catch_up()
+            offset = self.data["event_offset"]
         self.data = self._create_default_stats()
-        self.save_statistics()
-
-
-# Create a global instance
-stats_manager = StatisticsManager()
\ No newline at end of file
+        self.data["event_offset"] = offset
+        self.confusion = ConfusionMatrix()
+        self.save_statistics(force=True)
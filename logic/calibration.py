@@ -0,0 +1,207 @@
+import json
+import math
+import os
+from config import (CALIBRATION_FILE, CHARSETS, CONFUSION_POSITIONS, LEVEL_SCHEDULES,
+                    LEVEL_TARGET_ACCURACY, SEQUENCE_WRAP_WIDTH, SIMILAR_MAP)
+from logic.sequence import find_changed_index
+
+# Calibration table (written by tools.calibrate_difficulty):
+#   intercept   log-odds of a correct answer for an average player and question
+#   difficulty  log-odds subtracted per feature of a question:
+#                 length    {"10": d, ...}
+#                 charset   {"Alphanumeric": d, ...}
+#                 item      {"same": d, "O>0": d, ...}  substitution pairs
+#                 position  [d, ...] per changed-position bucket
+#   ability     log-odds added per player (normalized username, "" for anonymous)
+#   answers     {"length": {"10": n, ...}} answers behind each length
+VERSION = 1
+SAME = "same"
+# Lengths fitted from fewer answers than this are not used for schedules
+MIN_LENGTH_ANSWERS = 200
+
+
+def item_key(original, replacement):
+    """Item of a substitution. 'W' -> 'VV' is seen, and logged, as 'W' -> 'V'."""
+    return f"{original}>{replacement[:1]}"
+
+
+def answer_charset(event):
+    """
+    Charset an answer was drawn from.
+
+    Only practice lets the player choose one and it is not logged, so it is
+    read from the first sequence; every other mode uses Alphanumeric.
+    """
+    if event.get("mode") != "practice":
+        return "Alphanumeric"
+    seq_a = event["seq_a"]
+    if seq_a.isdigit():
+        return "Numbers"
+    if seq_a.isalpha():
+        return "Letters"
+    return "Alphanumeric"
+
+
+def answer_features(event):
+    """
+    Question features of a logged answer.
+
+    Returns:
+        (charset, length, item, position bucket or None)
+    """
+    seq_a, seq_b = event["seq_a"], event["seq_b"]
+    changed_index = find_changed_index(seq_a, seq_b) if event["correct_answer"] else None
+    if changed_index is None or changed_index >= len(seq_b):
+        return answer_charset(event), len(seq_a), SAME, None
+    return (answer_charset(event), len(seq_a), item_key(seq_a[changed_index], seq_b[changed_index]),
+            min(changed_index, CONFUSION_POSITIONS - 1))
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + math.exp(-z)) if z > -700 else 0.0
+
+
+class Calibration:
+    def __init__(self, table):
+        """
+        Predicted accuracy from a calibration table.
+
+        Args:
+            table: Dict loaded from CALIBRATION_FILE
+        """
+        difficulty = table["difficulty"]
+        self.intercept = table["intercept"]
+        self.charset = difficulty["charset"]
+        self.item = difficulty["item"]
+        # Padded in case CONFUSION_POSITIONS changed since the fit
+        self.position = (list(difficulty["position"]) + [0.0] * CONFUSION_POSITIONS)[:CONFUSION_POSITIONS]
+        self.ability = table.get("ability", {})
+        supported = sorted((int(length), d) for length, d in difficulty["length"].items()
+                           if table["answers"]["length"].get(length, 0) >= MIN_LENGTH_ANSWERS)
+        self.lengths = [length for length, _ in supported]
+        self.length_difficulty = [d for _, d in supported]
+        self._different = {}
+
+    def difficulty_of_length(self, length):
+        """Length difficulty, interpolated between calibrated lengths."""
+        lengths, values = self.lengths, self.length_difficulty
+        if not lengths:
+            return 0.0
+        if length <= lengths[0]:
+            return values[0]
+        for i in range(1, len(lengths)):
+            if length <= lengths[i]:
+                share = (length - lengths[i - 1]) / (lengths[i] - lengths[i - 1])
+                return values[i - 1] + share * (values[i] - values[i - 1])
+        return values[-1]
+
+    def _different_accuracy(self, base, charset_name, length):
+        """Mean accuracy on "different" questions as the generator draws them."""
+        key = (base, charset_name, length)
+        if key not in self._different:
+            alphabet = CHARSETS[charset_name]
+            # Positions are uniform over the sequence; later ones share a bucket
+            buckets = [0] * CONFUSION_POSITIONS
+            for position in range(length):
+                buckets[min(position, CONFUSION_POSITIONS - 1)] += 1
+            positions = [(count / length, self.position[bucket])
+                         for bucket, count in enumerate(buckets) if count]
+            total = 0.0
+            for original in alphabet:
+                replacements = SIMILAR_MAP[original]
+                for replacement in replacements:
+                    z = base - self.item.get(item_key(original, replacement), 0.0)
+                    mean = sum(share * _sigmoid(z - d) for share, d in positions)
+                    total += mean / len(replacements)
+            self._different[key] = total / len(alphabet)
+        return self._different[key]
+
+    def predicted_accuracy(self, length, charset_name="Alphanumeric", probability=0.5, player=None):
+        """
+        Expected share of correct answers on questions of one length.
+
+        Args:
+            length: Sequence length
+            charset_name: Name of the charset (key of CHARSETS)
+            probability: Mutation probability (0.0 - 1.0)
+            player: Normalized username whose ability to use, None for an average player
+
+        Returns:
+            Accuracy between 0.0 and 1.0
+        """
+        base = self.intercept + self.ability.get(player, 0.0)
+        base -= self.difficulty_of_length(length) + self.charset.get(charset_name, 0.0)
+        same = _sigmoid(base - self.item.get(SAME, 0.0))
+        if probability <= 0:
+            return same
+        different = self._different_accuracy(base, charset_name, length)
+        return probability * different + (1 - probability) * same
+
+    def schedule(self, targets, charset_name="Alphanumeric", probability=0.5,
+                 max_length=SEQUENCE_WRAP_WIDTH):
+        """
+        Level lengths whose predicted accuracy is closest to each target.
+
+        Only calibrated lengths (and those between them) are considered, and
+        levels never get shorter.
+
+        Args:
+            targets: Target accuracy per level, e.g. [0.9, 0.8, 0.7]
+            charset_name: Name of the charset (key of CHARSETS)
+            probability: Mutation probability (0.0 - 1.0)
+            max_length: Longest length to use
+
+        Returns:
+            List of lengths, or None without calibrated lengths
+        """
+        if not self.lengths or self.lengths[0] > max_length:
+            return None
+        candidates = [(length, self.predicted_accuracy(length, charset_name, probability))
+                      for length in range(self.lengths[0], min(self.lengths[-1], max_length) + 1)]
+        levels = []
+        for target in targets:
+            shortest = levels[-1] if levels else 0
+            # Closest accuracy, the longer length on ties
+            length, _ = min((c for c in candidates if c[0] >= shortest),
+                            key=lambda c: (abs(c[1] - target), -c[0]))
+            levels.append(length)
+        return levels
+
+
+_calibration = None
+_schedules = {}
+
+
+def get_calibration():
+    """Return the shared Calibration, or None if no valid table exists."""
+    global _calibration
+    if _calibration is None and os.path.exists(CALIBRATION_FILE):
+        try:
+            with open(CALIBRATION_FILE, 'r') as f:
+                table = json.load(f)
+            if table.get("version") == VERSION:
+                _calibration = Calibration(table)
+        except (OSError, ValueError, KeyError, TypeError):
+            _calibration = None
+    return _calibration
+
+
+def level_schedule(schedule, charset_name="Alphanumeric", probability=0.5):
+    """
+    Sequence length of each level for a challenge schedule.
+
+    The Standard schedule is calibrated to LEVEL_TARGET_ACCURACY when it
+    is set and a calibration table is installed; anything else uses
+    LEVEL_SCHEDULES.
+
+    Returns:
+        List of lengths
+    """
+    if schedule != "Standard" or not LEVEL_TARGET_ACCURACY:
+        return list(LEVEL_SCHEDULES[schedule])
+    key = (schedule, charset_name, probability)
+    if key not in _schedules:
+        calibration = get_calibration()
+        levels = calibration.schedule(LEVEL_TARGET_ACCURACY, charset_name, probability) if calibration else None
+        _schedules[key] = levels or list(LEVEL_SCHEDULES[schedule])
+    return list(_schedules[key])
@@ -0,0 +1,142 @@
+import base64
+import heapq
+import sys
+from array import array
+from config import CHARSETS, CONFUSION_POSITIONS
+
+ALPHABET = CHARSETS["Alphanumeric"]
+CHAR_INDEX = {char: i for i, char in enumerate(ALPHABET)}
+SIZE = len(ALPHABET)
+
+
+def _zeros(n):
+    return array("I", bytes(4 * n))
+
+
+def _encode(counts):
+    """Pack a counter array as base64 little-endian uint32 for JSON storage."""
+    if sys.byteorder != "little":
+        counts = array("I", counts)
+        counts.byteswap()
+    return base64.b64encode(counts.tobytes()).decode("ascii")
+
+
+def _decode(text, n):
+    counts = array("I")
+    counts.frombytes(base64.b64decode(text))
+    if sys.byteorder != "little":
+        counts.byteswap()
+    if len(counts) != n:
+        return _zeros(n)
+    return counts
+
+
+class ConfusionMatrix:
+    def __init__(self, data=None):
+        """
+        Dense confusion counters for "different" questions.
+
+        `shown` and `missed` are SIZE x SIZE matrices indexed by
+        (original character, replacement character), stored row-major in
+        flat arrays. `position_shown` and `position_missed` count the
+        changed index; the last bucket collects every position beyond it.
+
+        Args:
+            data: Dict produced by to_dict, or None for empty counters
+        """
+        data = data or {}
+        self.shown = _decode(data["shown"], SIZE * SIZE) if "shown" in data else _zeros(SIZE * SIZE)
+        self.missed = _decode(data["missed"], SIZE * SIZE) if "missed" in data else _zeros(SIZE * SIZE)
+        self.position_shown = (_decode(data["position_shown"], CONFUSION_POSITIONS)
+                               if "position_shown" in data else _zeros(CONFUSION_POSITIONS))
+        self.position_missed = (_decode(data["position_missed"], CONFUSION_POSITIONS)
+                                if "position_missed" in data else _zeros(CONFUSION_POSITIONS))
+
+    def to_dict(self):
+        """Serialize the counters for statistics.json."""
+        return {
+            "alphabet": ALPHABET,
+            "shown": _encode(self.shown),
+            "missed": _encode(self.missed),
+            "position_shown": _encode(self.position_shown),
+            "position_missed": _encode(self.position_missed),
+        }
+
+    def record(self, original, replacement, position, missed):
+        """
+        Count one "different" question.
+
+        Args:
+            original: Character in the first sequence
+            replacement: Character it was replaced with
+            position: Changed index
+            missed: True if the player answered "same"
+        """
+        bucket = min(position, CONFUSION_POSITIONS - 1)
+        self.position_shown[bucket] += 1
+        if missed:
+            self.position_missed[bucket] += 1
+
+        # Multi-character substitutions ('W' -> 'VV') have no matrix cell
+        row = CHAR_INDEX.get(original)
+        col = CHAR_INDEX.get(replacement)
+        if row is None or col is None:
+            return
+        cell = row * SIZE + col
+        self.shown[cell] += 1
+        if missed:
+            self.missed[cell] += 1
+
+    def merge(self, other):
+        """Add another matrix's counts into this one."""
+        for mine, theirs in ((self.shown, other.shown), (self.missed, other.missed),
+                             (self.position_shown, other.position_shown),
+                             (self.position_missed, other.position_missed)):
+            for i, count in enumerate(theirs):
+                if count:
+                    mine[i] += count
+
+    def total_missed(self):
+        """Total number of missed differences."""
+        return sum(self.position_missed)
+
+    def top_pairs(self, k=5):
+        """
+        Most often missed substitutions.
+
+        Returns:
+            List of (original, replacement, missed, shown), most missed first
+        """
+        missed = self.missed
+        cells = heapq.nlargest(k, (i for i in range(SIZE * SIZE) if missed[i]),
+                               key=missed.__getitem__)
+        return [(ALPHABET[i // SIZE], ALPHABET[i % SIZE], missed[i], self.shown[i])
+                for i in cells]
+
+    def char_miss_rates(self, min_shown=1):
+        """
+        Miss rate per original character.
+
+        Returns:
+            List of (char, missed, shown, rate %), highest rate first
+        """
+        rates = []
+        for row, char in enumerate(ALPHABET):
+            start = row * SIZE
+            shown = sum(self.shown[start:start + SIZE])
+            if shown >= min_shown:
+                missed = sum(self.missed[start:start + SIZE])
+                rates.append((char, missed, shown, missed / shown * 100))
+        rates.sort(key=lambda r: (-r[3], -r[2]))
+        return rates
+
+    def position_miss_rates(self):
+        """
+        Miss rate by changed index.
+
+        Returns:
+            List of (position, missed, shown, rate %) for every bucket
+        """
+        return [(position, missed, shown, missed / shown * 100 if shown else 0)
+                for position, (missed, shown)
+                in enumerate(zip(self.position_missed, self.position_shown))]
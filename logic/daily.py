@@ -0,0 +1,31 @@
+import random
+from datetime import date
+from logic.sequence import get_alphabet, generate_sequence, maybe_mutate_sequence
+
+
+def daily_seed(day=None):
+    """Seed shared by every player on the given day, e.g. 20240131."""
+    return int((day or date.today()).strftime("%Y%m%d"))
+
+
+def daily_questions(levels, questions_per_level, probability, day=None,
+                    charset_name="Alphanumeric"):
+    """
+    Build the fixed question list for one day.
+
+    Questions are always generated live from the date seed, never read from
+    the question bank, so kiosks with different banks still agree.
+
+    Returns:
+        List of (seq_a, seq_b, changed_index), level by level
+    """
+    rng = random.Random(daily_seed(day))
+    alphabet = get_alphabet(charset_name)
+
+    questions = []
+    for length in levels:
+        for _ in range(questions_per_level):
+            seq_a = generate_sequence(length, alphabet, rng)
+            seq_b, changed_index = maybe_mutate_sequence(seq_a, probability, alphabet, rng)
+            questions.append((seq_a, seq_b, changed_index))
+    return questions
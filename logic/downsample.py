@@ -0,0 +1,48 @@
+def lttb(points, threshold):
+    """
+    Downsample a series with Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last point and, for every bucket in between, the
+    point forming the largest triangle with the previously kept point and
+    the average of the next bucket. The visual shape survives while the
+    number of points stays bounded.
+
+    Args:
+        points: List of (x, y) sorted by x
+        threshold: Maximum number of points to return
+
+    Returns:
+        List of at most `threshold` (x, y) points
+    """
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        # Average of the next bucket
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        next_bucket = points[next_start:next_end] or [points[-1]]
+        avg_x = sum(p[0] for p in next_bucket) / len(next_bucket)
+        avg_y = sum(p[1] for p in next_bucket) / len(next_bucket)
+
+        # Point of the current bucket with the largest triangle area
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        ax, ay = points[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            x, y = points[j]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+
+        sampled.append(points[best])
+        a = best
+
+    sampled.append(points[-1])
+    return sampled
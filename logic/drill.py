@@ -0,0 +1,208 @@
+import heapq
+import random
+from array import array
+from config import SIMILAR_MAP, CHARSETS
+from logic.confusion import CHAR_INDEX, SIZE
+
+# Per-item state, STRIDE doubles per item in one flat array
+DUE, INTERVAL, EASINESS, REPETITIONS = range(4)
+STRIDE = 4
+
+INITIAL_EASINESS = 2.5
+MIN_EASINESS = 1.3
+# Review intervals are in days, as in SM-2; a lapse comes back within the session
+DAY = 86400
+LAPSE_SECONDS = 60
+# New items are introduced this far apart, most confused first
+NEW_ITEM_SPACING = 20
+# Correct answers faster than these (seconds) rate 5 and 4, slower ones 3
+FAST_SECONDS = 1.0
+SLOW_SECONDS = 2.0
+
+
+def drill_items(length):
+    """
+    Every drillable item: a SIMILAR_MAP substitution at one position.
+
+    Returns:
+        Keys like "O>0@3", in a stable order
+    """
+    return [f"{original}>{replacement}@{position}"
+            for original, replacements in SIMILAR_MAP.items()
+            for replacement in replacements
+            for position in range(length)]
+
+
+def parse_item(key):
+    """Split an item key into (original, replacement, position)."""
+    pair, position = key.rsplit("@", 1)
+    original, replacement = pair.split(">", 1)
+    return original, replacement, int(position)
+
+
+def item_priority(key, confusion):
+    """
+    How much a player needs an item, from their recorded mistakes.
+
+    Args:
+        key: Item key
+        confusion: The player's ConfusionMatrix, or None
+
+    Returns:
+        Smoothed miss rate of the substitution, weighted by the miss rate
+        at the position
+    """
+    if confusion is None:
+        return 0.0
+    original, replacement, position = parse_item(key)
+    pair_rate = 0.0
+    row, col = CHAR_INDEX.get(original), CHAR_INDEX.get(replacement)
+    # Multi-character substitutions ('W' -> 'VV') have no matrix cell
+    if row is not None and col is not None:
+        cell = row * SIZE + col
+        pair_rate = (confusion.missed[cell] + 0.5) / (confusion.shown[cell] + 1)
+    bucket = min(position, len(confusion.position_shown) - 1)
+    position_rate = (confusion.position_missed[bucket] + 0.5) / (confusion.position_shown[bucket] + 1)
+    return pair_rate * (0.5 + position_rate)
+
+
+def rate_answer(correct, elapsed):
+    """SM-2 quality (0-5) of one answer."""
+    if not correct:
+        return 1
+    if elapsed < FAST_SECONDS:
+        return 5
+    if elapsed < SLOW_SECONDS:
+        return 4
+    return 3
+
+
+class DrillScheduler:
+    def __init__(self, keys, state=None):
+        """
+        SM-2 spaced repetition over drill items.
+
+        Item state lives in one flat array of doubles (due time, interval
+        in days, easiness, repetitions). A heap of (due, item) gives the
+        next item in O(log n); rescheduling pushes a new entry and the old
+        one is dropped lazily when it reaches the top.
+
+        Args:
+            keys: Item keys, their position is the item number
+            state: Array of STRIDE doubles per item, or None for all new
+        """
+        self.keys = list(keys)
+        self.index = {key: i for i, key in enumerate(self.keys)}
+        self.state = state if state is not None else array("d", bytes(8 * STRIDE * len(self.keys)))
+        self.rebuild_heap()
+
+    def rebuild_heap(self):
+        state = self.state
+        self.heap = [(state[i * STRIDE + DUE], i) for i in range(len(self.keys))
+                     if state[i * STRIDE + DUE] > 0]
+        heapq.heapify(self.heap)
+
+    def add_items(self, keys, priorities, now):
+        """
+        Add new items, introduced over time in order of priority.
+
+        Args:
+            keys: New item keys
+            priorities: Priority of each key, higher first
+            now: Current time (seconds since the epoch)
+        """
+        order = sorted(range(len(keys)), key=lambda k: -priorities[k])
+        first = len(self.keys)
+        self.keys.extend(keys)
+        self.state.extend([0.0] * STRIDE * len(keys))
+        for rank, k in enumerate(order):
+            i = first + k
+            self.index[keys[k]] = i
+            base = i * STRIDE
+            self.state[base + DUE] = now + rank * NEW_ITEM_SPACING
+            self.state[base + EASINESS] = INITIAL_EASINESS
+            heapq.heappush(self.heap, (self.state[base + DUE], i))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def next_item(self, now=None):
+        """
+        Item with the earliest due time, or None.
+
+        Args:
+            now: Only return an item due by this time; None for the
+                earliest item even if it is not due yet
+        """
+        heap, state = self.heap, self.state
+        while heap:
+            due, i = heap[0]
+            if state[i * STRIDE + DUE] == due:
+                return i if now is None or due <= now else None
+            heapq.heappop(heap)
+        return None
+
+    def due_count(self, now):
+        """Items due at `now`. Walks the heap, for display only."""
+        return sum(1 for due, i in self.heap if due <= now and self.state[i * STRIDE + DUE] == due)
+
+    def review(self, i, quality, now):
+        """
+        Reschedule an item after an answer.
+
+        Args:
+            i: Item number
+            quality: SM-2 quality 0-5 (see rate_answer)
+            now: Current time (seconds since the epoch)
+
+        Returns:
+            The item's new (due, interval, easiness, repetitions)
+        """
+        state = self.state
+        base = i * STRIDE
+        interval, easiness, repetitions = state[base + INTERVAL], state[base + EASINESS], state[base + REPETITIONS]
+
+        if quality >= 3:
+            if repetitions == 0:
+                interval = 1
+            elif repetitions == 1:
+                interval = 6
+            else:
+                interval = round(interval * easiness)
+            repetitions += 1
+            due = now + interval * DAY
+        else:
+            repetitions = 0
+            interval = 0
+            due = now + LAPSE_SECONDS
+        easiness = max(MIN_EASINESS, easiness + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+
+        state[base + DUE] = due
+        state[base + INTERVAL] = interval
+        state[base + EASINESS] = easiness
+        state[base + REPETITIONS] = repetitions
+        heapq.heappush(self.heap, (due, i))
+        # Lazily dropped entries pile up over a long session
+        if len(self.heap) > 2 * len(self.keys) + 64:
+            self.rebuild_heap()
+        return due, interval, easiness, repetitions
+
+    def make_question(self, i, length, different_probability=0.5, rng=random):
+        """
+        A question drilling item `i`.
+
+        The original character is placed at the item's position; with
+        `different_probability` the second sequence has it replaced.
+
+        Returns:
+            (seq_a, seq_b, changed_index) like make_question
+        """
+        original, replacement, position = parse_item(self.keys[i])
+        alphabet = CHARSETS["Alphanumeric"]
+        seq_a = [rng.choice(alphabet) for _ in range(length)]
+        seq_a[min(position, length - 1)] = original
+        if rng.random() >= different_probability:
+            return seq_a, seq_a.copy(), None
+        seq_b = seq_a.copy()
+        seq_b[min(position, length - 1)] = replacement
+        return seq_a, seq_b, min(position, length - 1)
@@ -0,0 +1,160 @@
+import math
+from statistics import NormalDist
+
+# Sufficient statistics of a player's response times (seconds):
+#   n              answers counted
+#   s1, s2, s3     sums of t, t^2 and t^3, for the ex-Gaussian moments
+#   l1, l2         sums of log t and (log t)^2, for the log-normal fit
+# Both fits are closed-form over these sums, so a model is updated per
+# answer and refitted in microseconds.
+MIN_FIT_ANSWERS = 10
+
+# Run checks: no one compares two sequences this fast
+MIN_HUMAN_SECONDS = 0.15
+# Auto-repeat of a held key answers each new question almost at once
+HELD_KEY_SECONDS = 0.1
+HELD_KEY_RUN = 3
+# Human response times spread widely; a bot's barely do
+MIN_LOG_SPREAD = 0.05
+# A run this many standard errors faster than the player's usual pace
+FAST_RUN_Z = -4.0
+MIN_HISTORY_ANSWERS = 50
+
+
+def empty_latency():
+    """Create empty sufficient statistics."""
+    return {"n": 0, "s1": 0.0, "s2": 0.0, "s3": 0.0, "l1": 0.0, "l2": 0.0}
+
+
+def add_latency(latency, seconds):
+    """Count one response time."""
+    if seconds <= 0:
+        return
+    log_t = math.log(seconds)
+    latency["n"] += 1
+    latency["s1"] += seconds
+    latency["s2"] += seconds * seconds
+    latency["s3"] += seconds * seconds * seconds
+    latency["l1"] += log_t
+    latency["l2"] += log_t * log_t
+
+
+def merge_latency(latency, other):
+    """Add another set of sufficient statistics into `latency`."""
+    for key in ("n", "s1", "s2", "s3", "l1", "l2"):
+        latency[key] += other.get(key, 0)
+
+
+def fit_lognormal(latency):
+    """
+    Log-normal fit by maximum likelihood.
+
+    Returns:
+        (mu, sigma) of log seconds, or None with too few answers
+    """
+    n = latency["n"]
+    if n < MIN_FIT_ANSWERS:
+        return None
+    mu = latency["l1"] / n
+    sigma = math.sqrt(max(latency["l2"] / n - mu * mu, 0.0))
+    return mu, sigma
+
+
+def fit_ex_gaussian(latency):
+    """
+    Ex-Gaussian fit by the method of moments.
+
+    The exponential tail takes the skew; with no positive skew the fit is
+    a plain normal (tau = 0).
+
+    Returns:
+        (mu, sigma, tau) in seconds, or None with too few answers
+    """
+    n = latency["n"]
+    if n < MIN_FIT_ANSWERS:
+        return None
+    mean = latency["s1"] / n
+    variance = max(latency["s2"] / n - mean * mean, 0.0)
+    third = latency["s3"] / n - 3 * mean * latency["s2"] / n + 2 * mean ** 3
+    # tau^3 = third / 2, and the normal part keeps at least a tenth of the variance
+    tau = min((third / 2) ** (1 / 3), math.sqrt(0.9 * variance)) if third > 0 else 0.0
+    return mean - tau, math.sqrt(variance - tau * tau), tau
+
+
+def describe_latency(latency):
+    """
+    Both fits in milliseconds, for display.
+
+    Returns:
+        Dict with answers, median, p10, p90 (log-normal) and mu, sigma,
+        tau (ex-Gaussian), or None with too few answers
+    """
+    lognormal = fit_lognormal(latency)
+    if lognormal is None:
+        return None
+    mu, sigma = lognormal
+    ex_mu, ex_sigma, tau = fit_ex_gaussian(latency)
+    z90 = NormalDist().inv_cdf(0.9)
+    return {
+        "answers": latency["n"],
+        "median": math.exp(mu) * 1000,
+        "p10": math.exp(mu - z90 * sigma) * 1000,
+        "p90": math.exp(mu + z90 * sigma) * 1000,
+        "mu": ex_mu * 1000,
+        "sigma": ex_sigma * 1000,
+        "tau": tau * 1000,
+    }
+
+
+def run_anomalies(results, latency=None):
+    """
+    Reasons a run looks automated or mechanical.
+
+    The pace check compares the run's correct answers with `latency`,
+    which should be the player's correct answers in the same mode from
+    before this run, or the run would be measured against itself.
+
+    Args:
+        results: (seq_a, seq_b, correct_answer, user_guess, elapsed) tuples
+        latency: The player's sufficient statistics before this run, or None
+
+    Returns:
+        List of short descriptions, empty for an ordinary run
+    """
+    times = [r[4] for r in results if r[4] > 0]
+    if not times:
+        return []
+    reasons = []
+
+    too_fast = sum(1 for t in times if t < MIN_HUMAN_SECONDS)
+    if too_fast > len(times) // 5:
+        reasons.append(f"{too_fast} answers under {MIN_HUMAN_SECONDS * 1000:.0f} ms")
+
+    streak = longest = 0
+    previous = None
+    for r in results:
+        held = r[4] < HELD_KEY_SECONDS and r[3] == previous
+        streak = streak + 1 if held else 0
+        longest = max(longest, streak)
+        previous = r[3]
+    if longest + 1 >= HELD_KEY_RUN:
+        reasons.append(f"{longest + 1} identical answers in a row within {HELD_KEY_SECONDS * 1000:.0f} ms")
+
+    logs = [math.log(t) for t in times]
+    mean_log = sum(logs) / len(logs)
+    if len(logs) >= 8:
+        spread = math.sqrt(sum((x - mean_log) ** 2 for x in logs) / (len(logs) - 1))
+        if spread < MIN_LOG_SPREAD:
+            reasons.append("response times too regular")
+
+    # The history only counts correct answers, so the run's wrong ones are left out
+    correct_logs = [math.log(r[4]) for r in results if r[4] > 0 and r[2] == r[3]]
+    if correct_logs and latency is not None and latency["n"] >= MIN_HISTORY_ANSWERS:
+        mu, sigma = fit_lognormal(latency)
+        if sigma > 0:
+            mean_correct = sum(correct_logs) / len(correct_logs)
+            z = (mean_correct - mu) / (sigma / math.sqrt(len(correct_logs)))
+            if z < FAST_RUN_Z:
+                reasons.append(f"much faster than usual (median {math.exp(mean_correct) * 1000:.0f} ms, "
+                               f"usually {math.exp(mu) * 1000:.0f} ms)")
+    return reasons
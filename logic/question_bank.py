@@ -0,0 +1,192 @@
+import mmap
+import os
+import random
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from config import CHARSETS, QUESTION_BANK_FILE, QUESTION_BANK_LENGTHS
+from logic.sequence import get_alphabet, generate_sequence, maybe_mutate_sequence
+
+# File layout:
+#   header   : magic, version, number of sections
+#   sections : charset name, sequence length, record count, data offset
+#   records  : seq_a | seq_b | changed_index (uint16) | draw (uint8)
+#
+# Every record holds a mutated pair. The draw byte decides whether the
+# question is served as "same" or "different" for a given mutation
+# probability, so the same index yields the same question on every machine.
+MAGIC = b"EFQB"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")
+SECTION = struct.Struct("<16sHIQ")
+INDEX = struct.Struct("<H")
+
+CHUNK_SIZE = 5000
+
+
+def record_size(length):
+    """Size in bytes of one record for sequences of the given length."""
+    return 2 * length + INDEX.size + 1
+
+
+def _build_chunk(charset_name, length, count, seed):
+    """Generate `count` validated records for one section."""
+    rng = random.Random(seed)
+    alphabet = get_alphabet(charset_name)
+    out = bytearray()
+    made = 0
+
+    while made < count:
+        seq_a = generate_sequence(length, alphabet, rng)
+        seq_b, changed_index = maybe_mutate_sequence(seq_a, 1.0, alphabet, rng)
+
+        # Substitutions such as 'W' -> 'VV' change the length; the bank is
+        # fixed-width, so those pairs are rejected and drawn again.
+        joined_a = "".join(seq_a)
+        joined_b = "".join(seq_b)
+        if len(joined_b) != length or joined_a == joined_b:
+            continue
+
+        out += joined_a.encode("ascii")
+        out += joined_b.encode("ascii")
+        out += INDEX.pack(changed_index)
+        out.append(rng.randrange(256))
+        made += 1
+
+    return bytes(out)
+
+
+def build_question_bank(path=QUESTION_BANK_FILE, count=10000, lengths=None,
+                        seed=0, workers=None):
+    """
+    Pre-generate a question bank for every charset and length.
+
+    Args:
+        path: Output file
+        count: Number of records per (charset, length) section
+        lengths: Sequence lengths to include (defaults to QUESTION_BANK_LENGTHS)
+        seed: Base seed, the same seed always produces the same file
+        workers: Number of worker processes (defaults to the CPU count)
+    """
+    lengths = lengths or QUESTION_BANK_LENGTHS
+    sections = [(name, length) for name in CHARSETS for length in lengths]
+
+    jobs = []
+    for name, length in sections:
+        for start in range(0, count, CHUNK_SIZE):
+            size = min(CHUNK_SIZE, count - start)
+            jobs.append((name, length, size, f"{seed}:{name}:{length}:{start}"))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunks = list(pool.map(_build_chunk, *zip(*jobs)))
+
+    offset = HEADER.size + SECTION.size * len(sections)
+    table = []
+    for name, length in sections:
+        table.append(SECTION.pack(name.encode("ascii"), length, count, offset))
+        offset += record_size(length) * count
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(sections)))
+        for row in table:
+            f.write(row)
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp_path, path)
+
+
+class QuestionBank:
+    def __init__(self, path=QUESTION_BANK_FILE):
+        """
+        Open a question bank file for reading.
+
+        Args:
+            path: Bank file created by build_question_bank
+        """
+        self._file = open(path, "rb")
+        self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, n_sections = HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} question bank")
+
+        self.sections = {}
+        for i in range(n_sections):
+            name, length, count, offset = SECTION.unpack_from(
+                self._buf, HEADER.size + i * SECTION.size
+            )
+            charset_name = name.rstrip(b"\0").decode("ascii")
+            self.sections[(charset_name, length)] = (count, offset)
+
+    def has(self, charset_name, length):
+        """Return True if the bank holds questions for this charset and length."""
+        return (charset_name, length) in self.sections
+
+    def size(self, charset_name, length):
+        """Number of records stored for this charset and length."""
+        return self.sections[(charset_name, length)][0]
+
+    def question(self, charset_name, length, index, probability):
+        """
+        Read one question from the bank.
+
+        Args:
+            charset_name: Name of the charset (key of CHARSETS)
+            length: Sequence length
+            index: Question index, wraps around the section size
+            probability: Mutation probability (0.0 - 1.0)
+
+        Returns:
+            (seq_a, seq_b, changed_index) just like generate/mutate
+        """
+        count, offset = self.sections[(charset_name, length)]
+        start = offset + (index % count) * record_size(length)
+        record = self._buf[start:start + record_size(length)]
+
+        seq_a = list(record[:length].decode("ascii"))
+        if record[-1] >= probability * 256:
+            return seq_a, seq_a.copy(), None
+
+        seq_b = list(record[length:2 * length].decode("ascii"))
+        changed_index = INDEX.unpack_from(record, 2 * length)[0]
+        return seq_a, seq_b, changed_index
+
+    def close(self):
+        """Release the memory map and file handle."""
+        self._buf.close()
+        self._file.close()
+
+
+_bank = None
+
+
+def get_question_bank():
+    """Return the shared QuestionBank, or None if no valid bank file exists."""
+    global _bank
+    if _bank is None and os.path.exists(QUESTION_BANK_FILE):
+        try:
+            _bank = QuestionBank(QUESTION_BANK_FILE)
+        except (OSError, ValueError, struct.error):
+            _bank = None
+    return _bank
+
+
+def make_question(length, charset_name, probability, index, rng=random):
+    """
+    Produce a question pair, from the bank when possible.
+
+    Falls back to live generation when no bank is installed or the bank has
+    no section for this charset and length.
+
+    Returns:
+        (seq_a, seq_b, changed_index)
+    """
+    bank = get_question_bank()
+    if bank is not None and bank.has(charset_name, length):
+        return bank.question(charset_name, length, index, probability)
+
+    alphabet = get_alphabet(charset_name)
+    seq_a = generate_sequence(length, alphabet, rng)
+    seq_b, changed_index = maybe_mutate_sequence(seq_a, probability, alphabet, rng)
+    return seq_a, seq_b, changed_index
@@ -0,0 +1,65 @@
+import random
+from logic.question_bank import make_question
+
+
+class QuestionRing:
+    def __init__(self, size, length, charset_name, probability):
+        """
+        Fixed-size ring buffer of ready-to-show questions.
+
+        Questions are stored already joined, so showing one is a plain
+        string swap with no per-question generation work.
+
+        Args:
+            size: Number of slots in the ring
+            length: Sequence length
+            charset_name: Name of the charset (key of CHARSETS)
+            probability: Mutation probability (0.0 - 1.0)
+        """
+        self.length = length
+        self.charset_name = charset_name
+        self.probability = probability
+        self._slots = [None] * size
+        self._head = 0
+        self._count = 0
+        self._question_index = random.randrange(1 << 30)
+
+    def __len__(self):
+        return self._count
+
+    def _make(self):
+        seq_a, seq_b, changed_index = make_question(
+            self.length, self.charset_name, self.probability, self._question_index
+        )
+        self._question_index += 1
+        return "".join(seq_a), "".join(seq_b), changed_index
+
+    def fill(self, limit=None):
+        """
+        Top up free slots.
+
+        Args:
+            limit: Maximum number of questions to generate, None fills the ring
+        """
+        size = len(self._slots)
+        free = size - self._count
+        if limit is not None:
+            free = min(free, limit)
+        for _ in range(free):
+            self._slots[(self._head + self._count) % size] = self._make()
+            self._count += 1
+
+    def pop(self):
+        """
+        Take the oldest question.
+
+        Returns:
+            (text_a, text_b, changed_index); generated on the spot if the ring ran dry
+        """
+        if self._count == 0:
+            return self._make()
+        question = self._slots[self._head]
+        self._slots[self._head] = None
+        self._head = (self._head + 1) % len(self._slots)
+        self._count -= 1
+        return question
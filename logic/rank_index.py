@@ -0,0 +1,88 @@
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+
+# Scores are quantized to 0.1% accuracy and whole milliseconds, with average
+# times above TIME_CAP_MS sharing the last bucket.
+ACCURACY_STEPS = 1000
+TIME_CAP_MS = 60000
+
+
+def score_key(accuracy, avg_time):
+    """
+    Quantize a score into one integer; lower keys are better runs.
+
+    Orders like the leaderboard: higher accuracy first, then faster time.
+    """
+    accuracy_step = min(max(round(accuracy * ACCURACY_STEPS / 100), 0), ACCURACY_STEPS)
+    time_step = min(max(round(avg_time), 0), TIME_CAP_MS)
+    return (ACCURACY_STEPS - accuracy_step) * (TIME_CAP_MS + 1) + time_step
+
+
+class RankIndex:
+    def __init__(self, scores=()):
+        """
+        Sorted array of quantized scores for O(log n) rank queries.
+
+        Args:
+            scores: Iterable of (accuracy, avg_time)
+        """
+        self.keys = array("q", sorted(score_key(a, t) for a, t in scores))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, accuracy, avg_time):
+        """Add one score."""
+        insort(self.keys, score_key(accuracy, avg_time))
+
+    def remove(self, accuracy, avg_time):
+        """Remove one score, if present."""
+        key = score_key(accuracy, avg_time)
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            del self.keys[i]
+
+    def update(self, added=(), removed=()):
+        """
+        Add and remove many scores at once.
+
+        The new keys are sorted into the array in one pass; an insort per
+        score would make loading a whole log O(n^2).
+
+        Args:
+            added: List of (accuracy, avg_time) to add
+            removed: List of (accuracy, avg_time) to remove, if present
+        """
+        if len(added) == 1 and not removed:
+            self.add(*added[0])
+            return
+        keys = self.keys.tolist()
+        keys.extend(score_key(a, t) for a, t in added)
+        # Both runs are sorted, so this is a linear merge
+        keys.sort()
+        if removed:
+            pending = Counter(score_key(a, t) for a, t in removed)
+            kept = []
+            for key in keys:
+                if pending[key]:
+                    pending[key] -= 1
+                else:
+                    kept.append(key)
+            keys = kept
+        self.keys = array("q", keys)
+
+    def rank(self, accuracy, avg_time):
+        """
+        Rank of a score that is already in the index.
+
+        Returns:
+            (rank, total, percent of the other runs it beats); equal
+            scores share a rank
+        """
+        key = score_key(accuracy, avg_time)
+        total = len(self.keys)
+        rank = bisect_left(self.keys, key) + 1
+        worse = total - bisect_right(self.keys, key)
+        beaten = worse / (total - 1) * 100 if total > 1 else 100.0
+        return rank, total, beaten
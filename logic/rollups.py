@@ -0,0 +1,124 @@
+import math
+from datetime import date, datetime, timedelta
+from config import ROLLUP_DAILY_DAYS
+
+# Latency histogram bucket edges in ms, log-spaced from 50 ms to ~30 s.
+# Percentiles are read off the histogram, so buckets stay a fixed size.
+LATENCY_EDGES_MS = [50 * 1.2 ** i for i in range(36)]
+PERIODS = ("daily", "weekly")
+
+
+def empty_rollups():
+    """Create an empty rollup structure."""
+    return {period: {} for period in PERIODS}
+
+
+def _empty_bucket():
+    return {"questions": 0, "correct": 0, "latency": [0] * (len(LATENCY_EDGES_MS) + 1)}
+
+
+def _latency_bin(ms):
+    if ms < LATENCY_EDGES_MS[0]:
+        return 0
+    return min(int(math.log(ms / LATENCY_EDGES_MS[0], 1.2)) + 1, len(LATENCY_EDGES_MS))
+
+
+def period_keys(day):
+    """Bucket keys of a day: ("YYYY-MM-DD", "YYYY-Www")."""
+    year, week, _ = day.isocalendar()
+    return day.isoformat(), f"{year}-W{week:02d}"
+
+
+def add_answer(rollups, timestamp, was_correct, elapsed):
+    """
+    Count one answer in its daily and weekly bucket.
+
+    Only the last ROLLUP_DAILY_DAYS daily buckets are kept.
+
+    Args:
+        rollups: Structure from empty_rollups
+        timestamp: ISO timestamp of the answer
+        was_correct: Whether the answer was correct
+        elapsed: Response time in seconds
+    """
+    day = datetime.fromisoformat(timestamp).date()
+    latency_bin = _latency_bin(elapsed * 1000)
+    for period, key in zip(PERIODS, period_keys(day)):
+        bucket = rollups[period].get(key)
+        if bucket is None:
+            bucket = rollups[period][key] = _empty_bucket()
+            if period == "daily":
+                _prune_daily(rollups[period])
+        bucket["questions"] += 1
+        if was_correct:
+            bucket["correct"] += 1
+        bucket["latency"][latency_bin] += 1
+
+
+def merge_rollups(rollups, other):
+    """Add another rollup structure into `rollups`."""
+    for period in PERIODS:
+        for key, theirs in other.get(period, {}).items():
+            mine = rollups[period].setdefault(key, _empty_bucket())
+            mine["questions"] += theirs["questions"]
+            mine["correct"] += theirs["correct"]
+            mine["latency"] = [a + b for a, b in zip(mine["latency"], theirs["latency"])]
+    _prune_daily(rollups["daily"])
+
+
+def _prune_daily(daily):
+    """Drop daily buckets more than ROLLUP_DAILY_DAYS before the newest one."""
+    if len(daily) <= ROLLUP_DAILY_DAYS:
+        return
+    newest = date.fromisoformat(max(daily))
+    cutoff = (newest - timedelta(days=ROLLUP_DAILY_DAYS - 1)).isoformat()
+    for key in [key for key in daily if key < cutoff]:
+        del daily[key]
+
+
+def latency_percentile(histogram, q):
+    """
+    Approximate latency percentile in ms from a bucket histogram.
+
+    Args:
+        histogram: Bucket counts
+        q: Percentile between 0 and 100
+    """
+    total = sum(histogram)
+    if total == 0:
+        return 0
+    target = total * q / 100
+    seen = 0
+    for i, count in enumerate(histogram):
+        if count and seen + count >= target:
+            low = LATENCY_EDGES_MS[i - 1] if i > 0 else 0
+            high = LATENCY_EDGES_MS[i] if i < len(LATENCY_EDGES_MS) else LATENCY_EDGES_MS[-1] * 1.2
+            return low + (high - low) * (target - seen) / count
+        seen += count
+    return LATENCY_EDGES_MS[-1]
+
+
+def bucket_date(period, key):
+    """Date a bucket starts on."""
+    if period == "weekly":
+        year, week = key.split("-W")
+        return date.fromisocalendar(int(year), int(week), 1)
+    return date.fromisoformat(key)
+
+
+def series(rollups, period):
+    """
+    Time series of one rollup period.
+
+    Returns:
+        List of (date, questions, accuracy %, median ms, p90 ms) sorted by date
+    """
+    points = []
+    for key, bucket in rollups.get(period, {}).items():
+        questions = bucket["questions"]
+        accuracy = bucket["correct"] / questions * 100 if questions else 0
+        points.append((bucket_date(period, key), questions, accuracy,
+                       latency_percentile(bucket["latency"], 50),
+                       latency_percentile(bucket["latency"], 90)))
+    points.sort()
+    return points
@@ -0,0 +1,49 @@
+from logic.sequence import find_changed_index
+
+
+def score_results(results):
+    """
+    Score a finished run.
+
+    Args:
+        results: List of (seq_a, seq_b, correct_answer, user_guess, elapsed)
+
+    Returns:
+        (accuracy %, average response time in ms)
+    """
+    total = len(results)
+    if total == 0:
+        return 0, 0
+    correct = sum(1 for _, _, correct_answer, user_guess, _ in results if user_guess == correct_answer)
+    return correct / total * 100, sum(r[4] for r in results) / total * 1000
+
+
+def detailed_results(results, render_times=()):
+    """
+    Convert raw results into the per-question records stored with a score.
+
+    Args:
+        results: List of (seq_a, seq_b, correct_answer, user_guess, elapsed)
+        render_times: Display time in ms of each question, if measured
+    """
+    records = []
+    for idx, (seq_a, seq_b, correct_answer, user_guess, elapsed) in enumerate(results):
+        # Find the changed character if sequences are different
+        changed_index = None
+        changed_char = None
+        if correct_answer:  # Sequences are different
+            changed_index = find_changed_index(seq_a, seq_b)
+            changed_char = seq_b[changed_index]
+
+        records.append({
+            'seq_a': seq_a,
+            'seq_b': seq_b,
+            'correct_answer': correct_answer,  # True = different, False = same
+            'user_guess': user_guess,  # True = different, False = same
+            'response_time_ms': elapsed * 1000,
+            'render_time_ms': render_times[idx] if idx < len(render_times) else None,
+            'was_correct': user_guess == correct_answer,
+            'changed_index': changed_index,
+            'changed_char': changed_char
+        })
+    return records
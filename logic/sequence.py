@@ -4,21 +4,37 @@ from config import SIMILAR_MAP, CHARSETS
 def get_alphabet(charset_name: str) -> str:
     return CHARSETS[charset_name]
 
-def generate_sequence(length: int, alphabet: str) -> list[str]:
-    return [random.choice(alphabet) for _ in range(length)]
+def generate_sequence(length: int, alphabet: str, rng=random) -> list[str]:
+    return [rng.choice(alphabet) for _ in range(length)]
 
-def maybe_mutate_sequence(sequence, probability, alphabet):
+def maybe_mutate_sequence(sequence, probability, alphabet, rng=random):
     # If no mutation should happen, return original sequence
-    if random.random() >= probability:
+    if rng.random() >= probability:
         return sequence.copy(), None
 
     # Choose a random position to mutate
-    index = random.randrange(len(sequence))
+    index = rng.randrange(len(sequence))
     original = sequence[index]
     
-    new_value = random.choice(SIMILAR_MAP[original])
+    new_value = rng.choice(SIMILAR_MAP[original])
 
     
     mutated = sequence.copy()
     mutated[index] = new_value
-    return mutated, index
\ No newline at end of file
+    return mutated, index
+
+def find_changed_index(seq_a: str, seq_b: str):
+    """
+    Return the index of the first differing character, or None if equal.
+
+    Both strings are compared as big integers, so the scan runs in C
+    instead of a Python loop, even for sequences of thousands of characters.
+    """
+    if seq_a == seq_b:
+        return None
+    n = min(len(seq_a), len(seq_b))
+    diff = (int.from_bytes(seq_a[:n].encode("utf-32-be"), "big")
+            ^ int.from_bytes(seq_b[:n].encode("utf-32-be"), "big"))
+    if diff == 0:
+        return n
+    return n - (diff.bit_length() + 31) // 32
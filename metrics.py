@@ -0,0 +1,236 @@
+"""
+Process metrics in the Prometheus text exposition format.
+
+Updates are plain attribute increments on pre-created objects, so the
+game can count on its hot paths for well under a microsecond each. The
+Tk thread is the only writer; the metrics server thread only reads, and
+a scrape may see a histogram mid-update at worst.
+
+Nothing is served unless METRICS_PORT is set in config.py.
+"""
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_families = []
+_started = time.time()
+
+
+class Counter:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+
+class Histogram:
+    __slots__ = ('edges', 'counts', 'sum')
+
+    def __init__(self, edges):
+        self.edges = edges
+        # One extra bucket for values above the last edge (+Inf)
+        self.counts = [0] * (len(edges) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.edges, value)] += 1
+        self.sum += value
+
+    def time(self):
+        """Context manager observing the seconds spent inside it."""
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+
+
+class Family:
+    def __init__(self, kind, name, help_text, labelnames=(), buckets=None):
+        """
+        A named metric with one child per combination of label values.
+
+        Args:
+            kind: "counter", "histogram" or "gauge"
+            name: Metric name
+            help_text: HELP line
+            labelnames: Label names, in the order labels() takes the values
+            buckets: Histogram upper bounds in ascending order
+        """
+        self.kind = kind
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self.children = {}
+        self.function = None
+        if not labelnames and kind != "gauge":
+            # Unlabelled metrics are exported as 0 before their first update
+            self.labels()
+        _families.append(self)
+
+    def labels(self, *values):
+        """Child for these label values, created on first use."""
+        child = self.children.get(values)
+        if child is None:
+            child = Histogram(self.buckets) if self.kind == "histogram" else Counter()
+            self.children[values] = child
+        return child
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        if self.function is not None:
+            lines.append(f"{self.name} {self.function()}")
+            return lines
+        for values, child in list(self.children.items()):
+            labels = [f'{name}="{value}"' for name, value in zip(self.labelnames, values)]
+            if self.kind != "histogram":
+                lines.append(f"{self.name}{_braces(labels)} {child.value}")
+                continue
+            counts = list(child.counts)
+            total = 0
+            for edge, count in zip(self.buckets + [float("inf")], counts):
+                total += count
+                le = "+Inf" if edge == float("inf") else repr(edge)
+                bucket = labels + [f'le="{le}"']
+                lines.append(f"{self.name}_bucket{_braces(bucket)} {total}")
+            lines.append(f"{self.name}_sum{_braces(labels)} {child.sum}")
+            lines.append(f"{self.name}_count{_braces(labels)} {total}")
+        return lines
+
+
+def _braces(labels):
+    return "{" + ",".join(labels) + "}" if labels else ""
+
+
+def counter(name, help_text, labelnames=()):
+    return Family("counter", name, help_text, labelnames)
+
+
+def histogram(name, help_text, buckets, labelnames=()):
+    return Family("histogram", name, help_text, labelnames, list(buckets))
+
+
+def gauge(name, help_text, function):
+    """Gauge whose value is computed by `function` at scrape time."""
+    family = Family("gauge", name, help_text)
+    family.function = function
+    return family
+
+
+def resident_bytes():
+    """Current resident set size, or the peak where /proc is not available."""
+    try:
+        with open("/proc/self/statm", 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        if resource is None:
+            return 0
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def render():
+    """All metrics as one exposition-format document."""
+    lines = []
+    for family in _families:
+        lines.extend(family.render())
+    return "\n".join(lines) + "\n"
+
+
+GAMES_STARTED = counter("eyefocus_games_started_total", "Games started.", ("mode",))
+GAMES_COMPLETED = counter("eyefocus_games_completed_total", "Games played to the summary.", ("mode",))
+ANSWERS = counter("eyefocus_answers_total", "Answers given.", ("mode", "result"))
+FLAGGED_RUNS = counter(
+    "eyefocus_flagged_runs_total", "Finished runs whose response times look automated.", ("mode",))
+RESPONSE_SECONDS = histogram(
+    "eyefocus_response_seconds", "Time from question onset to answer.",
+    (0.25, 0.5, 0.75, 1, 1.5, 2, 3, 5, 10, 30), ("mode",))
+STORE_WRITE_SECONDS = histogram(
+    "eyefocus_store_write_seconds", "Store writes, including waiting for the file lock.",
+    (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1), ("store",))
+STATISTICS_CONFLICTS = counter(
+    "eyefocus_statistics_conflicts_total",
+    "Statistics saves that first caught up with another instance's checkpoint.")
+EVENT_LOOP_STALLS = counter(
+    "eyefocus_event_loop_stalls_total", "Times the Tk event loop was blocked past the stall threshold.")
+EVENT_LOOP_LAG = histogram(
+    "eyefocus_event_loop_lag_seconds", "Lateness of the event loop heartbeat.",
+    (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5))
+gauge("eyefocus_resident_memory_bytes", "Resident set size of the game process.", resident_bytes)
+gauge("eyefocus_start_time_seconds", "Unix time the process started.", lambda: _started)
+
+
+def watch_event_loop(root, interval_ms=100, stall_ms=250):
+    """
+    Measure event loop stalls with a Tk heartbeat.
+
+    Args:
+        root: Tk root window
+        interval_ms: Heartbeat period
+        stall_ms: Lateness counted as a stall
+    """
+    lag_histogram = EVENT_LOOP_LAG.labels()
+    stalls = EVENT_LOOP_STALLS.labels()
+
+    def beat(expected):
+        now = time.perf_counter()
+        lag = max(now - expected, 0.0)
+        lag_histogram.observe(lag)
+        if lag * 1000 >= stall_ms:
+            stalls.inc()
+        root.after(interval_ms, beat, now + interval_ms / 1000)
+
+    root.after(interval_ms, beat, time.perf_counter() + interval_ms / 1000)
+
+
+def serve_metrics(port, host="127.0.0.1"):
+    """
+    Serve /metrics from a daemon thread.
+
+    Returns:
+        The running server (server_address holds the bound port)
+    """
+    # Imported here so modules that only count do not load the HTTP stack
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render().encode('utf-8')
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
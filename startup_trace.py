@@ -0,0 +1,46 @@
+import json
+import time
+from datetime import datetime
+
+
+class StartupTrace:
+    def __init__(self):
+        """
+        Time the phases of starting the game up to its first frame.
+
+        Create it before the heavy imports and call mark() after each phase;
+        marks only read the clock, so tracing costs nothing when unreported.
+        """
+        self.start = self.last = time.perf_counter()
+        self.phases = []
+
+    def mark(self, phase):
+        """End a phase, timing it from the previous mark."""
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last) * 1000))
+        self.last = now
+
+    def total_ms(self):
+        """Milliseconds from creation to the last mark."""
+        return (self.last - self.start) * 1000
+
+    def report(self, path=None, stream=None):
+        """
+        Report the phase timings.
+
+        Args:
+            path: File to append a JSON line to, or None
+            stream: Text stream for a readable breakdown, or None
+        """
+        if path:
+            record = {
+                'timestamp': datetime.now().isoformat(),
+                'total_ms': round(self.total_ms(), 1),
+                'phases': {phase: round(ms, 1) for phase, ms in self.phases},
+            }
+            with open(path, 'a') as f:
+                f.write(json.dumps(record) + "\n")
+        if stream:
+            print(f"Startup: {self.total_ms():.1f} ms to first frame", file=stream)
+            for phase, ms in self.phases:
+                print(f"  {phase:<18} {ms:8.1f} ms", file=stream)
@@ -0,0 +1,349 @@
+"""
+Benchmark sequence generation, the stores, statistics and the Tk screens.
+
+Every benchmark runs in its own empty temporary working directory, since
+the stores use paths relative to it. Results are written as JSON; with a
+baseline file each result is compared to its stored time and the run
+fails (exit status 1) when one is slower than the allowed threshold.
+
+No baseline ships with the repo, since times depend on the machine.
+Until one is saved nothing is compared and no run fails: record it once
+with --save-baseline on the machine that runs the checks (and again
+after an intended slowdown), then run without the flag.
+
+The UI benchmarks need a display. Without DISPLAY, a virtual one is
+started with Xvfb when it is installed; otherwise they are skipped.
+
+Usage:
+    python -m tools.benchmark --save-baseline
+    python -m tools.benchmark --threshold 0.25 --json benchmark_results.json
+    python -m tools.benchmark --only leaderboard --quick
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BASELINE_FILE = "benchmark_baseline.json"
+RESULTS_FILE = "benchmark_results.json"
+DEFAULT_THRESHOLD = 0.25
+# Tk timings depend on the X server and vary more between runs
+UI_THRESHOLD = 0.5
+XVFB_DISPLAY = ":99"
+
+
+def measure(func, repeat, number=1):
+    """
+    Time `func`.
+
+    Args:
+        func: Callable to time
+        repeat: Number of timed samples
+        number: Calls per sample
+
+    Returns:
+        Fastest seconds per call. The minimum is the least noisy estimate
+        on a busy machine, which keeps the regression check stable.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return min(samples)
+
+
+def make_results(rng, questions=15):
+    """Random (seq_a, seq_b, correct_answer, user_guess, elapsed) tuples like a challenge run."""
+    from logic.question_bank import make_question
+
+    results = []
+    for idx in range(questions):
+        seq_a, seq_b, index = make_question(10 + 5 * (idx // 5), "Alphanumeric", 0.5,
+                                            rng.randrange(1 << 30), rng)
+        different = index is not None
+        guess = different if rng.random() < 0.85 else not different
+        results.append(("".join(seq_a), "".join(seq_b), different, guess, rng.uniform(0.4, 2.5)))
+    return results
+
+
+def seed_leaderboard(size, rng):
+    """Write a leaderboard of `size` entries without detailed results."""
+    from data.leaderboard_store import save_leaderboard
+
+    start = datetime(2024, 1, 1)
+    save_leaderboard([{
+        'id': f"{i:012x}",
+        'username': f"player{i % 500}",
+        'accuracy': round(rng.uniform(40, 100), 1),
+        'avg_time': rng.randint(300, 3000),
+        'timestamp': (start + timedelta(seconds=i)).isoformat(),
+        'detailed_results': [],
+    } for i in range(size)])
+
+
+def seed_events(sessions, rng):
+    """Log `sessions` finished challenges to the event log."""
+    from data.event_log import answer_event, session_event, append_events
+
+    for first in range(0, sessions, 500):
+        events = []
+        for session in range(first, min(first + 500, sessions)):
+            user = f"player{session % 50}"
+            for idx, result in enumerate(make_results(rng)):
+                events.append(answer_event("challenge", f"s{session}", user, idx, idx // 5, *result))
+            events.append(session_event("challenge", f"s{session}", user, 15))
+        append_events(events)
+
+
+def bench_generate(quick):
+    from logic.sequence import generate_sequence, get_alphabet
+
+    rng = random.Random(0)
+    alphabet = get_alphabet("Alphanumeric")
+    return {f"generate_sequence[{length}]": measure(lambda: generate_sequence(length, alphabet, rng),
+                                                    repeat=7, number=200 if quick else 1000)
+            for length in (20, 3000)}
+
+
+def bench_mutate(quick):
+    from logic.sequence import generate_sequence, maybe_mutate_sequence, get_alphabet
+
+    rng = random.Random(0)
+    alphabet = get_alphabet("Alphanumeric")
+    timings = {}
+    for length in (20, 3000):
+        sequence = generate_sequence(length, alphabet, rng)
+        timings[f"maybe_mutate_sequence[{length}]"] = measure(
+            lambda: maybe_mutate_sequence(sequence, 1.0, alphabet, rng),
+            repeat=7, number=200 if quick else 1000)
+    return timings
+
+
+def bench_leaderboard_add(quick):
+    from data import leaderboard_store
+    from data.leaderboard_store import add_to_leaderboard
+    from logic.scoring import detailed_results
+
+    rng = random.Random(0)
+    details = detailed_results(make_results(rng))
+    timings = {}
+    for size in (50, 5000) if quick else (50, 5000, 500000):
+        seed_leaderboard(size, rng)
+
+        # The first add of a session reads the whole log into the index
+        def cold_load():
+            leaderboard_store._reset_index(None)
+            leaderboard_store._load_index()
+        timings[f"leaderboard_cold_load[{size}]"] = measure(cold_load, repeat=3 if size > 5000 else 7)
+        timings[f"add_to_leaderboard[{size}]"] = measure(
+            lambda: add_to_leaderboard("bench", round(rng.uniform(40, 100), 1), 800, details),
+            repeat=100)
+    return timings
+
+
+def bench_statistics(quick):
+    from game_manager import StatisticsManager
+
+    rng = random.Random(0)
+    timings = {}
+    seeded = 0
+    for sessions in (10, 1000) if quick else (10, 1000, 10000):
+        seed_events(sessions - seeded, rng)
+        seeded = sessions
+        manager = StatisticsManager()
+        results = make_results(rng)
+        timings[f"record_challenge_result[{sessions}]"] = measure(
+            lambda: manager.record_challenge_result(results), repeat=9)
+        seeded += 9
+        timings[f"get_statistics[{sessions}]"] = measure(manager.get_statistics, repeat=9)
+    return timings
+
+
+def bench_leaderboard_ui(quick):
+    import tkinter as tk
+    from ui.leaderboard_menu import Leaderboard
+
+    rng = random.Random(0)
+    root = tk.Tk()
+    try:
+        timings = {}
+        for size in (50, 5000):
+            seed_leaderboard(size, rng)
+
+            def build():
+                Leaderboard(root, lambda: None)
+                root.update_idletasks()
+            timings[f"Leaderboard[{size}]"] = measure(build, repeat=3 if quick else 7)
+        return timings
+    finally:
+        root.destroy()
+
+
+def bench_history_ui(quick):
+    import tkinter as tk
+    from logic.scoring import detailed_results
+    from ui.history_viewer import HistoryViewer
+
+    rng = random.Random(0)
+    entry = {'id': "0" * 12, 'username': "bench", 'accuracy': 90.0, 'avg_time': 800,
+             'timestamp': datetime(2024, 1, 1).isoformat(),
+             'detailed_results': detailed_results(make_results(rng))}
+    root = tk.Tk()
+    try:
+        def build():
+            HistoryViewer(root, entry, lambda: None)
+            root.update_idletasks()
+        return {"HistoryViewer[15]": measure(build, repeat=3 if quick else 7)}
+    finally:
+        root.destroy()
+
+
+# name: (function, needs a display)
+BENCHMARKS = {
+    "generate": (bench_generate, False),
+    "mutate": (bench_mutate, False),
+    "leaderboard_add": (bench_leaderboard_add, False),
+    "statistics": (bench_statistics, False),
+    "leaderboard_ui": (bench_leaderboard_ui, True),
+    "history_ui": (bench_history_ui, True),
+}
+
+
+def ensure_display():
+    """
+    Make sure Tk can open a window, starting Xvfb if needed.
+
+    Returns:
+        (display available, Xvfb process to stop or None)
+    """
+    if os.environ.get("DISPLAY"):
+        return True, None
+    if not shutil.which("Xvfb"):
+        return False, None
+    xvfb = subprocess.Popen(["Xvfb", XVFB_DISPLAY, "-screen", "0", "1280x800x24"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = XVFB_DISPLAY
+    time.sleep(1)
+    return xvfb.poll() is None, xvfb
+
+
+def run_benchmark(func, quick):
+    """Run one benchmark in a fresh temporary working directory."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="eyefocus-bench-") as folder:
+        os.chdir(folder)
+        try:
+            return func(quick)
+        finally:
+            os.chdir(cwd)
+
+
+def compare(results, baseline, threshold):
+    """
+    Annotate results with their baseline and mark regressions.
+
+    Returns:
+        Names of regressed results
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name, {}).get("seconds")
+        if result["status"] != "ok" or not previous:
+            continue
+        limit = threshold if not result["ui"] else max(threshold, UI_THRESHOLD)
+        result["baseline"] = previous
+        result["ratio"] = round(result["seconds"] / previous, 3)
+        result["regressed"] = result["ratio"] > 1 + limit
+        if result["regressed"]:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmarks and check for regressions.")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), default=None,
+                        help="benchmarks to run (default: all)")
+    parser.add_argument("--quick", action="store_true",
+                        help="skip the largest sizes and take fewer samples")
+    parser.add_argument("--baseline", default=BASELINE_FILE,
+                        help="baseline file to compare with (default: %(default)s)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store this run's times as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown against the baseline, 0.25 = 25%% (default: %(default)s)")
+    parser.add_argument("--json", default=RESULTS_FILE,
+                        help="results file, - for stdout (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    names = args.only or list(BENCHMARKS)
+    display, xvfb = ensure_display() if any(BENCHMARKS[n][1] for n in names) else (False, None)
+
+    results = {}
+    try:
+        for name in names:
+            func, ui = BENCHMARKS[name]
+            if ui and not display:
+                results[name] = {"status": "skipped", "reason": "no display", "ui": True}
+                continue
+            for key, seconds in run_benchmark(func, args.quick).items():
+                results[key] = {"status": "ok", "seconds": seconds, "ui": ui}
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)["results"]
+    elif not args.save_baseline:
+        print(f"No baseline at {args.baseline}, nothing is compared; "
+              f"run with --save-baseline to record one", file=sys.stderr)
+    regressions = compare(results, baseline, args.threshold)
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": args.quick,
+        "threshold": args.threshold,
+        "results": results,
+        "regressions": regressions,
+    }
+    text = json.dumps(report, indent=2)
+    if args.json == "-":
+        print(text)
+    else:
+        with open(args.json, 'w') as f:
+            f.write(text + "\n")
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            f.write(text + "\n")
+
+    # Human-readable summary goes to stderr when the JSON is on stdout
+    out = sys.stderr if args.json == "-" else sys.stdout
+    for name, result in results.items():
+        if result["status"] != "ok":
+            print(f"  {name:34} {result['status']} ({result['reason']})", file=out)
+            continue
+        line = f"  {name:34} {result['seconds'] * 1e6:12.1f} us"
+        if "ratio" in result:
+            line += f"  x{result['ratio']:.2f}{'  REGRESSED' if result['regressed'] else ''}"
+        print(line, file=out)
+    elapsed = time.perf_counter() - start
+    print(f"Ran {len(results)} benchmarks in {elapsed:.1f} s, "
+          f"{len(regressions)} regressions", file=out)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
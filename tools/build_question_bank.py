@@ -0,0 +1,39 @@
+"""
+Build the pre-generated question bank.
+
+Usage:
+    python -m tools.build_question_bank --count 20000 --seed 2024
+"""
+import argparse
+import time
+from config import QUESTION_BANK_FILE, QUESTION_BANK_LENGTHS
+from logic.question_bank import QuestionBank, build_question_bank
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-generate a question bank.")
+    parser.add_argument("--output", default=QUESTION_BANK_FILE,
+                        help="bank file to write (default: %(default)s)")
+    parser.add_argument("--count", type=int, default=10000,
+                        help="questions per charset and length (default: %(default)s)")
+    parser.add_argument("--lengths", type=int, nargs="+", default=QUESTION_BANK_LENGTHS,
+                        help="sequence lengths to include")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="base seed, identical seeds give identical banks")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    build_question_bank(args.output, args.count, args.lengths, args.seed, args.workers)
+    elapsed = time.perf_counter() - start
+
+    bank = QuestionBank(args.output)
+    total = sum(count for count, _ in bank.sections.values())
+    bank.close()
+    print(f"Wrote {total} questions in {len(bank.sections)} sections "
+          f"to {args.output} in {elapsed:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
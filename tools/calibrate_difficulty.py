@@ -0,0 +1,230 @@
+"""
+Fit question difficulty and player ability to every logged answer.
+
+The model is a logistic (Rasch-style) one:
+
+    P(correct) = sigmoid(intercept + ability[player] - length[n] - charset[c]
+                         - item[pair or "same"] - position[bucket])
+
+Every parameter has a standard normal prior, so rarely seen players and
+pairs stay close to average. It is fitted by mini-batch Adam over NumPy
+arrays, and the result is written to a calibration table (see
+logic.calibration) that the challenge can use to pick level lengths for
+a target accuracy.
+
+Needs NumPy (pip install numpy); the game itself does not.
+
+Usage:
+    python -m tools.calibrate_difficulty
+    python -m tools.calibrate_difficulty --epochs 12 --targets 0.95 0.85 0.75
+"""
+import argparse
+import sys
+import time
+from array import array
+from datetime import datetime
+import config
+from config import CALIBRATION_FILE, CONFUSION_POSITIONS, EVENT_LOG_FILE
+from data.event_log import read_events
+from data.file_lock import atomic_write_json
+from data.profile_store import normalize_username
+from logic.calibration import VERSION, Calibration, answer_features
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Feature groups, in column order; ability is added, the rest subtracted
+GROUPS = ("ability", "length", "charset", "item", "position")
+SIGNS = (1.0, -1.0, -1.0, -1.0, -1.0)
+
+
+def load_answers(path=EVENT_LOG_FILE):
+    """
+    Read every answer in the event log as feature columns.
+
+    Returns:
+        (columns, correct, vocabularies): an (answers, groups) int array of
+        column numbers within each group, a bool array, and a {key: column}
+        dict per group. "Same" questions have the position key None.
+    """
+    vocabularies = [{} for _ in GROUPS]
+    columns, correct = array("i"), array("b")
+    for _, event in read_events(path=path):
+        if event.get("type") != "answer":
+            continue
+        charset, length, item, position = answer_features(event)
+        user = normalize_username(event["user"]) if event.get("user") else ""
+        for vocabulary, key in zip(vocabularies, (user, length, charset, item, position)):
+            columns.append(vocabulary.setdefault(key, len(vocabulary)))
+        correct.append(event["user_guess"] == event["correct_answer"])
+    columns = np.frombuffer(columns, dtype=np.int32).reshape(-1, len(GROUPS))
+    return columns, np.frombuffer(correct, dtype=np.int8).astype(bool), vocabularies
+
+
+def fit(columns, correct, sizes, pinned=(), epochs=8, batch_size=8192,
+        learning_rate=0.05, l2=1.0, seed=0):
+    """
+    Fit the logistic model by mini-batch Adam.
+
+    Args:
+        columns: (answers, groups) column numbers from load_answers
+        correct: Whether each answer was correct
+        sizes: Number of columns in each group
+        pinned: Parameter numbers held at 0
+        epochs: Passes over the answers
+        batch_size: Answers per gradient step
+        learning_rate: Adam step size
+        l2: Precision of the normal prior on every parameter but the intercept
+        seed: Shuffling seed
+
+    Returns:
+        Parameter vector: the intercept, then each group's columns in order
+    """
+    n = len(correct)
+    offsets = np.cumsum([1] + list(sizes[:-1]))
+    index = columns + offsets.astype(np.int32)
+    signs = np.array(SIGNS)
+    y = correct.astype(np.float64)
+    pinned = np.array(pinned, dtype=np.int64)
+
+    params = np.zeros(1 + sum(sizes))
+    accuracy = min(max(y.mean(), 1e-3), 1 - 1e-3)
+    params[0] = np.log(accuracy / (1 - accuracy))
+    m, v = np.zeros_like(params), np.zeros_like(params)
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    rng = np.random.default_rng(seed)
+    step = 0
+
+    for _ in range(epochs):
+        order = rng.permutation(n)
+        for start in range(0, n, batch_size):
+            batch = order[start:start + batch_size]
+            rows = index[batch]
+            z = params[0] + params[rows] @ signs
+            residual = 1.0 / (1.0 + np.exp(-z)) - y[batch]
+            # d(mean log loss)/d(parameter), summed over each parameter's answers
+            grad = np.bincount(rows.ravel(), weights=(residual[:, None] * signs).ravel(),
+                               minlength=len(params)) / len(batch)
+            grad[0] = residual.mean()
+            # The prior is spread over the whole data set, one share per answer
+            grad[1:] += l2 * params[1:] / n
+
+            step += 1
+            m = beta1 * m + (1 - beta1) * grad
+            v = beta2 * v + (1 - beta2) * grad * grad
+            params -= learning_rate * (m / (1 - beta1 ** step)) / (np.sqrt(v / (1 - beta2 ** step)) + eps)
+            params[pinned] = 0.0
+    return params
+
+
+def log_loss(params, columns, correct, sizes):
+    """Mean log loss and share of answers predicted correctly."""
+    offsets = np.cumsum([1] + list(sizes[:-1]))
+    z = params[0] + params[columns + offsets.astype(np.int32)] @ np.array(SIGNS)
+    p = np.clip(1.0 / (1.0 + np.exp(-z)), 1e-12, 1 - 1e-12)
+    loss = -np.mean(np.where(correct, np.log(p), np.log(1 - p)))
+    return float(loss), float(np.mean((p >= 0.5) == correct))
+
+
+def calibration_table(params, columns, vocabularies):
+    """Calibration table (see logic.calibration) from fitted parameters."""
+    sizes = [len(vocabulary) for vocabulary in vocabularies]
+    offsets = np.cumsum([1] + sizes[:-1])
+    groups = {}
+    for name, vocabulary, offset in zip(GROUPS, vocabularies, offsets):
+        groups[name] = {key: round(float(params[offset + column]), 4)
+                        for key, column in vocabulary.items()}
+
+    positions = [0.0] * CONFUSION_POSITIONS
+    for bucket, value in groups["position"].items():
+        if bucket is not None:
+            positions[bucket] = value
+    length_answers = np.bincount(columns[:, GROUPS.index("length")], minlength=sizes[1])
+
+    return {
+        "version": VERSION,
+        "fitted_at": datetime.now().isoformat(timespec="seconds"),
+        "intercept": round(float(params[0]), 4),
+        "difficulty": {
+            "length": {str(length): value for length, value in groups["length"].items()},
+            "charset": groups["charset"],
+            "item": groups["item"],
+            "position": positions,
+        },
+        "ability": groups["ability"],
+        "answers": {
+            "length": {str(length): int(length_answers[column])
+                       for length, column in vocabularies[1].items()},
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calibrate question difficulty from the event log.")
+    parser.add_argument("--events", default=EVENT_LOG_FILE,
+                        help="event log to fit (default: %(default)s)")
+    parser.add_argument("--output", default=CALIBRATION_FILE,
+                        help="calibration table to write (default: %(default)s)")
+    parser.add_argument("--epochs", type=int, default=8,
+                        help="passes over the answers (default: %(default)s)")
+    parser.add_argument("--batch-size", type=int, default=8192,
+                        help="answers per gradient step (default: %(default)s)")
+    parser.add_argument("--learning-rate", type=float, default=0.05,
+                        help="Adam step size (default: %(default)s)")
+    parser.add_argument("--l2", type=float, default=1.0,
+                        help="prior precision, higher pulls rare players and pairs to average "
+                             "(default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="shuffling seed (default: %(default)s)")
+    parser.add_argument("--targets", type=float, nargs="+",
+                        default=config.LEVEL_TARGET_ACCURACY or [0.9, 0.8, 0.7],
+                        help="target accuracy per level for the suggested schedule "
+                             "(default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if np is None:
+        print("calibrate_difficulty needs NumPy: pip install numpy", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    columns, correct, vocabularies = load_answers(args.events)
+    if not len(correct):
+        print(f"No answers in {args.events}")
+        return 1
+    loaded = time.perf_counter()
+
+    sizes = [len(vocabulary) for vocabulary in vocabularies]
+    # "Same" questions have no position; their difficulty is the "same" item
+    pinned = [1 + sum(sizes[:-1]) + vocabularies[-1][None]] if None in vocabularies[-1] else []
+    params = fit(columns, correct, sizes, pinned, args.epochs, args.batch_size,
+                 args.learning_rate, args.l2, args.seed)
+    fitted = time.perf_counter()
+
+    table = calibration_table(params, columns, vocabularies)
+    atomic_write_json(args.output, table)
+    loss, agreement = log_loss(params, columns, correct, sizes)
+
+    print(f"Fitted {len(correct)} answers from {sizes[0]} players in {fitted - start:.1f} s "
+          f"(read {loaded - start:.1f} s, fit {fitted - loaded:.1f} s) to {args.output}")
+    rate = min(max(float(correct.mean()), 1e-12), 1 - 1e-12)
+    baseline = -(rate * np.log(rate) + (1 - rate) * np.log(1 - rate))
+    print(f"  log loss {loss:.4f} ({baseline:.4f} predicting the overall accuracy), "
+          f"{agreement * 100:.1f}% of answers predicted")
+
+    calibration = Calibration(table)
+    standard = config.LEVEL_SCHEDULES["Standard"]
+    predicted = ", ".join(f"{length}: {calibration.predicted_accuracy(length) * 100:.0f}%"
+                          for length in standard)
+    print(f"  Standard levels predict {predicted}")
+    suggested = calibration.schedule(args.targets)
+    if suggested:
+        print(f"  For {', '.join(f'{t * 100:.0f}%' for t in args.targets)} use lengths {suggested}")
+    else:
+        print("  Not enough answers at any length to suggest a schedule")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""
+Export per-question results as flat CSV or NDJSON rows.
+
+Rows come from the statistics event log, which holds every logged
+answer of every mode. `--source leaderboard` exports the detailed results
+of the live leaderboard entries instead; those answers are in the event
+log too, so the two sources are never combined. Both stores are streamed
+record by record, so memory use does not grow with history.
+
+With --watermark, only results after the previous export are written and
+the watermark file is advanced afterwards, so repeated runs produce
+incremental exports. The event log is resumed from a byte offset, the
+leaderboard from the id of the last exported entry.
+
+Usage:
+    python -m tools.export_results results.csv.gz
+    python -m tools.export_results new.ndjson --watermark export_watermark.json
+"""
+import argparse
+import csv
+import gzip
+import io
+import json
+import lzma
+import os
+import time
+from config import LEADERBOARD_LOG_FILE, EVENT_LOG_FILE, QUESTIONS_PER_LEVEL
+from data.event_log import read_events
+from data.file_lock import atomic_write_json
+from logic.sequence import find_changed_index
+
+FIELDS = ["source", "mode", "user", "timestamp", "run", "question", "level", "seq_a", "seq_b",
+          "changed_index", "correct_answer", "guess", "was_correct", "latency_ms"]
+OPENERS = {"gzip": gzip.open, "lzma": lzma.open, "none": open}
+
+
+def leaderboard_rows(after_id=None, after_timestamp=None, path=LEADERBOARD_LOG_FILE):
+    """
+    Rows for the detailed results of every live leaderboard entry, in log order.
+
+    The log is read twice: once for tombstones and to find where the last
+    export stopped, once for the entries. Compaction keeps the order of
+    the entries, so the id of the last exported entry still marks the
+    position afterwards. If that entry has since been deleted and compacted
+    away, entries are resumed by timestamp instead.
+
+    Args:
+        after_id: Only entries added after this one, or None for all
+        after_timestamp: Timestamp of that entry, used when it is gone
+
+    Yields:
+        (entry id, row)
+    """
+    if not os.path.exists(path):
+        return
+
+    def records():
+        with open(path, 'rb') as f:
+            for line in f:
+                if line.endswith(b"\n"):
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+
+    deleted, found = set(), False
+    for record in records():
+        if record.get('op') == 'delete':
+            deleted.add(record['id'])
+        elif record.get('op') == 'add' and record['entry']['id'] == after_id:
+            found = True
+
+    # Skip up to and including the last exported entry while it is still in the log
+    exporting = after_id is None or not found
+    for record in records():
+        if record.get('op') != 'add':
+            continue
+        entry = record['entry']
+        if not exporting:
+            exporting = entry['id'] == after_id
+            continue
+        if entry['id'] in deleted:
+            continue
+        if after_id is not None and not found and after_timestamp and entry['timestamp'] <= after_timestamp:
+            continue
+        for question, result in enumerate(entry.get('detailed_results', [])):
+            yield entry['id'], {
+                "source": "leaderboard",
+                "mode": "challenge",
+                "user": entry['username'],
+                "timestamp": entry['timestamp'],
+                "run": entry['id'],
+                "question": question + 1,
+                "level": question // QUESTIONS_PER_LEVEL + 1,
+                "seq_a": result.get('seq_a'),
+                "seq_b": result.get('seq_b'),
+                "changed_index": result.get('changed_index'),
+                "correct_answer": "different" if result.get('correct_answer') else "same",
+                "guess": "different" if result.get('user_guess') else "same",
+                "was_correct": result.get('was_correct'),
+                "latency_ms": result.get('response_time_ms'),
+            }
+
+
+def event_rows(start=0, path=EVENT_LOG_FILE):
+    """
+    Rows for every answer in the event log from a byte offset.
+
+    Yields:
+        (offset after the event, row)
+    """
+    for offset, event in read_events(start, path=path):
+        if event.get('type') != 'answer':
+            continue
+        level = event.get('level')
+        yield offset, {
+            "source": "events",
+            "mode": event.get('mode'),
+            "user": event.get('user'),
+            "timestamp": event['ts'],
+            "run": event.get('session'),
+            "question": event.get('question', 0) + 1,
+            "level": level + 1 if level is not None else None,
+            "seq_a": event['seq_a'],
+            "seq_b": event['seq_b'],
+            "changed_index": find_changed_index(event['seq_a'], event['seq_b']),
+            "correct_answer": "different" if event['correct_answer'] else "same",
+            "guess": "different" if event['user_guess'] else "same",
+            "was_correct": event['user_guess'] == event['correct_answer'],
+            "latency_ms": round(event['elapsed'] * 1000, 1),
+        }
+
+
+def load_watermark(path):
+    """Previous export position, or an empty watermark."""
+    if path and os.path.exists(path):
+        with open(path, 'r') as f:
+            return json.load(f)
+    return {"leaderboard_id": None, "leaderboard_timestamp": None, "event_offset": 0}
+
+
+def infer_compression(output):
+    if output.endswith(".gz"):
+        return "gzip"
+    if output.endswith(".xz"):
+        return "lzma"
+    return "none"
+
+
+def export(output, fmt, compression, sources, watermark):
+    """
+    Stream rows into `output`.
+
+    Returns:
+        (rows written, new watermark)
+    """
+    watermark = dict(watermark)
+    rows_written = 0
+    opener = OPENERS[compression]
+    with opener(output, 'wb') as raw:
+        out = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+        if fmt == "csv":
+            writer = csv.DictWriter(out, fieldnames=FIELDS)
+            writer.writeheader()
+            write = writer.writerow
+        else:
+            def write(row):
+                out.write(json.dumps(row, separators=(",", ":")) + "\n")
+
+        if "leaderboard" in sources:
+            rows = leaderboard_rows(watermark.get("leaderboard_id"), watermark.get("leaderboard_timestamp"))
+            for item, row in rows:
+                write(row)
+                rows_written += 1
+                watermark["leaderboard_id"] = item
+                watermark["leaderboard_timestamp"] = row["timestamp"]
+
+        if "events" in sources:
+            for offset, row in event_rows(watermark.get("event_offset", 0)):
+                write(row)
+                rows_written += 1
+                watermark["event_offset"] = offset
+        out.flush()
+        out.detach()
+    return rows_written, watermark
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export per-question results to CSV or NDJSON.")
+    parser.add_argument("output",
+                        help="output file; .gz or .xz selects compression")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default=None,
+                        help="row format (default: from the file name, else csv)")
+    parser.add_argument("--compress", choices=sorted(OPENERS), default=None,
+                        help="compression (default: from the file name)")
+    parser.add_argument("--source", choices=["events", "leaderboard"], default="events",
+                        help="which store to export (default: %(default)s)")
+    parser.add_argument("--watermark", default=None,
+                        help="watermark file for incremental exports")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("ndjson" if ".ndjson" in args.output or ".jsonl" in args.output else "csv")
+    compression = args.compress or infer_compression(args.output)
+    sources = (args.source,)
+
+    start = time.perf_counter()
+    rows, watermark = export(args.output, fmt, compression, sources, load_watermark(args.watermark))
+    if args.watermark:
+        # Only advanced once the output is complete
+        atomic_write_json(args.watermark, watermark)
+    elapsed = time.perf_counter() - start
+    print(f"Exported {rows} rows to {args.output} ({fmt}, {compression}) in {elapsed:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Merge leaderboards and statistics exported from many game installs.
+
+Inputs may be leaderboard.json exports, leaderboard.log files or
+statistics files (statistics.json or player partitions); directories are
+searched recursively. Player partitions of an install whose
+statistics.json is also given are left out, as the global file already
+counts their answers. Each file is parsed in a worker process and reduced
+to its own best --top-k entries, and the per-file lists are combined with
+a streaming k-way merge that skips entry ids already taken.
+
+Usage:
+    python -m tools.merge_leaderboards exports/ --top-k 50 \\
+        --board merged_leaderboard.json --stats merged_statistics.json
+"""
+import argparse
+import heapq
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from data.file_lock import atomic_write_json
+from data.leaderboard_store import entry_id
+from data.profile_store import PLAYERS_DIR
+from game_manager import GLOBAL_STATS_FILE, create_default_stats, merge_stats
+from logic.confusion import ConfusionMatrix
+
+# Leaderboard logs are .log; the .ndjson event log and score outbox are not boards
+EXTENSIONS = (".json", ".log")
+
+
+def rank_key(entry):
+    """Leaderboard order: accuracy descending, then faster time, then the earlier score."""
+    return (-entry['accuracy'], entry['avg_time'], entry.get('timestamp') or '', entry['id'])
+
+
+def expand_inputs(paths):
+    """Input files, with directories searched recursively, in a stable order."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for folder, _, names in os.walk(path):
+                files.extend(os.path.join(folder, name) for name in names if name.endswith(EXTENSIONS))
+        else:
+            files.append(path)
+    return sorted(files)
+
+
+def _log_entries(path):
+    """Live entries of a leaderboard log, streamed in two passes (tombstones first)."""
+    def records():
+        with open(path, 'rb') as f:
+            for line in f:
+                if line.endswith(b"\n"):
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+
+    deleted = {record['id'] for record in records() if record.get('op') == 'delete'}
+    for record in records():
+        if record.get('op') == 'add' and record['entry']['id'] not in deleted:
+            yield record['entry']
+
+
+def _with_ids(entries):
+    """Entries with an id, deriving one for exports made before ids existed."""
+    for entry in entries:
+        if isinstance(entry, dict):
+            entry_id(entry)
+            yield entry
+
+
+def parse_file(path, top_k):
+    """
+    Reduce one input file.
+
+    Returns:
+        ("board", best top_k entries sorted by rank_key),
+        ("stats", statistics data) or ("skip", reason)
+    """
+    try:
+        if path.endswith(".log"):
+            entries = _log_entries(path)
+        else:
+            with open(path, 'r') as f:
+                content = json.load(f)
+            if isinstance(content, dict) and "total_questions" in content:
+                return "stats", content
+            if not isinstance(content, list):
+                return "skip", "not a leaderboard or statistics file"
+            entries = content
+        # Ids are unique within one file; repeats across files are dropped when merging
+        return "board", heapq.nsmallest(top_k, _with_ids(entries), key=rank_key)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        return "skip", str(e)
+
+
+def merge_boards(boards, top_k):
+    """k-way merge of sorted per-file boards, keeping the first copy of each id."""
+    seen = set()
+
+    def unique():
+        for entry in heapq.merge(*boards, key=rank_key):
+            if entry['id'] not in seen:
+                seen.add(entry['id'])
+                yield entry
+
+    return list(islice(unique(), top_k))
+
+
+def install_global_stats(path):
+    """statistics.json of the install a player partition belongs to, or None if `path` is not one."""
+    folder = os.path.dirname(os.path.abspath(path))
+    players = os.path.normpath(PLAYERS_DIR)
+    root = folder[:-len(players)]
+    if folder[-len(players):] != players or not root.endswith(os.sep):
+        return None
+    return os.path.join(root, GLOBAL_STATS_FILE)
+
+
+def without_counted_partitions(stats):
+    """
+    Drop player partitions whose install's statistics.json is also merged.
+
+    Args:
+        stats: List of (path, statistics data)
+
+    Returns:
+        List of statistics data to sum
+    """
+    globals_given = {os.path.abspath(path) for path, _ in stats}
+    return [data for path, data in stats if install_global_stats(path) not in globals_given]
+
+
+def merge_statistics(partials):
+    """Sum statistics files from different installs into one aggregate."""
+    data, confusion = create_default_stats(), ConfusionMatrix()
+    for partial in partials:
+        other = create_default_stats()
+        other.update(partial)
+        merge_stats(data, confusion, other, ConfusionMatrix(partial.get("confusion")))
+    data["confusion"] = confusion.to_dict()
+    # Offsets refer to each install's own event log
+    data.pop("event_offset", None)
+    return data
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Merge leaderboards and statistics from many installs.")
+    parser.add_argument("inputs", nargs="+",
+                        help="exported files or directories containing them")
+    parser.add_argument("--top-k", type=int, default=50,
+                        help="entries in the merged board (default: %(default)s)")
+    parser.add_argument("--board", default="merged_leaderboard.json",
+                        help="merged leaderboard output (default: %(default)s)")
+    parser.add_argument("--stats", default="merged_statistics.json",
+                        help="merged statistics output (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    files = expand_inputs(args.inputs)
+    workers = args.workers or os.cpu_count() or 1
+
+    boards, stats, skipped = [], [], []
+    if workers > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(parse_file, files, [args.top_k] * len(files),
+                                    chunksize=max(1, len(files) // (workers * 4))))
+    else:
+        results = [parse_file(path, args.top_k) for path in files]
+
+    for path, (kind, result) in zip(files, results):
+        if kind == "board":
+            boards.append(result)
+        elif kind == "stats":
+            stats.append((path, result))
+        else:
+            skipped.append((path, result))
+
+    board = merge_boards(boards, args.top_k)
+    atomic_write_json(args.board, board)
+    stats = without_counted_partitions(stats)
+    if stats:
+        atomic_write_json(args.stats, merge_statistics(stats))
+
+    elapsed = time.perf_counter() - start
+    print(f"Merged {len(boards)} leaderboards into {len(board)} entries ({args.board}) "
+          f"and {len(stats)} statistics files"
+          f"{f' ({args.stats})' if stats else ''} in {elapsed:.1f} s")
+    for path, reason in skipped:
+        print(f"  skipped {path}: {reason}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+Rebuild statistics.json and every player partition from the event log.
+
+Usage:
+    python -m tools.rebuild_statistics --workers 8
+"""
+import argparse
+import time
+from data.event_log import log_size
+from game_manager import rebuild_all_statistics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild statistics from the event log.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    partitions = rebuild_all_statistics(args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"Rebuilt {partitions} partitions from {log_size() / 1e6:.1f} MB "
+          f"of events in {elapsed:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
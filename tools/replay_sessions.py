@@ -0,0 +1,159 @@
+"""
+Replay recorded sessions headlessly through the game's scoring logic.
+
+Each recording is re-run the way the game handles it: the first input
+after a question answers it, later inputs are ignored until the next
+question, elapsed time runs from the recorded onset, and levels are
+bucketed from the question number. The recomputed score and levels are
+checked against what the player saw, and any difference is reported.
+
+With --stats the replayed answers are aggregated into a statistics file,
+e.g. to recompute statistics after a fix to the logic.
+
+Usage:
+    python -m tools.replay_sessions
+    python -m tools.replay_sessions recordings/ --since 2024-05-01 --stats replayed_statistics.json
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from config import RECORDINGS_DIR
+from data.event_log import answer_event, session_event
+from data.file_lock import atomic_write_json
+from data.session_recorder import read_sessions
+from game_manager import create_default_stats, apply_event
+from logic.confusion import ConfusionMatrix
+from logic.scoring import score_results
+
+# The summary shows one decimal of accuracy and whole milliseconds
+ACCURACY_TOLERANCE = 0.05
+TIME_TOLERANCE_MS = 0.5
+
+
+def recording_files(paths, since=None, until=None):
+    """Recording files in day order, limited to a range of ISO dates."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in os.listdir(path) if name.endswith(".efr"))
+        elif os.path.exists(path):
+            files.append(path)
+    def in_range(path):
+        day = os.path.basename(path)[:10]
+        return (not since or day >= since) and (not until or day <= until)
+
+    return sorted(path for path in files if in_range(path))
+
+
+def replay(session):
+    """
+    Re-run one recorded session.
+
+    Returns:
+        (results, levels, problems): results as (seq_a, seq_b, correct_answer,
+        user_guess, elapsed) tuples, the level of each, and a list of
+        differences from the recording
+    """
+    results, levels, problems = [], [], []
+    per_level = session['questions_per_level']
+    lengths = session['levels']
+    pending = None
+    shown = 0
+
+    for record in session['records']:
+        kind = record[0]
+        if kind == "question":
+            _, t, _, level, seq_a, seq_b, changed_index = record
+            if lengths:
+                # Levels are re-derived from the question number, not trusted
+                expected = min(shown // per_level, len(lengths) - 1) if per_level else 0
+                if level != expected:
+                    problems.append(f"question {shown + 1}: recorded level {level}, expected {expected}")
+                elif len(seq_a) != lengths[level]:
+                    problems.append(f"question {shown + 1}: length {len(seq_a)}, level {level} is {lengths[level]}")
+                level = expected
+            if (changed_index is None) != (seq_a == seq_b):
+                problems.append(f"question {shown + 1}: changed index {changed_index} does not match the pair")
+            pending = (t, level, seq_a, seq_b, changed_index is not None)
+            shown += 1
+        elif kind == "input":
+            if pending is None:
+                # A second press before the next question; the game ignores it
+                continue
+            t_shown, level, seq_a, seq_b, correct_answer = pending
+            results.append((seq_a, seq_b, correct_answer, record[2], record[1] - t_shown))
+            levels.append(level)
+            pending = None
+        elif kind == "end":
+            accuracy, avg_time = score_results(results)
+            if abs(accuracy - record[2]) > ACCURACY_TOLERANCE:
+                problems.append(f"accuracy {accuracy:.2f}% replayed, {record[2]:.2f}% shown")
+            if abs(avg_time - record[3]) > TIME_TOLERANCE_MS:
+                problems.append(f"average time {avg_time:.1f} ms replayed, {record[3]:.1f} ms shown")
+    return results, levels, problems
+
+
+def add_to_statistics(data, confusion, session, results, levels):
+    """Aggregate a replayed session the way its logged events would be."""
+    mode, user, session_id = session['mode'], session['username'], session['session']
+    timestamp = datetime.fromtimestamp(session['started_at']).isoformat()
+    events = [answer_event(mode, session_id, user, idx, level, *result)
+              for idx, (result, level) in enumerate(zip(results, levels))]
+    # The game closes a session when it is finished, or for practice and drill when anything was answered
+    finished = any(record[0] == "end" for record in session['records'])
+    if finished or (mode in ("practice", "drill") and results):
+        events.append(session_event(mode, session_id, user, len(results)))
+    for event in events:
+        event['ts'] = timestamp
+        apply_event(data, confusion, event)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded sessions and verify their scores.")
+    parser.add_argument("inputs", nargs="*", default=[RECORDINGS_DIR],
+                        help="recording files or directories (default: %(default)s)")
+    parser.add_argument("--since", default=None,
+                        help="first day to replay, YYYY-MM-DD")
+    parser.add_argument("--until", default=None,
+                        help="last day to replay, YYYY-MM-DD")
+    parser.add_argument("--stats", default=None,
+                        help="write statistics recomputed from the replay to this file")
+    parser.add_argument("--show", type=int, default=20,
+                        help="sessions with differences to list (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    files = recording_files(args.inputs, args.since, args.until)
+    data, confusion = create_default_stats(), ConfusionMatrix()
+    sessions = questions = 0
+    mismatched = []
+
+    for path in files:
+        for session in read_sessions(path):
+            results, levels, problems = replay(session)
+            sessions += 1
+            questions += len(results)
+            if problems:
+                mismatched.append((path, session, problems))
+            if args.stats:
+                add_to_statistics(data, confusion, session, results, levels)
+
+    if args.stats:
+        data["confusion"] = confusion.to_dict()
+        # Not tied to any event log
+        data.pop("event_offset", None)
+        atomic_write_json(args.stats, data)
+
+    elapsed = time.perf_counter() - start
+    print(f"Replayed {sessions} sessions ({questions} answers) from {len(files)} files "
+          f"in {elapsed:.2f} s; {len(mismatched)} differ from the recording")
+    for path, session, problems in mismatched[:args.show]:
+        print(f"  {os.path.basename(path)} {session['mode']} {session['session']} "
+              f"({session['username'] or 'anonymous'}): {'; '.join(problems)}")
+    return 1 if mismatched else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""
+Shared score server for a fleet of game installs.
+
+Usage:
+    python -m tools.score_server --host 0.0.0.0 --port 8765
+
+Set SCORE_SERVER_URL in config.py on every install to submit to it.
+
+Protocol: HTTP/1.1 with keep-alive and JSON bodies.
+    POST /scores                       {"scores": [entry, ...]}
+        -> {"accepted": n, "duplicates": n, "rejected": n, "total": m}
+    GET  /leaderboard?limit=N          -> {"total": m, "entries": [...]}
+    GET  /rank?accuracy=A&avg_time=T   -> {"rank": r, "total": m, "beaten": pct}
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+from array import array
+from bisect import insort
+from urllib.parse import urlsplit, parse_qs
+from config import SCORE_SERVER_TOP_K, SCORE_SNAPSHOT_FILE, SCORE_SNAPSHOT_SECONDS
+from data.file_lock import atomic_write_json
+from data.leaderboard_store import SUMMARY_FIELDS
+from logic.rank_index import RankIndex, score_key
+
+MAX_BODY = 4 * 1024 * 1024
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large"}
+
+
+class ScoreBoard:
+    def __init__(self, top_k=SCORE_SERVER_TOP_K):
+        """
+        In-memory fleet board.
+
+        Only the best `top_k` entries are kept in full, sorted by score key.
+        Every accepted score is counted in a RankIndex, and submitted ids
+        are remembered so client retries are not counted twice.
+
+        Args:
+            top_k: Number of entries served by /leaderboard
+        """
+        self.top_k = top_k
+        self.top = []
+        self.seen = set()
+        self.ranks = RankIndex()
+        self.dirty = False
+
+    def add(self, entry):
+        """
+        Add one submitted score.
+
+        Returns:
+            "accepted", "duplicate" or "rejected"
+        """
+        try:
+            entry_id = str(entry['id'])
+            accuracy = float(entry['accuracy'])
+            avg_time = float(entry['avg_time'])
+        except (KeyError, TypeError, ValueError):
+            return "rejected"
+        # float() takes "nan", "inf" and 1e400, which cannot be ranked
+        if not (math.isfinite(accuracy) and math.isfinite(avg_time)):
+            return "rejected"
+        if entry_id in self.seen:
+            return "duplicate"
+
+        self.ranks.add(accuracy, avg_time)
+        self.seen.add(entry_id)
+        self.dirty = True
+
+        summary = {field: entry.get(field) for field in SUMMARY_FIELDS}
+        item = (score_key(accuracy, avg_time), str(summary['timestamp'] or ''), entry_id, summary)
+        if len(self.top) < self.top_k or item < self.top[-1]:
+            insort(self.top, item)
+            del self.top[self.top_k:]
+        return "accepted"
+
+    def leaderboard(self, limit):
+        """Best `limit` entries (at most top_k)."""
+        return [item[3] for item in self.top[:limit]]
+
+    def snapshot(self):
+        """JSON-serializable state for a snapshot file."""
+        return {
+            'top_k': self.top_k,
+            'top': [item[3] for item in self.top],
+            'keys': self.ranks.keys.tolist(),
+            'seen': sorted(self.seen),
+        }
+
+    def restore(self, snapshot):
+        """Load state written by snapshot()."""
+        self.seen = set(snapshot.get('seen', []))
+        self.ranks = RankIndex()
+        self.ranks.keys = array("q", snapshot.get('keys', []))
+        self.top = []
+        for summary in snapshot.get('top', []):
+            item = (score_key(summary['accuracy'], summary['avg_time']),
+                    str(summary.get('timestamp') or ''), summary['id'], summary)
+            insort(self.top, item)
+        del self.top[self.top_k:]
+
+
+class ScoreServer:
+    def __init__(self, board, snapshot_path=SCORE_SNAPSHOT_FILE, interval=SCORE_SNAPSHOT_SECONDS):
+        """
+        asyncio HTTP front end for a ScoreBoard with periodic snapshots.
+
+        Args:
+            board: ScoreBoard to serve
+            snapshot_path: File the board is saved to, None to disable
+            interval: Seconds between snapshots of a changed board
+        """
+        self.board = board
+        self.snapshot_path = snapshot_path
+        self.interval = interval
+
+    def route(self, method, target, body):
+        """Handle one request. Returns (status, JSON payload)."""
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+
+        if method == "POST" and url.path == "/scores":
+            try:
+                scores = json.loads(body)['scores']
+            except (ValueError, KeyError, TypeError):
+                return 400, {'error': 'expected {"scores": [...]}'}
+            counts = {'accepted': 0, 'duplicate': 0, 'rejected': 0}
+            for entry in scores if isinstance(scores, list) else []:
+                counts[self.board.add(entry) if isinstance(entry, dict) else 'rejected'] += 1
+            return 200, {'accepted': counts['accepted'], 'duplicates': counts['duplicate'],
+                         'rejected': counts['rejected'], 'total': len(self.board.ranks)}
+
+        if method == "GET" and url.path == "/leaderboard":
+            try:
+                limit = int(query.get('limit', [self.board.top_k])[0])
+            except ValueError:
+                return 400, {'error': 'limit must be an integer'}
+            return 200, {'total': len(self.board.ranks), 'entries': self.board.leaderboard(limit)}
+
+        if method == "GET" and url.path == "/rank":
+            try:
+                accuracy = float(query['accuracy'][0])
+                avg_time = float(query['avg_time'][0])
+            except (KeyError, ValueError):
+                return 400, {'error': 'accuracy and avg_time are required'}
+            if not (math.isfinite(accuracy) and math.isfinite(avg_time)):
+                return 400, {'error': 'accuracy and avg_time must be finite'}
+            # Rank the score as if it were on the board
+            ranks = self.board.ranks
+            ranks.add(accuracy, avg_time)
+            rank, total, beaten = ranks.rank(accuracy, avg_time)
+            ranks.remove(accuracy, avg_time)
+            return 200, {'rank': rank, 'total': total - 1, 'beaten': beaten}
+
+        return 404, {'error': 'not found'}
+
+    async def handle(self, reader, writer):
+        """Serve requests on one keep-alive connection."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                parts = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode('latin-1').partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length') or 0)
+                if len(parts) != 3:
+                    status, payload = 400, {'error': 'bad request line'}
+                elif length > MAX_BODY:
+                    status, payload = 413, {'error': 'body too large'}
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = self.route(parts[0], parts[1], body)
+
+                data = json.dumps(payload, separators=(",", ":")).encode('utf-8')
+                close = status in (400, 413) or headers.get('connection', '').lower() == 'close'
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n".encode('latin-1') + data
+                )
+                await writer.drain()
+                if close:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def load_snapshot(self):
+        """Restore the board from the snapshot file, if there is one."""
+        if self.snapshot_path and os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r') as f:
+                self.board.restore(json.load(f))
+
+    async def save_snapshot(self):
+        """Write the board if it changed; the file is written off the event loop."""
+        if not self.snapshot_path or not self.board.dirty:
+            return
+        snapshot = self.board.snapshot()
+        self.board.dirty = False
+        await asyncio.to_thread(atomic_write_json, self.snapshot_path, snapshot, None)
+
+    async def snapshot_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.save_snapshot()
+
+    async def serve(self, host, port, ready=None):
+        """
+        Run until cancelled, saving a final snapshot on the way out.
+
+        Args:
+            host: Address to listen on
+            port: Port to listen on, 0 for any free port
+            ready: Optional callback receiving the bound port
+        """
+        self.load_snapshot()
+        server = await asyncio.start_server(self.handle, host, port)
+        bound_port = server.sockets[0].getsockname()[1]
+        if ready:
+            ready(bound_port)
+        snapshots = asyncio.create_task(self.snapshot_loop())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            snapshots.cancel()
+            await self.save_snapshot()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Collect scores from many game installs.")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="address to listen on (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=8765,
+                        help="port to listen on (default: %(default)s)")
+    parser.add_argument("--top-k", type=int, default=SCORE_SERVER_TOP_K,
+                        help="entries kept for /leaderboard (default: %(default)s)")
+    parser.add_argument("--snapshot", default=SCORE_SNAPSHOT_FILE,
+                        help="snapshot file (default: %(default)s)")
+    parser.add_argument("--interval", type=float, default=SCORE_SNAPSHOT_SECONDS,
+                        help="seconds between snapshots (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    server = ScoreServer(ScoreBoard(args.top_k), args.snapshot, args.interval)
+    try:
+        asyncio.run(server.serve(args.host, args.port,
+                                 lambda port: print(f"Listening on http://{args.host}:{port}")))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Generate large, realistic datasets by simulating players headlessly.
+
+Each simulated player has an accuracy, a log-normal response time
+distribution and a confusion profile (substitutions they miss more often
+than their accuracy alone suggests). Their runs use the game's own
+sequence generation and scoring and are written through the normal
+stores: answers to the event log, scores to the leaderboard. Statistics
+checkpoints are rebuilt from the log at the end.
+
+Players are split across worker processes. Every player has their own
+seed, so a given --seed produces the same runs whatever --workers is
+(up to the order of records in the files).
+
+Usage:
+    python -m tools.simulate_players --output simulated --players 2000 --runs 40
+    python -m tools.simulate_players --profiles my_profiles.json --runs 10
+"""
+import argparse
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+import config
+from config import SIMILAR_MAP
+from data.event_log import answer_event, session_event, append_events
+from data.leaderboard_store import add_to_leaderboard
+from game_manager import rebuild_all_statistics
+from logic.scoring import score_results, detailed_results
+from logic.question_bank import make_question
+
+# Runs buffered per worker before their events are appended in one write
+FLUSH_RUNS = 50
+SUBSTITUTIONS = [f"{a}>{b}" for a, options in SIMILAR_MAP.items() for b in options]
+
+
+def make_profiles(players, seed, accuracy, latency_ms, latency_sigma, confusion):
+    """
+    Random player profiles spread around the given means.
+
+    Returns:
+        List of profile dicts: username, accuracy, latency_ms, latency_sigma
+        and confusion ({"a>b": miss multiplier})
+    """
+    rng = random.Random(f"profiles-{seed}")
+    profiles = []
+    for i in range(players):
+        hard = rng.sample(SUBSTITUTIONS, k=min(6, len(SUBSTITUTIONS)))
+        profiles.append({
+            'username': f"sim-{i:05d}",
+            'accuracy': min(max(rng.gauss(accuracy, 0.08), 0.5), 0.995),
+            'latency_ms': latency_ms * rng.lognormvariate(0, 0.3),
+            'latency_sigma': latency_sigma,
+            'confusion': {pair: 1 + confusion * rng.uniform(0.5, 2) for pair in hard},
+        })
+    return profiles
+
+
+def simulate_run(profile, rng, levels, questions_per_level=config.QUESTIONS_PER_LEVEL, probability=0.5):
+    """
+    Play one challenge as a simulated player.
+
+    Questions come from make_question like in ChallengeMode, drawn with `rng`.
+
+    Returns:
+        (results, level index of each result)
+    """
+    results, result_levels = [], []
+    accuracy = profile['accuracy']
+    for level, length in enumerate(levels):
+        for _ in range(questions_per_level):
+            sequence, mutated, index = make_question(length, "Alphanumeric", probability,
+                                                     rng.randrange(1 << 30), rng)
+            different = index is not None
+            if different:
+                # Confusable substitutions and later positions are missed more often
+                multiplier = profile['confusion'].get(f"{sequence[index]}>{mutated[index]}", 1.0)
+                miss = (1 - accuracy) * multiplier * (1 + 0.5 * index / length)
+                guess = rng.random() >= min(miss, 0.95)
+            else:
+                guess = rng.random() < (1 - accuracy) * 0.5
+            # Longer sequences take longer to scan
+            median = profile['latency_ms'] * math.sqrt(length / 10)
+            elapsed = median * rng.lognormvariate(0, profile['latency_sigma']) / 1000
+            results.append(("".join(sequence), "".join(mutated), different, guess, elapsed))
+            result_levels.append(level)
+    return results, result_levels
+
+
+def simulate_players(profiles, first_index, runs, seed, days, schedule):
+    """
+    Worker: simulate every run of a slice of players and write them to the stores.
+
+    Returns:
+        (runs written, questions written)
+    """
+    levels = config.LEVEL_SCHEDULES[schedule]
+    # Same mode names and ranking rule as ChallengeMode
+    ranked = schedule == "Standard"
+    mode = "challenge" if ranked else schedule.lower()
+    now = datetime.now()
+    events, total_runs, total_questions = [], 0, 0
+
+    for offset, profile in enumerate(profiles):
+        rng = random.Random(f"{seed}-{first_index + offset}")
+        for run in range(runs):
+            results, result_levels = simulate_run(profile, rng, levels)
+            session = f"sim{seed}-{first_index + offset}-{run}"
+            clock = now - timedelta(seconds=rng.uniform(0, days * 86400))
+            for idx, (result, level) in enumerate(zip(results, result_levels)):
+                clock += timedelta(seconds=result[4] + 1.5)
+                event = answer_event(mode, session, profile['username'], idx, level, *result)
+                event['ts'] = clock.isoformat()
+                events.append(event)
+            event = session_event(mode, session, profile['username'], len(results))
+            event['ts'] = clock.isoformat()
+            events.append(event)
+
+            if ranked:
+                accuracy, avg_time = score_results(results)
+                add_to_leaderboard(profile['username'], round(accuracy, 1), round(avg_time),
+                                   detailed_results(results))
+
+            total_runs += 1
+            total_questions += len(results)
+            if total_runs % FLUSH_RUNS == 0:
+                append_events(events)
+                events = []
+    if events:
+        append_events(events)
+    return total_runs, total_questions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate players to generate large datasets.")
+    parser.add_argument("--output", default="simulated",
+                        help="directory to write the stores into (default: %(default)s)")
+    parser.add_argument("--players", type=int, default=100,
+                        help="number of simulated players (default: %(default)s)")
+    parser.add_argument("--runs", type=int, default=10,
+                        help="challenge runs per player (default: %(default)s)")
+    parser.add_argument("--profiles", default=None,
+                        help="JSON list of player profiles to use instead of random ones")
+    parser.add_argument("--accuracy", type=float, default=0.85,
+                        help="mean player accuracy, 0-1 (default: %(default)s)")
+    parser.add_argument("--latency-ms", type=float, default=900,
+                        help="median response time at length 10 (default: %(default)s)")
+    parser.add_argument("--latency-sigma", type=float, default=0.35,
+                        help="log-normal sigma of response times (default: %(default)s)")
+    parser.add_argument("--confusion", type=float, default=2.0,
+                        help="how much harder each player's confusable pairs are (default: %(default)s)")
+    parser.add_argument("--days", type=float, default=60,
+                        help="spread answer timestamps over this many past days (default: %(default)s)")
+    parser.add_argument("--schedule", default="Standard", choices=sorted(config.LEVEL_SCHEDULES),
+                        help="level schedule to play (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="base seed (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    if args.profiles:
+        with open(args.profiles, 'r') as f:
+            profiles = json.load(f)
+    else:
+        profiles = make_profiles(args.players, args.seed, args.accuracy,
+                                 args.latency_ms, args.latency_sigma, args.confusion)
+
+    # The stores use paths relative to the working directory
+    os.makedirs(args.output, exist_ok=True)
+    os.chdir(args.output)
+
+    start = time.perf_counter()
+    workers = max(1, min(args.workers or os.cpu_count() or 1, len(profiles)))
+    size = math.ceil(len(profiles) / workers) if profiles else 1
+    slices = [(profiles[i:i + size], i) for i in range(0, len(profiles), size)]
+    jobs = [(chunk, first, args.runs, args.seed, args.days, args.schedule) for chunk, first in slices]
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            totals = list(pool.map(simulate_players, *zip(*jobs)))
+    else:
+        totals = [simulate_players(*job) for job in jobs]
+    runs = sum(t[0] for t in totals)
+    questions = sum(t[1] for t in totals)
+    simulated = time.perf_counter() - start
+
+    partitions = rebuild_all_statistics(args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"Simulated {len(profiles)} players, {runs} runs, {questions} questions "
+          f"in {simulated:.1f} s; rebuilt {partitions} statistics partitions "
+          f"({elapsed:.1f} s total) in {os.getcwd()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,79 @@
-import tkinter as tk
 from tkinter import ttk, messagebox
+import random
 import time
-from logic.sequence import get_alphabet, generate_sequence, maybe_mutate_sequence
-from data.leaderboard_store import add_to_leaderboard
+import config
+from logic.question_bank import make_question
+from logic.calibration import level_schedule
+from logic.scoring import score_results, detailed_results
+from logic.latency import run_anomalies
+from data.leaderboard_store import add_to_leaderboard, leaderboard_rank
+from data.event_log import answer_event, session_event, append_event, new_session_id
+from data.session_recorder import SessionRecorder
 from game_manager import StatisticsManager
+from metrics import GAMES_STARTED, GAMES_COMPLETED, ANSWERS, RESPONSE_SECONDS, FLAGGED_RUNS
+from ui.sequence_display import SequenceDisplay
 
 
 
 class ChallengeMode:
-    def __init__(self, root, username, back_callback):
+    title = "Challenge Mode"
+    header = "🏆 Challenge Mode"
+    mode = "challenge"
+
+    def __init__(self, root, username, back_callback, schedule="Standard"):
         self.root = root
         self.username = username
         self.back_callback = back_callback
+        self.schedule = schedule
+        # Only the standard schedule is ranked; other schedules are stress tests
+        self.ranked = schedule == "Standard"
+        if not self.ranked:
+            self.title = f"{schedule} Challenge"
+            self.header = f"🔥 {schedule} Challenge"
+            self.mode = schedule.lower()
         self.stats_manager = StatisticsManager()  # Add this line
         self.setup_gui()
         self.reset_game()
 
     def reset_game(self):
         """Reset all game variables to initial state."""
-        self.levels = [10, 15, 20]
+        self.probability = 0.5
+        self.levels = self.level_lengths()
         self.level_index = 0
-        self.questions_per_level = 5
+        self.questions_per_level = config.QUESTIONS_PER_LEVEL
         self.current_question = 0
         self.sequence_a = []
         self.sequence_b = []
         self.changed_index = None
         self.correct_answer = False
         self.results = []
-        self.probability = 0.5
+        self.render_times = []
         self.start_time = 0
         self.total_correct = 0
         self.total_time = 0
         self.correct1 = 0
         self.correct2 = 0
         self.correct3 = 0
-
+        self.question_index = random.randrange(1 << 30)
+        self.session_id = new_session_id()
+        # Metric children resolved once so each answer is a bare increment
+        self.answer_counters = {True: ANSWERS.labels(self.mode, "correct"),
+                                False: ANSWERS.labels(self.mode, "wrong")}
+        self.response_histogram = RESPONSE_SECONDS.labels(self.mode)
+        GAMES_STARTED.labels(self.mode).inc()
+        self.recorder = SessionRecorder(self.mode, self.username, self.session_id, self.levels,
+                                        self.questions_per_level, self.probability)
+        # The player's usual pace, taken before this run's answers are logged.
+        # Only read: the partition is saved by the global catch-up after the run.
+        self.baseline_latency = None
+        if self.ranked:
+            player_stats = StatisticsManager(self.username, read_only=True)
+            self.baseline_latency = player_stats.data.get("challenge_latency")
+
+
+    def level_lengths(self):
+        """Sequence length of each level, calibrated when configured."""
+        return level_schedule(self.schedule, "Alphanumeric", self.probability)
 
     def setup_gui(self):
         """Set up the GUI for challenge mode."""
@@ -42,8 +81,11 @@ class ChallengeMode:
         for widget in self.root.winfo_children():
             widget.destroy()
 
-        self.root.title("Challenge Mode - Sequence Challenge")
-        self.root.geometry("700x650")
+        self.root.title(f"{self.title} - Sequence Challenge")
+        # Long schedules get a smaller font and a bigger window
+        long_sequences = max(config.LEVEL_SCHEDULES[self.schedule]) > config.SEQUENCE_WRAP_WIDTH
+        sequence_font = ("Courier", 10 if long_sequences else 18)
+        self.root.geometry("1000x900" if long_sequences else "700x650")
 
         main = ttk.Frame(self.root, padding=20)
         main.pack(fill="both", expand=True)
@@ -53,11 +95,11 @@ class ChallengeMode:
         header_frame.grid(row=0, column=0, columnspan=4, sticky="ew", pady=(0, 20))
 
         ttk.Button(
-            header_frame, text="← Back to Menu", command=self.back_callback
+            header_frame, text="← Back to Menu", command=self.back
         ).pack(side="left")
 
         ttk.Label(
-            header_frame, text="🏆 Challenge Mode", font=("Arial", 18, "bold")
+            header_frame, text=self.header, font=("Arial", 18, "bold")
         ).pack(side="right")
 
         # Progress Frame
@@ -89,30 +131,15 @@ class ChallengeMode:
             seq_frame, text="Original Sequence:", font=("Arial", 12, "bold")
         ).pack(anchor="w")
 
-        self.original_label = ttk.Label(
-            seq_frame,
-            font=("Courier", 18),
-            relief="solid",
-            padding=10,
-            background="white",
-        )
-        self.original_label.pack(fill="x", pady=(5, 20))
+        self.original_text = SequenceDisplay(seq_frame, font=sequence_font)
+        self.original_text.pack(fill="x", pady=(5, 20))
 
         ttk.Label(seq_frame, text="Second Sequence:", font=("Arial", 12, "bold")).pack(
             anchor="w"
         )
-        self.seq_text = tk.Text(
-            seq_frame,
-            height=1,
-            font=("Courier", 18),
-            borderwidth=2,
-            relief="solid",
-            background="white",
-            padx=10,  # Add this
-            pady=10,  # Add this
-        )
+        self.seq_text = SequenceDisplay(seq_frame, font=sequence_font)
         self.seq_text.pack(fill="x", pady=(5, 0))
-        self.seq_text.tag_config("changed", background="yellow", foreground="red")
+
         # Guess Buttons
         guess_frame = ttk.Frame(main)
         guess_frame.grid(row=3, column=0, columnspan=4, pady=20)
@@ -159,17 +186,22 @@ class ChallengeMode:
         self.result_label.grid(row=6, column=0, columnspan=4, pady=10)
 
         # Bind keyboard shortcuts
-        self.root.bind("<a>", lambda e: self.make_guess(False))
-        self.root.bind("<A>", lambda e: self.make_guess(False))
-        self.root.bind("<d>", lambda e: self.make_guess(True))
-        self.root.bind("<D>", lambda e: self.make_guess(True))
+        self.root.bind("<a>", lambda e: self.make_guess(False, e.keysym))
+        self.root.bind("<A>", lambda e: self.make_guess(False, e.keysym))
+        self.root.bind("<d>", lambda e: self.make_guess(True, e.keysym))
+        self.root.bind("<D>", lambda e: self.make_guess(True, e.keysym))
 
         # Start the challenge
         self.root.after(100, self.start_next_question)
 
-    def start_timer(self):
-        """Start the timer for the current question."""
-        self.start_time = time.perf_counter()
+    def start_timer(self, onset=None):
+        """
+        Start the timer for the current question.
+
+        Args:
+            onset: perf_counter time the question became visible (defaults to now)
+        """
+        self.start_time = onset or time.perf_counter()
         self.update_challenge_timer()
 
     def update_challenge_timer(self):
@@ -179,25 +211,6 @@ class ChallengeMode:
             self.timer_label.config(text=f"Time: {elapsed * 1000:.0f} ms")
             self.root.after(50, self.update_challenge_timer)
 
-    def draw_second_sequence(self, sequence, highlight_index):
-        """
-        Display the second sequence with optional highlighting.
-
-        Args:
-            sequence: The sequence to display
-            highlight_index: Index to highlight, or None for no highlighting
-        """
-        self.seq_text.config(state="normal")
-        self.seq_text.delete("1.0", tk.END)
-
-        for i, char in enumerate(sequence):
-            if i == highlight_index:
-                self.seq_text.insert(tk.END, char, "changed")
-            else:
-                self.seq_text.insert(tk.END, char)
-
-        self.seq_text.config(state="disabled")
-
     def start_next_question(self):
         """Generate and display the next question."""
         if self.current_question >= self.questions_per_level:
@@ -209,21 +222,14 @@ class ChallengeMode:
                 self.current_question = 0
 
         length = self.levels[self.level_index]
-        alphabet = get_alphabet("Alphanumeric")
-        seq1 = generate_sequence(length, alphabet)
-        seq2, self.changed_index = maybe_mutate_sequence(
-            seq1, self.probability, alphabet
-        )
+        seq1, seq2, self.changed_index = self.create_question(length)
 
         self.sequence_a = seq1
         self.sequence_b = seq2
         self.correct_answer = self.changed_index is not None
 
-        self.original_label.config(text="".join(seq1))
-        self.draw_second_sequence(seq2, None)
-
         self.progress_label.config(
-            text=f"Level {self.level_index + 1}/3 (Length: {length}) - Question {self.current_question + 1}/{self.questions_per_level}"
+            text=f"Level {self.level_index + 1}/{len(self.levels)} (Length: {length}) - Question {self.current_question + 1}/{self.questions_per_level}"
         )
 
         # Calculate stats
@@ -240,20 +246,46 @@ class ChallengeMode:
         self.yes_btn.config(state="normal")
         self.no_btn.config(state="normal")
 
-        self.start_timer()
+        # Draw the sequences last; the clock starts once they are on screen
+        self.original_text.show(seq1)
+        self.seq_text.show(seq2)
+        self.render_times.append(self.original_text.last_render_ms + self.seq_text.last_render_ms)
+        self.start_timer(self.seq_text.rendered_at)
+        self.recorder.question(seq1, seq2, self.changed_index, self.level_index,
+                               self.start_time, self.render_times[-1])
 
-    def make_guess(self, user_guess):
+    def create_question(self, length):
+        """
+        Create the next question pair.
+
+        Args:
+            length: Sequence length for the current level
+
+        Returns:
+            (seq_a, seq_b, changed_index)
+        """
+        question = make_question(
+            length, "Alphanumeric", self.probability, self.question_index
+        )
+        self.question_index += 1
+        return question
+
+    def make_guess(self, user_guess, key=None):
         """
         Process the user's guess.
 
         Args:
             user_guess: True for "different", False for "same"
+            key: Key pressed, or None for a button click
         """
+        now = time.perf_counter()
+        self.recorder.input(user_guess, now, key)
+
         # Prevent double-clicking during timeout
         if self.start_time == 0:
             return
 
-        elapsed = time.perf_counter() - self.start_time
+        elapsed = now - self.start_time
         self.start_time = 0  # Stop timer updates
 
         self.results.append(
@@ -265,6 +297,12 @@ class ChallengeMode:
                 elapsed,
             )
         )
+        append_event(answer_event(
+            self.mode, self.session_id, self.username, len(self.results) - 1,
+            self.level_index, *self.results[-1]
+        ))
+        self.answer_counters[user_guess == self.correct_answer].inc()
+        self.response_histogram.observe(elapsed)
 
         if user_guess == self.correct_answer:
             self.result_label.config(
@@ -286,7 +324,7 @@ class ChallengeMode:
                 foreground="red",
             )
             if self.changed_index is not None:
-                self.draw_second_sequence(self.sequence_b, self.changed_index)
+                self.seq_text.show(self.sequence_b, self.changed_index)
 
         self.total_time += elapsed
 
@@ -304,51 +342,73 @@ class ChallengeMode:
         self.current_question += 1
         self.root.after(1500, self.start_next_question)
 
+    def build_detailed_results(self):
+        """Convert the raw results into the per-question records stored with a score."""
+        return detailed_results(self.results, self.render_times)
+
+    def save_results(self, accuracy, avg_time, detailed_results):
+        """
+        Persist the finished challenge.
+
+        Args:
+            accuracy: Accuracy percentage
+            avg_time: Average time in milliseconds
+            detailed_results: Per-question records from build_detailed_results
+
+        Returns:
+            Text shown in the summary about where the score went
+        """
+        entry_id = add_to_leaderboard(self.username, round(accuracy, 1), round(avg_time), detailed_results)
+        ranking = leaderboard_rank(entry_id)
+        if ranking is None:
+            return "Your score has been saved to the leaderboard!"
+        rank, total, beaten = ranking
+        return (f"Your score has been saved to the leaderboard!\n"
+                f"Rank {rank} of {total} — you beat {beaten:.0f}% of all runs.")
+
     def show_summary(self):
         """Display the challenge summary and save results."""
         total_questions = len(self.results)
-        accuracy = (self.total_correct / total_questions * 100) if total_questions > 0 else 0
-        avg_time = (self.total_time / total_questions * 1000) if total_questions > 0 else 0
+        accuracy, avg_time = score_results(self.results)
         
-        detailed_results = []
-        for seq_a, seq_b, correct_answer, user_guess, elapsed in self.results:
-            # Find the changed character if sequences are different
-            changed_index = None
-            changed_char = None
-            if correct_answer:  # Sequences are different
-                for i, (a, b) in enumerate(zip(seq_a, seq_b)):
-                    if a != b:
-                        changed_index = i
-                        changed_char = b
-                        break
-            
-            detailed_results.append({
-                'seq_a': seq_a,
-                'seq_b': seq_b,
-                'correct_answer': correct_answer,  # True = different, False = same
-                'user_guess': user_guess,  # True = different, False = same
-                'response_time_ms': elapsed * 1000,
-                'was_correct': user_guess == correct_answer,
-                'changed_index': changed_index,
-                'changed_char': changed_char
-            })
-
-        # Save to leaderboard
-        add_to_leaderboard(self.username, round(accuracy, 1), round(avg_time), detailed_results)
+        append_event(session_event(self.mode, self.session_id, self.username, total_questions))
+        GAMES_COMPLETED.labels(self.mode).inc()
+        self.recorder.finish(accuracy, avg_time)
         
-        # Record statistics
-        self.stats_manager.record_challenge_result(self.results)
+        if self.ranked:
+            # Save the score
+            saved_text = self.save_results(accuracy, avg_time, self.build_detailed_results())
+            
+            # Bring statistics up to date, globally and in the player's own partition
+            self.stats_manager.refresh()
+            
+            # Compare the run with the player's usual response times
+            flags = run_anomalies(self.results, self.baseline_latency)
+            if flags:
+                FLAGGED_RUNS.labels(self.mode).inc()
+                saved_text += "\n\n⚠️ Unusual run: " + "; ".join(flags)
+        else:
+            saved_text = f"{self.schedule} runs are not saved to the leaderboard or statistics."
         
         summary = (
-            f"🏆 Challenge Complete! 🏆\n\n"
+            f"{self.header} Complete!\n\n"
             f"Player: {self.username}\n"
             f"Total Questions: {total_questions}\n"
             f"Correct Answers: {self.total_correct}\n"
             f"Accuracy: {accuracy:.1f}%\n"
             f"Average Time: {avg_time:.0f} ms\n\n"
-            f"Your score has been saved to the leaderboard!\n\n"
+            f"{saved_text}\n\n"
             f"Congratulations! 🎉"
         )
         
-        messagebox.showinfo("Challenge Summary", summary)
-        self.back_callback()
\ No newline at end of file
+        messagebox.showinfo(f"{self.title} Summary", summary)
+        self.after_summary()
+
+    def after_summary(self):
+        """Leave the finished game."""
+        self.back_callback()
+
+    def back(self):
+        """Keep the recording of a session left early and return to the menu."""
+        self.recorder.close()
+        self.back_callback()
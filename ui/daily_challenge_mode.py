@@ -0,0 +1,57 @@
+from datetime import date
+import config
+from data.daily_leaderboard_store import add_to_daily_leaderboard
+from logic.daily import daily_questions
+from ui.challenge_mode import ChallengeMode
+from ui.daily_leaderboard_menu import DailyLeaderboard
+
+
+class DailyChallengeMode(ChallengeMode):
+    title = "Daily Challenge"
+    header = "📅 Daily Challenge"
+    mode = "daily"
+
+    def __init__(self, root, username, back_callback):
+        """
+        Initialize the Daily Challenge.
+
+        Every player gets the same questions for the same calendar day.
+
+        Args:
+            root: tkinter root window
+            username: Player's username
+            back_callback: Function to call when returning to main menu
+        """
+        # Fix the day up front so a game started before midnight
+        # keeps its questions and its leaderboard partition.
+        self.day = date.today()
+        super().__init__(root, username, back_callback)
+
+    def level_lengths(self):
+        """The configured lengths; a local calibration would change the shared questions."""
+        return list(config.LEVEL_SCHEDULES[self.schedule])
+
+    def reset_game(self):
+        """Reset the game and rebuild today's question list."""
+        super().reset_game()
+        self.questions = daily_questions(
+            self.levels, self.questions_per_level, self.probability, self.day
+        )
+        self.question_position = 0
+
+    def create_question(self, length):
+        """Serve the next question from today's fixed list."""
+        question = self.questions[self.question_position]
+        self.question_position += 1
+        return question
+
+    def save_results(self, accuracy, avg_time, detailed_results):
+        """Save the score to today's leaderboard partition."""
+        rank, total = add_to_daily_leaderboard(
+            self.username, round(accuracy, 1), round(avg_time), detailed_results, self.day
+        )
+        return f"Today's rank ({self.day.isoformat()}): #{rank} of {total}"
+
+    def after_summary(self):
+        """Show the day's leaderboard, then return to the menu from there."""
+        DailyLeaderboard(self.root, self.back_callback, self.day)
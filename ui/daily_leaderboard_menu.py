@@ -0,0 +1,118 @@
+from datetime import date
+from tkinter import ttk, messagebox
+from data.daily_leaderboard_store import load_daily_leaderboard
+from ui.history_viewer import HistoryViewer
+from ui.leaderboard_menu import rank_text
+
+COLUMNS = ("Rank", "Username", "Accuracy", "Avg Time")
+HEADINGS = {
+    "Rank": "Rank",
+    "Username": "Username",
+    "Accuracy": "Accuracy (%)",
+    "Avg Time": "Avg Time (ms)",
+}
+
+
+class DailyLeaderboard:
+    def __init__(self, root, back_callback, day=None):
+        """
+        Initialize the Daily Challenge leaderboard.
+
+        Only the day's own partition is read; it is stored best first.
+
+        Args:
+            root: tkinter root window
+            back_callback: Function to call when leaving the board
+            day: Day whose board to show (defaults to today)
+        """
+        self.root = root
+        self.back_callback = back_callback
+        self.day = day or date.today()
+        self.entries = []
+        self.setup_gui()
+
+    def setup_gui(self):
+        """Set up the GUI for the daily leaderboard."""
+        # Clear existing widgets
+        for widget in self.root.winfo_children():
+            widget.destroy()
+
+        self.root.title("Daily Leaderboard - Sequence Challenge")
+        self.root.geometry("800x600")
+
+        main = ttk.Frame(self.root, padding=20)
+        main.pack(fill="both", expand=True)
+
+        # Title and Back button
+        header_frame = ttk.Frame(main)
+        header_frame.pack(fill="x", pady=(0, 20))
+
+        ttk.Button(header_frame, text="← Back",
+                  command=self.back_callback).pack(side="left")
+
+        ttk.Label(header_frame, text=f"📅 Daily Challenge — {self.day.isoformat()}",
+                 font=("Arial", 18, "bold")).pack(side="right")
+
+        self.entries = load_daily_leaderboard(self.day)
+
+        if not self.entries:
+            # Empty state
+            empty_frame = ttk.Frame(main)
+            empty_frame.pack(expand=True)
+
+            ttk.Label(empty_frame, text="📅", font=("Arial", 48)).pack(pady=10)
+            ttk.Label(empty_frame, text="No scores for this day yet!",
+                     font=("Arial", 16)).pack(pady=10)
+            ttk.Label(empty_frame, text="Play the Daily Challenge to appear here!",
+                     font=("Arial", 12), foreground="gray").pack()
+        else:
+            table_frame = ttk.Frame(main)
+            table_frame.pack(fill="both", expand=True, pady=(0, 10))
+
+            scrollbar = ttk.Scrollbar(table_frame)
+            scrollbar.pack(side="right", fill="y")
+
+            tree = ttk.Treeview(table_frame, columns=COLUMNS, show="headings",
+                               yscrollcommand=scrollbar.set, height=15)
+            self.tree = tree
+            scrollbar.config(command=tree.yview)
+
+            for column in COLUMNS:
+                tree.heading(column, text=HEADINGS[column])
+            tree.column("Rank", width=80, anchor="center")
+            tree.column("Username", width=250, anchor="w")
+            tree.column("Accuracy", width=150, anchor="center")
+            tree.column("Avg Time", width=150, anchor="center")
+
+            # Rows are keyed by their position, which is also the rank
+            for rank, entry in enumerate(self.entries, 1):
+                tree.insert("", "end", iid=str(rank - 1), values=(
+                    rank_text(rank),
+                    entry['username'],
+                    f"{entry['accuracy']:.1f}%",
+                    f"{entry['avg_time']:.0f} ms",
+                ))
+
+            tree.bind("<Double-1>", self.on_treeview_double_click)
+            tree.pack(side="left", fill="both", expand=True)
+
+            ttk.Label(main, text=f"{len(self.entries)} runs — double-click a row for its answers",
+                     font=("Arial", 9), foreground="gray").pack(anchor="w")
+
+        button_frame = ttk.Frame(main)
+        button_frame.pack(pady=10, fill="x")
+
+        ttk.Button(button_frame, text="🔄 Refresh",
+                  command=self.setup_gui).pack(side="right", padx=5)
+
+    def on_treeview_double_click(self, event):
+        """Show the answers of the clicked run."""
+        item = self.tree.identify_row(event.y)
+        if not item:
+            return
+        entry = self.entries[int(item)]
+        if entry.get('detailed_results'):
+            HistoryViewer(self.root, entry, self.setup_gui)
+        else:
+            messagebox.showinfo("No Detailed Data",
+                            "No detailed results available for this entry.")
@@ -0,0 +1,220 @@
+from tkinter import ttk
+import random
+import time
+from config import DRILL_LENGTH
+from game_manager import StatisticsManager
+from logic.drill import rate_answer, parse_item
+from data.drill_store import DrillStore
+from data.event_log import answer_event, session_event, append_event, new_session_id
+from data.session_recorder import SessionRecorder
+from ui.sequence_display import SequenceDisplay
+
+# How long the answer stays on screen before the next item (ms)
+FEEDBACK_MS = 600
+MISSED_FEEDBACK_MS = 1500
+
+
+class DrillMode:
+    def __init__(self, root, username, back_callback):
+        """
+        Initialize Drill Mode.
+
+        Drills the look-alike substitutions from SIMILAR_MAP on a spaced
+        repetition schedule, the player's most missed pairs first.
+
+        Args:
+            root: tkinter root window
+            username: Player whose schedule and mistakes to use
+            back_callback: Function to call when returning to main menu
+        """
+        self.root = root
+        self.username = username
+        self.back_callback = back_callback
+        self.store = DrillStore(username, StatisticsManager(username).confusion)
+        self.session_id = new_session_id()
+        self.recorder = SessionRecorder("drill", username, self.session_id)
+        self.answered = 0
+        self.total_correct = 0
+        self.active = True
+        self.reset_state()
+        self.setup_gui()
+
+    def reset_state(self):
+        """Reset the state of the current question."""
+        self.item = None
+        self.scheduled = False
+        self.current = None
+        self.waiting = False
+        self.question_start = 0
+
+    def setup_gui(self):
+        """Set up the GUI for drill mode."""
+        # Clear existing widgets
+        for widget in self.root.winfo_children():
+            widget.destroy()
+
+        self.root.title("Drill Mode - Sequence Challenge")
+        self.root.geometry("700x600")
+
+        main = ttk.Frame(self.root, padding=20)
+        main.pack(fill="both", expand=True)
+
+        # Title and Back button
+        header_frame = ttk.Frame(main)
+        header_frame.grid(row=0, column=0, columnspan=4, sticky="ew", pady=(0, 20))
+
+        ttk.Button(header_frame, text="← Back to Menu",
+                   command=self.back).pack(side="left")
+
+        ttk.Label(header_frame, text="🧠 Drill Mode",
+                  font=("Arial", 18, "bold")).pack(side="right")
+
+        # Progress Frame
+        progress_frame = ttk.LabelFrame(main, text="Progress", padding=15)
+        progress_frame.grid(row=1, column=0, columnspan=4, sticky="ew", pady=(0, 20))
+
+        ttk.Label(progress_frame, text=f"Player: {self.username}",
+                  font=("Arial", 11, "bold")).pack(pady=(0, 5))
+
+        self.item_label = ttk.Label(progress_frame, text="", font=("Arial", 12))
+        self.item_label.pack()
+
+        self.stats_label = ttk.Label(progress_frame, text="", font=("Arial", 10))
+        self.stats_label.pack(pady=(5, 0))
+
+        # Display sequences
+        seq_frame = ttk.Frame(main)
+        seq_frame.grid(row=2, column=0, columnspan=4, sticky="ew", pady=(0, 20))
+
+        ttk.Label(seq_frame, text="Original Sequence:", font=("Arial", 12, "bold")).pack(anchor="w")
+        self.original_label = ttk.Label(seq_frame, font=("Courier", 18), relief="solid",
+                                        padding=10, background="white")
+        self.original_label.pack(fill="x", pady=(5, 20))
+
+        ttk.Label(seq_frame, text="Second Sequence:", font=("Arial", 12, "bold")).pack(anchor="w")
+        self.seq_text = SequenceDisplay(seq_frame)
+        self.seq_text.pack(fill="x", pady=(5, 0))
+
+        # Guess Buttons
+        guess_frame = ttk.Frame(main)
+        guess_frame.grid(row=3, column=0, columnspan=4, pady=20)
+
+        self.yes_btn = ttk.Button(guess_frame, text="✅ YES (Same) [A]",
+                                  command=lambda: self.make_guess(False), width=20)
+        self.yes_btn.grid(row=0, column=0, padx=10)
+
+        self.no_btn = ttk.Button(guess_frame, text="❌ NO (Different) [D]",
+                                 command=lambda: self.make_guess(True), width=20)
+        self.no_btn.grid(row=0, column=1, padx=10)
+
+        self.result_label = ttk.Label(main, text="Look closely at the highlighted pairs!",
+                                      font=("Arial", 14))
+        self.result_label.grid(row=4, column=0, columnspan=4, pady=10)
+
+        # Bind keyboard shortcuts
+        self.root.bind("<a>", lambda e: self.make_guess(False, e.keysym))
+        self.root.bind("<A>", lambda e: self.make_guess(False, e.keysym))
+        self.root.bind("<d>", lambda e: self.make_guess(True, e.keysym))
+        self.root.bind("<D>", lambda e: self.make_guess(True, e.keysym))
+
+        self.root.after(100, self.show_next_question)
+
+    def update_progress(self):
+        """Show how many items are due and how the session is going."""
+        due = self.store.scheduler.due_count(time.time())
+        self.stats_label.config(
+            text=f"Due now: {due} | Answered: {self.answered} | Correct: {self.total_correct}"
+        )
+
+    def show_next_question(self):
+        """
+        Show a question for the item due soonest.
+
+        When nothing is due, a random item is shown as extra practice that
+        leaves the schedule alone; reviewing early would stretch intervals
+        as if the item had been recalled on time.
+        """
+        if not self.active:
+            return
+        self.reset_state()
+        scheduler = self.store.scheduler
+        if not len(scheduler):
+            self.result_label.config(text="Nothing to drill", foreground="black")
+            return
+        self.item = scheduler.next_item(time.time())
+        self.scheduled = self.item is not None
+        if not self.scheduled:
+            self.item = random.randrange(len(scheduler))
+
+        seq_a, seq_b, changed_index = scheduler.make_question(self.item, DRILL_LENGTH)
+        self.current = ("".join(seq_a), "".join(seq_b), changed_index)
+        original, replacement, _ = parse_item(scheduler.keys[self.item])
+        # The position is not given away, or a correct answer says little about recall
+        prefix = "" if self.scheduled else "Nothing due, extra practice: "
+        self.item_label.config(text=f"{prefix}Watch for {original} / {replacement}")
+
+        self.original_label.config(text=self.current[0])
+        self.seq_text.show(self.current[1])
+        self.question_start = self.seq_text.rendered_at
+        self.recorder.question(seq_a, seq_b, changed_index, None,
+                               self.question_start, self.seq_text.last_render_ms)
+        self.yes_btn.config(state="normal")
+        self.no_btn.config(state="normal")
+        self.waiting = True
+        self.update_progress()
+
+    def make_guess(self, user_guess, key=None):
+        """
+        Process the user's guess and, for a due item, reschedule and save it.
+
+        Only questions that showed the substitution count as a review;
+        "same" pairs are catch trials and leave the schedule alone.
+
+        Args:
+            user_guess: True for "different", False for "same"
+            key: Key symbol when answered from the keyboard
+        """
+        now = time.perf_counter()
+        self.recorder.input(user_guess, now, key)
+        if not self.waiting:
+            return
+        self.waiting = False
+
+        elapsed = now - self.question_start
+        text_a, text_b, changed_index = self.current
+        correct_answer = changed_index is not None
+        was_correct = user_guess == correct_answer
+
+        if self.scheduled and correct_answer:
+            self.store.scheduler.review(self.item, rate_answer(was_correct, elapsed), time.time())
+            self.store.record(self.item)
+        append_event(answer_event("drill", self.session_id, self.username, self.answered, None,
+                                  text_a, text_b, correct_answer, user_guess, elapsed))
+        self.answered += 1
+
+        if was_correct:
+            self.total_correct += 1
+            self.result_label.config(text=f"✅ Correct — {elapsed * 1000:.0f} ms", foreground="green")
+        elif correct_answer:
+            self.result_label.config(
+                text=f"❌ Different at position {changed_index + 1}: "
+                     f"{text_a[changed_index]} → {text_b[changed_index]}",
+                foreground="red",
+            )
+        else:
+            self.result_label.config(text="❌ Wrong — they were the same", foreground="red")
+
+        if changed_index is not None:
+            self.seq_text.show(text_b, changed_index)
+        self.yes_btn.config(state="disabled")
+        self.no_btn.config(state="disabled")
+        self.update_progress()
+        self.root.after(FEEDBACK_MS if was_correct else MISSED_FEEDBACK_MS, self.show_next_question)
+
+    def back(self):
+        """Close the drill session in the event log and return to the menu."""
+        self.active = False
+        if self.answered:
+            append_event(session_event("drill", self.session_id, self.username, self.answered))
+        self.recorder.close()
+        self.back_callback()
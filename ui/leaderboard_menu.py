@@ -1,27 +1,70 @@
+import tkinter as tk
 from tkinter import ttk, messagebox
-from data.leaderboard_store import load_leaderboard, save_leaderboard
+from bisect import bisect_left, insort
+from data.leaderboard_store import load_leaderboard, save_leaderboard, delete_from_leaderboard, get_entry
 from ui.history_viewer import HistoryViewer
 
+COLUMNS = ("Rank", "Username", "Accuracy", "Avg Time", "Delete")
+HEADINGS = {
+    "Rank": "Rank",
+    "Username": "Username",
+    "Accuracy": "Accuracy (%)",
+    "Avg Time": "Avg Time (ms)",
+    "Delete": "",
+}
+
+
+def sort_key(column, entry):
+    """
+    Sort key of an entry for one column. The id makes every key unique.
+    
+    The Rank key matches the store's ordering: accuracy descending, then
+    faster average time, then the earlier score.
+    """
+    if column == "Username":
+        return (entry['username'].casefold(), entry['id'])
+    if column == "Accuracy":
+        return (entry['accuracy'], entry['id'])
+    if column == "Avg Time":
+        return (entry['avg_time'], entry['id'])
+    return (-entry['accuracy'], entry['avg_time'], entry.get('timestamp') or '', entry['id'])
+
+
+def rank_text(rank):
+    """Rank cell text with medals for the top three."""
+    return f"🥇 {rank}" if rank == 1 else f"🥈 {rank}" if rank == 2 else f"🥉 {rank}" if rank == 3 else str(rank)
+
+
+def query_matches(query, entry):
+    """True if a casefolded search query is part of an entry's username."""
+    return query in entry['username'].casefold()
+
 
 class Leaderboard:
     def __init__(self, root, back_callback):
         """
         Initialize Leaderboard.
         
+        Rows are keyed by entry id. Refreshes and deletes only touch the
+        rows that changed, and sorting walks pre-sorted key indexes instead
+        of re-sorting the board.
+        
         Args:
             root: tkinter root window
             back_callback: Function to call when returning to main menu
         """
         self.root = root
         self.back_callback = back_callback
+        self.tree = None
         self.setup_gui()
-        
+    
     def setup_gui(self):
         """Set up the GUI for leaderboard."""
         # Clear existing widgets
         for widget in self.root.winfo_children():
             widget.destroy()
-            
+        self.tree = None
+        
         self.root.title("Leaderboard - Sequence Challenge")
         self.root.geometry("800x600")  # Increased width for delete button
         
@@ -35,7 +78,7 @@ class Leaderboard:
         ttk.Button(header_frame, text="← Back to Menu",
                   command=self.back_callback).pack(side="left")
         
-        ttk.Label(header_frame, text="🏅 Leaderboard", 
+        ttk.Label(header_frame, text="🏅 Leaderboard",
                  font=("Arial", 18, "bold")).pack(side="right")
         
         # Load leaderboard data
@@ -47,11 +90,24 @@ class Leaderboard:
             empty_frame.pack(expand=True)
             
             ttk.Label(empty_frame, text="🏆", font=("Arial", 48)).pack(pady=10)
-            ttk.Label(empty_frame, text="No scores yet!", 
+            ttk.Label(empty_frame, text="No scores yet!",
                      font=("Arial", 16)).pack(pady=10)
-            ttk.Label(empty_frame, text="Complete a challenge to appear here!", 
+            ttk.Label(empty_frame, text="Complete a challenge to appear here!",
                      font=("Arial", 12), foreground="gray").pack()
         else:
+            # Username search, filtered as you type
+            search_frame = ttk.Frame(main)
+            search_frame.pack(fill="x", pady=(0, 10))
+            
+            ttk.Label(search_frame, text="🔍 Search:",
+                     font=("Arial", 10, "bold")).pack(side="left", padx=(0, 5))
+            self.search_var = tk.StringVar()
+            ttk.Entry(search_frame, textvariable=self.search_var, width=30).pack(side="left")
+            self.search_var.trace_add("write", lambda *args: self.apply_search())
+            
+            self.count_label = ttk.Label(search_frame, font=("Arial", 9), foreground="gray")
+            self.count_label.pack(side="right")
+            
             # Create table frame with scrollbar
             table_frame = ttk.Frame(main)
             table_frame.pack(fill="both", expand=True, pady=(0, 10))
@@ -61,19 +117,20 @@ class Leaderboard:
             scrollbar.pack(side="right", fill="y")
             
             # Create treeview
-            columns = ("Rank", "Username", "Accuracy", "Avg Time", "Delete")
-            tree = ttk.Treeview(table_frame, columns=columns, show="headings", 
+            tree = ttk.Treeview(table_frame, columns=COLUMNS, show="headings",
                                yscrollcommand=scrollbar.set, height=15)
+            self.tree = tree
             
             # Configure scrollbar
             scrollbar.config(command=tree.yview)
             
-            # Define headings
-            tree.heading("Rank", text="Rank")
-            tree.heading("Username", text="Username")
-            tree.heading("Accuracy", text="Accuracy (%)")
-            tree.heading("Avg Time", text="Avg Time (ms)")
-            tree.heading("Delete", text="")
+            # Define headings, clicking one sorts by that column
+            for column in COLUMNS:
+                if column == "Delete":
+                    tree.heading(column, text=HEADINGS[column])
+                else:
+                    tree.heading(column, text=HEADINGS[column],
+                                command=lambda c=column: self.sort_by(c))
             
             # Configure column widths
             tree.column("Rank", width=80, anchor="center")
@@ -82,22 +139,21 @@ class Leaderboard:
             tree.column("Avg Time", width=150, anchor="center")
             tree.column("Delete", width=80, anchor="center")
             
-            # Add data
-            for i, entry in enumerate(leaderboard, 1):
-                rank_text = f"🥇 {i}" if i == 1 else f"🥈 {i}" if i == 2 else f"🥉 {i}" if i == 3 else str(i)
-                tree.insert("", "end", values=(
-                    rank_text,
-                    entry['username'],
-                    f"{entry['accuracy']:.1f}%",
-                    f"{entry['avg_time']:.0f} ms",
-                    "❌"  # Delete icon
-                ))
+            # Rows are inserted once, keyed by entry id
+            self.entries = {}
+            self.indexes = {"Rank": []}
+            self.sort_column = "Rank"
+            self.sort_descending = False
+            self.query = ""
+            self.matches = None
+            self.load_entries(leaderboard)
             
             # Bind click event on the Delete column
-            tree.bind("<Button-1>", lambda e: self.on_treeview_click(e, tree, leaderboard))
+            tree.bind("<Button-1>", self.on_treeview_click)
             
             tree.pack(side="left", fill="both", expand=True)
-            
+            self.update_count()
+        
         # Button frame at the bottom
         button_frame = ttk.Frame(main)
         button_frame.pack(pady=10, fill="x")
@@ -108,10 +164,156 @@ class Leaderboard:
         
         # Refresh button (right side)
         ttk.Button(button_frame, text="🔄 Refresh",
-                  command=self.setup_gui).pack(side="right", padx=5)
+                  command=self.refresh).pack(side="right", padx=5)
+        
+        # Today's Daily Challenge board, kept in its own partition
+        ttk.Button(button_frame, text="📅 Today's Daily",
+                  command=self.show_daily).pack(side="right", padx=5)
+    
+    def row_values(self, entry, rank):
+        """Cell values of one row."""
+        return (
+            rank_text(rank),
+            entry['username'],
+            f"{entry['accuracy']:.1f}%",
+            f"{entry['avg_time']:.0f} ms",
+            "❌"  # Delete icon
+        )
+    
+    def rank_of(self, item):
+        """1-based rank of an entry, found by bisecting the rank index."""
+        return bisect_left(self.indexes["Rank"], sort_key("Rank", self.entries[item])) + 1
+    
+    def load_entries(self, leaderboard):
+        """
+        Fill an empty tree in one pass.
+        
+        The rank index is sorted once and every row gets its rank from the
+        finished index, so earlier rows never show a rank a later tie shifts.
+        """
+        for entry in leaderboard:
+            self.entries[entry['id']] = entry
+        self.indexes["Rank"] = sorted(sort_key("Rank", entry) for entry in leaderboard)
+        for rank, key in enumerate(self.indexes["Rank"], 1):
+            item = key[-1]
+            self.tree.insert("", "end", iid=item, values=self.row_values(self.entries[item], rank))
     
-    def on_treeview_click(self, event, tree, leaderboard):
+    def add_entry(self, entry):
+        """Add one entry to the key indexes and append its row to the tree."""
+        item = entry['id']
+        self.entries[item] = entry
+        for column, index in self.indexes.items():
+            insort(index, sort_key(column, entry))
+        self.tree.insert("", "end", iid=item, values=self.row_values(entry, self.rank_of(item)))
+    
+    def remove_entry(self, item):
+        """Remove one entry from the key indexes and the tree."""
+        entry = self.entries.pop(item)
+        for column, index in self.indexes.items():
+            del index[bisect_left(index, sort_key(column, entry))]
+        self.tree.delete(item)
+        if self.matches is not None:
+            self.matches.discard(item)
+    
+    def sorted_items(self, column):
+        """Entry ids in the order of one column. Each index is built once, then kept up to date."""
+        if column not in self.indexes:
+            self.indexes[column] = sorted(sort_key(column, entry) for entry in self.entries.values())
+        items = [key[-1] for key in self.indexes[column]]
+        if self.sort_descending:
+            items.reverse()
+        return items
+    
+    def update_ranks(self, start_rank):
+        """Rewrite the rank cell of every entry ranked at or below `start_rank`."""
+        for rank, key in enumerate(self.indexes["Rank"][start_rank - 1:], start_rank):
+            item = key[-1]
+            text = rank_text(rank)
+            if self.tree.set(item, "Rank") != text:
+                self.tree.set(item, "Rank", text)
+    
+    def arrange(self):
+        """Show the matching rows in the current sort order, moving only rows from the first difference on."""
+        wanted = [item for item in self.sorted_items(self.sort_column)
+                  if self.matches is None or item in self.matches]
+        current = list(self.tree.get_children())
+        
+        wanted_set = set(wanted)
+        hidden = [item for item in current if item not in wanted_set]
+        if hidden:
+            self.tree.detach(*hidden)
+            current = [item for item in current if item in wanted_set]
+        
+        first = next((position for position, (a, b) in enumerate(zip(wanted, current)) if a != b),
+                     min(len(wanted), len(current)))
+        for position in range(first, len(wanted)):
+            self.tree.move(wanted[position], "", position)
+        self.update_count()
+    
+    def update_count(self):
+        """Show how many entries match the search."""
+        shown = len(self.entries) if self.matches is None else len(self.matches)
+        self.count_label.config(text=f"Showing {shown} of {len(self.entries)}")
+    
+    def sort_by(self, column):
+        """Sort by a column; clicking the same column again reverses the order."""
+        if column == self.sort_column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = column
+            self.sort_descending = False
+        
+        for other in COLUMNS:
+            arrow = ""
+            if other == column and other != "Delete":
+                arrow = " ▼" if self.sort_descending else " ▲"
+            self.tree.heading(other, text=HEADINGS[other] + arrow)
+        self.arrange()
+    
+    def apply_search(self):
+        """
+        Filter rows by username as the search text changes.
+        
+        When the new text extends the previous one, only the previous matches
+        are checked again.
+        """
+        query = self.search_var.get().strip().casefold()
+        if not query:
+            self.matches = None
+        else:
+            if self.matches is not None and self.query and query.startswith(self.query):
+                candidates = self.matches
+            else:
+                candidates = self.entries
+            self.matches = {item for item in candidates if query_matches(query, self.entries[item])}
+        self.query = query
+        self.arrange()
+    
+    def refresh(self):
+        """Reload the leaderboard and apply only the differences to the tree."""
+        leaderboard = load_leaderboard()
+        if self.tree is None or not leaderboard:
+            self.setup_gui()
+            return
+        
+        latest = {entry['id']: entry for entry in leaderboard}
+        for item in [item for item in self.entries if item not in latest]:
+            self.remove_entry(item)
+        for item, entry in latest.items():
+            if item in self.entries:
+                if entry == self.entries[item]:
+                    continue
+                self.remove_entry(item)
+            self.add_entry(entry)
+            if self.query and query_matches(self.query, entry):
+                self.matches.add(item)
+        
+        self.update_ranks(1)
+        self.arrange()
+    
+    def on_treeview_click(self, event):
         """Handle clicks on the treeview."""
+        tree = self.tree
         # Identify the region that was clicked
         region = tree.identify_region(event.x, event.y)
         if region == "cell":
@@ -121,58 +323,43 @@ class Leaderboard:
             
             # If delete column (column 5) was clicked
             if column == "#5" and item:
-                # Get the item values
-                values = tree.item(item, "values")
-                username = values[1]  # Username is in the second column
+                entry = self.entries[item]
+                username = entry['username']
                 
                 # Confirm deletion
-                if messagebox.askyesno("Delete Record", 
-                                    f"Delete record for '{username}'?"):
-                    # Remove the record from leaderboard
-                    leaderboard = load_leaderboard()
-                    leaderboard = [entry for entry in leaderboard if entry['username'] != username]
-                    save_leaderboard(leaderboard)
-                    
-                    # Refresh the display
-                    self.setup_gui()
+                if messagebox.askyesno("Delete Record",
+                                    f"Delete this record for '{username}' "
+                                    f"({entry['accuracy']:.1f}%, {entry['avg_time']:.0f} ms)?"):
+                    # Remove only this record, then fix the ranks below it
+                    rank = self.rank_of(item)
+                    delete_from_leaderboard(item)
+                    self.remove_entry(item)
+                    self.update_ranks(rank)
+                    self.update_count()
             
             # If any other column was clicked (show history)
             elif item and column != "#5":
-                # Get the rank from the first column
-                values = tree.item(item, "values")
-                rank_text = values[0]
+                # Rows only hold summaries, read this one entry in full
+                entry = get_entry(item)
                 
-                # Extract rank number (remove medal emoji)
-                rank_num = 0
-                if "🥇" in rank_text:
-                    rank_num = 1
-                elif "🥈" in rank_text:
-                    rank_num = 2
-                elif "🥉" in rank_text:
-                    rank_num = 3
+                # Check if we have detailed results
+                if entry and entry.get('detailed_results'):
+                    # Show history viewer
+                    HistoryViewer(self.root, entry, self.setup_gui)
                 else:
-                    try:
-                        rank_num = int(rank_text)
-                    except:  # noqa: E722
-                        rank_num = 0
-                
-                # Find the corresponding leaderboard entry
-                leaderboard = load_leaderboard()
-                if 0 < rank_num <= len(leaderboard):
-                    entry = leaderboard[rank_num - 1]
-                    
-                    # Check if we have detailed results
-                    if entry.get('detailed_results'):
-                        # Show history viewer
-                        HistoryViewer(self.root, entry, self.setup_gui)
-                    else:
-                        messagebox.showinfo("No Detailed Data", 
-                                        "No detailed results available for this entry.")
-
+                    messagebox.showinfo("No Detailed Data",
+                                    "No detailed results available for this entry.")
+    
+    def show_daily(self):
+        """Show today's Daily Challenge leaderboard."""
+        from ui.daily_leaderboard_menu import DailyLeaderboard
+        DailyLeaderboard(self.root, self.setup_gui)
+    
     def clear_leaderboard(self):
         """Clear all leaderboard entries."""
-        if messagebox.askyesno("Clear Leaderboard", 
+        if messagebox.askyesno("Clear Leaderboard",
                               "Are you sure you want to clear all leaderboard entries?\nThis action cannot be undone."):
             save_leaderboard([])
             # Refresh the display
-            self.setup_gui()
\ No newline at end of file
+            self.setup_gui()
+
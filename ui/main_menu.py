@@ -1,8 +1,7 @@
 from tkinter import ttk, simpledialog
-from ui.practice_mode import PracticeMode
-from ui.challenge_mode import ChallengeMode
-from ui.leaderboard_menu import Leaderboard
-from ui.statistics_menu import StatisticsMenu  
+
+# Screens are imported on first navigation rather than here, so starting
+# the game only loads the menu; their stores and game logic come later.
 
 class MainMenu:
     def __init__(self, root):
@@ -15,7 +14,7 @@ class MainMenu:
             widget.destroy()
             
         self.root.title("Sequence Challenge Game")
-        self.root.geometry("700x550")
+        self.root.geometry("700x840")
         
         main = ttk.Frame(self.root, padding=40)
         main.pack(fill="both", expand=True)
@@ -34,12 +33,36 @@ class MainMenu:
                                   width=25)
         challenge_btn.pack(pady=10)
         
+        # Daily Challenge button
+        daily_btn = ttk.Button(button_frame, text="📅 Daily Challenge", 
+                               command=self.start_daily_challenge,
+                               width=25)
+        daily_btn.pack(pady=10)
+        
+        # Stress Test button
+        stress_btn = ttk.Button(button_frame, text="🔥 Stress Test", 
+                                command=self.start_stress_test,
+                                width=25)
+        stress_btn.pack(pady=10)
+        
         # Practice Mode button
         practice_btn = ttk.Button(button_frame, text="🎮 Practice Mode", 
                                  command=self.start_practice_mode,
                                  width=25)
         practice_btn.pack(pady=10)
         
+        # Sprint Mode button
+        sprint_btn = ttk.Button(button_frame, text="⚡ Sprint Mode", 
+                                command=self.start_sprint_mode,
+                                width=25)
+        sprint_btn.pack(pady=10)
+        
+        # Drill Mode button
+        drill_btn = ttk.Button(button_frame, text="🧠 Drill Mode", 
+                               command=self.start_drill_mode,
+                               width=25)
+        drill_btn.pack(pady=10)
+        
         # Statistics button (NEW!)
         stats_btn = ttk.Button(button_frame, text="📊 Statistics", 
                                command=self.start_statistics,
@@ -64,7 +87,11 @@ class MainMenu:
             "• Try to be both FAST and ACCURATE!",
             "",
             "🏆 Challenge Mode: Timed challenge with increasing difficulty",
+            "📅 Daily Challenge: Everyone gets the same questions today",
             "🎮 Practice Mode: Customize settings and practice freely",
+            "⚡ Sprint Mode: Answer as many as you can in 60 seconds",
+            "🔥 Stress Test: Sequences thousands of characters long",
+            "🧠 Drill Mode: Review look-alike characters you tend to miss",
             "📊 Statistics: View your performance analytics",
             "🏅 Leaderboard: View top performers"
         ]
@@ -85,18 +112,63 @@ class MainMenu:
         )
         
         if username and username.strip():
+            from ui.challenge_mode import ChallengeMode
             ChallengeMode(self.root, username.strip(), self.show)
     
+    def start_daily_challenge(self):
+        """Prompt for username and start today's daily challenge"""
+        username = simpledialog.askstring(
+            "Enter Username", 
+            "Enter your username for today's leaderboard:",
+            parent=self.root
+        )
+        
+        if username and username.strip():
+            from ui.daily_challenge_mode import DailyChallengeMode
+            DailyChallengeMode(self.root, username.strip(), self.show)
+    
+    def start_stress_test(self):
+        """Prompt for username and start the long-sequence stress schedule"""
+        username = simpledialog.askstring(
+            "Enter Username", 
+            "Enter your username:",
+            parent=self.root
+        )
+        
+        if username and username.strip():
+            from ui.challenge_mode import ChallengeMode
+            ChallengeMode(self.root, username.strip(), self.show, schedule="Stress")
+    
     def start_practice_mode(self):
         """Start practice mode with callback to return to main menu"""
+        from ui.practice_mode import PracticeMode
         PracticeMode(self.root, self.show)
     
+    def start_sprint_mode(self):
+        """Start sprint mode with callback to return to main menu"""
+        from ui.sprint_mode import SprintMode
+        SprintMode(self.root, self.show)
+    
+    def start_drill_mode(self):
+        """Prompt for username and start that player's drill schedule"""
+        username = simpledialog.askstring(
+            "Enter Username", 
+            "Enter your username:",
+            parent=self.root
+        )
+        
+        if username and username.strip():
+            from ui.drill_mode import DrillMode
+            DrillMode(self.root, username.strip(), self.show)
+    
     def start_leaderboard(self):
         """Start leaderboard with callback to return to main menu"""
+        from ui.leaderboard_menu import Leaderboard
         Leaderboard(self.root, self.show)
     
     def start_statistics(self):
         """Start statistics view with callback to return to main menu"""
+        from ui.statistics_menu import StatisticsMenu
         StatisticsMenu(self.root, self.show)
     
     def show(self):
@@ -1,7 +1,11 @@
 import tkinter as tk
 from tkinter import ttk
+import random
 import time
-from logic.sequence import get_alphabet, generate_sequence, maybe_mutate_sequence
+from logic.question_bank import make_question
+from ui.sequence_display import SequenceDisplay
+from data.event_log import answer_event, session_event, append_event, new_session_id
+from data.session_recorder import SessionRecorder
 
 
 class PracticeMode:
@@ -15,11 +19,16 @@ class PracticeMode:
         """
         self.root = root
         self.back_callback = back_callback
+        self.question_index = random.randrange(1 << 30)
+        self.session_id = new_session_id()
+        self.answered = 0
+        self.recorder = SessionRecorder("practice", None, self.session_id)
         self.setup_gui()
         self.reset_state()
         
     def reset_state(self):
         """Reset game state variables."""
+        self.first_sequence = []
         self.second_sequence = []
         self.correct_answer = False
         self.changed_index = None
@@ -43,7 +52,7 @@ class PracticeMode:
         header_frame.grid(row=0, column=0, columnspan=4, sticky="ew", pady=(0, 20))
         
         ttk.Button(header_frame, text="← Back to Menu",
-                  command=self.back_callback).pack(side="left")
+                  command=self.back).pack(side="left")
         
         ttk.Label(header_frame, text="🎮 Practice Mode", 
                  font=("Arial", 18, "bold")).pack(side="right")
@@ -109,10 +118,8 @@ class PracticeMode:
         self.original_label.pack(fill="x", pady=(5, 20))
         
         ttk.Label(seq_frame, text="Second Sequence:", font=("Arial", 12, "bold")).pack(anchor="w")
-        self.seq_text = tk.Text(seq_frame, height=1, font=("Courier", 18), borderwidth=2,
-                               relief="solid", bg="white")
+        self.seq_text = SequenceDisplay(seq_frame)
         self.seq_text.pack(fill="x", pady=(5, 0))
-        self.seq_text.tag_config("changed", background="yellow", foreground="red")
         
         # Guess Buttons
         guess_frame = ttk.Frame(main)
@@ -143,9 +150,14 @@ class PracticeMode:
         # Generate initial sequence
         self.root.after(100, self.generate)
         
-    def start_timer(self):
-        """Start the timer for the current sequence."""
-        self.start_time = time.perf_counter()
+    def start_timer(self, onset=None):
+        """
+        Start the timer for the current sequence.
+        
+        Args:
+            onset: perf_counter time the sequence became visible (defaults to now)
+        """
+        self.start_time = onset or time.perf_counter()
         self.timer_running = True
         self.update_timer()
         
@@ -165,40 +177,27 @@ class PracticeMode:
         self.reset_state()
         length = int(self.length_var.get())
         probability = self.prob_var.get() / 100
-        alphabet = get_alphabet(self.charset_var.get())
         
-        seq1 = generate_sequence(length, alphabet)
-        seq2, self.changed_index = maybe_mutate_sequence(seq1, probability, alphabet)
+        seq1, seq2, self.changed_index = make_question(
+            length, self.charset_var.get(), probability, self.question_index
+        )
+        self.question_index += 1
+        self.first_sequence = seq1
         self.second_sequence = seq2
         self.correct_answer = self.changed_index is not None
         
         self.original_label.config(text="".join(seq1))
-        self.draw_second_sequence(seq2, None)
         self.result_label.config(text="Make your guess", foreground="black")
-        self.start_timer()
         
         # Enable buttons
         self.yes_btn.config(state="normal")
         self.no_btn.config(state="normal")
         
-    def draw_second_sequence(self, sequence, highlight_index):
-        """
-        Display the second sequence with optional highlighting.
-        
-        Args:
-            sequence: The sequence to display
-            highlight_index: Index to highlight, or None for no highlighting
-        """
-        self.seq_text.config(state="normal")
-        self.seq_text.delete("1.0", tk.END)
-        
-        for i, char in enumerate(sequence):
-            if i == highlight_index:
-                self.seq_text.insert(tk.END, char, "changed")
-            else:
-                self.seq_text.insert(tk.END, char)
-                
-        self.seq_text.config(state="disabled")
+        # The clock starts once the second sequence is on screen
+        self.seq_text.show(seq2)
+        self.start_timer(self.seq_text.rendered_at)
+        self.recorder.question(seq1, seq2, self.changed_index, None,
+                               self.start_time, self.seq_text.last_render_ms)
         
     def guess(self, user_guess):
         """
@@ -207,11 +206,20 @@ class PracticeMode:
         Args:
             user_guess: True for "different", False for "same"
         """
+        now = time.perf_counter()
+        self.recorder.input(user_guess, now)
         if not self.timer_running:
             return
             
         self.stop_timer()
-        elapsed = time.perf_counter() - self.start_time
+        elapsed = now - self.start_time
+        
+        append_event(answer_event(
+            "practice", self.session_id, None, self.answered, None,
+            "".join(self.first_sequence), "".join(self.second_sequence),
+            self.correct_answer, user_guess, elapsed
+        ))
+        self.answered += 1
         
         if user_guess == self.correct_answer:
             self.result_label.config(
@@ -226,7 +234,7 @@ class PracticeMode:
             
         # Reveal difference AFTER guess
         if self.changed_index is not None:
-            self.draw_second_sequence(self.second_sequence, self.changed_index)
+            self.seq_text.show(self.second_sequence, self.changed_index)
             
         # Disable buttons until next generate
         self.yes_btn.config(state="disabled")
@@ -235,4 +243,11 @@ class PracticeMode:
     def copy_to_clipboard(self):
         """Copy the current second sequence to clipboard."""
         self.root.clipboard_clear()
-        self.root.clipboard_append(self.seq_text.get("1.0", tk.END).strip())
\ No newline at end of file
+        self.root.clipboard_append(self.seq_text.sequence)
+        
+    def back(self):
+        """Close the practice session in the event log and return to the menu."""
+        if self.answered:
+            append_event(session_event("practice", self.session_id, None, self.answered))
+        self.recorder.close()
+        self.back_callback()
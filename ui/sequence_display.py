@@ -0,0 +1,105 @@
+import time
+from tkinter.scrolledtext import ScrolledText
+from config import SEQUENCE_WRAP_WIDTH, SEQUENCE_MAX_ROWS
+
+
+class SequenceDisplay(ScrolledText):
+    def __init__(self, parent, wrap_width=SEQUENCE_WRAP_WIDTH, max_rows=SEQUENCE_MAX_ROWS, **kwargs):
+        """
+        Read-only Text widget that shows one sequence.
+
+        Sequences with more than `max_rows` rows get a scrollbar, so the
+        rows below the visible ones can still be compared.
+
+        The whole sequence is written with a single replace call and the
+        changed character is highlighted with a tag range. Nothing is
+        repainted when the same sequence and highlight are shown again.
+
+        Args:
+            parent: Parent widget
+            wrap_width: Characters per row for long sequences
+            max_rows: Maximum visible rows, longer sequences scroll
+            **kwargs: Extra tk.Text options (font, padding, ...)
+        """
+        options = {
+            "height": 1,
+            "font": ("Courier", 18),
+            "borderwidth": 2,
+            "relief": "solid",
+            "background": "white",
+            "padx": 10,
+            "pady": 10,
+            "wrap": "none",
+        }
+        options.update(kwargs)
+        super().__init__(parent, **options)
+        # Shown only while the sequence is taller than max_rows
+        self.vbar.pack_forget()
+        self.tag_config("changed", background="yellow", foreground="red")
+        self.config(state="disabled")
+
+        self.wrap_width = wrap_width
+        self.max_rows = max_rows
+        self.sequence = ""
+        self.highlight_index = None
+
+        # Timing of the last repaint, read by the modes to timestamp stimulus onset
+        self.last_render_ms = 0.0
+        self.rendered_at = 0.0
+
+    def _rows(self, text):
+        """Split a long sequence into rows of `wrap_width` characters."""
+        width = self.wrap_width
+        if len(text) <= width:
+            return text
+        return "\n".join(text[i:i + width] for i in range(0, len(text), width))
+
+    def show(self, sequence, highlight_index=None):
+        """
+        Display a sequence with optional highlighting.
+
+        Args:
+            sequence: The sequence to display (string or list of characters)
+            highlight_index: Index to highlight, or None for no highlighting
+
+        Returns:
+            True if the widget was repainted, False if nothing changed
+        """
+        text = sequence if isinstance(sequence, str) else "".join(sequence)
+        if text == self.sequence and highlight_index == self.highlight_index:
+            # Already on screen, the stimulus is visible from now on
+            self.rendered_at = time.perf_counter()
+            self.last_render_ms = 0.0
+            return False
+
+        start = time.perf_counter()
+        self.config(state="normal")
+
+        if text != self.sequence:
+            rows = self._rows(text)
+            count = rows.count("\n") + 1
+            self.config(height=min(count, self.max_rows))
+            if count > self.max_rows:
+                self.vbar.pack(side="right", fill="y", before=self)
+            else:
+                self.vbar.pack_forget()
+            self.replace("1.0", "end-1c", rows)
+            self.yview_moveto(0)
+        else:
+            self.tag_remove("changed", "1.0", "end")
+
+        if highlight_index is not None:
+            index = f"{highlight_index // self.wrap_width + 1}.{highlight_index % self.wrap_width}"
+            self.tag_add("changed", index, f"{index}+1c")
+            self.see(index)
+
+        self.config(state="disabled")
+
+        # Flush layout and drawing so the timing covers the visible update
+        self.update_idletasks()
+        self.rendered_at = time.perf_counter()
+        self.last_render_ms = (self.rendered_at - start) * 1000
+
+        self.sequence = text
+        self.highlight_index = highlight_index
+        return True
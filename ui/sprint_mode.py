@@ -0,0 +1,215 @@
+from tkinter import ttk, messagebox
+import time
+from config import SPRINT_SECONDS, SPRINT_LENGTH, SPRINT_RING_SIZE
+from logic.question_ring import QuestionRing
+from game_manager import StatisticsManager
+from data.event_log import answer_event, session_event, append_event, new_session_id
+from ui.sequence_display import SequenceDisplay
+
+
+class SprintMode:
+    def __init__(self, root, back_callback):
+        """
+        Initialize Sprint Mode.
+
+        Answer as many pairs as possible before the clock runs out.
+
+        Args:
+            root: tkinter root window
+            back_callback: Function to call when returning to main menu
+        """
+        self.root = root
+        self.back_callback = back_callback
+        self.stats_manager = StatisticsManager()
+        self.ring = QuestionRing(SPRINT_RING_SIZE, SPRINT_LENGTH, "Alphanumeric", 0.5)
+        self.ring.fill()
+        self.reset_state()
+        self.setup_gui()
+
+    def reset_state(self):
+        """Reset sprint state variables."""
+        self.running = False
+        self.sprint_start = 0
+        self.question_start = 0
+        self.current = None
+        self.results = []
+        self.total_correct = 0
+        self.session_id = new_session_id()
+
+    def setup_gui(self):
+        """Set up the GUI for sprint mode."""
+        # Clear existing widgets
+        for widget in self.root.winfo_children():
+            widget.destroy()
+
+        self.root.title("Sprint Mode - Sequence Challenge")
+        self.root.geometry("700x600")
+
+        main = ttk.Frame(self.root, padding=20)
+        main.pack(fill="both", expand=True)
+
+        # Title and Back button
+        header_frame = ttk.Frame(main)
+        header_frame.grid(row=0, column=0, columnspan=4, sticky="ew", pady=(0, 20))
+
+        ttk.Button(header_frame, text="← Back to Menu",
+                   command=self.back).pack(side="left")
+
+        ttk.Label(header_frame, text="⚡ Sprint Mode",
+                  font=("Arial", 18, "bold")).pack(side="right")
+
+        # Progress Frame
+        progress_frame = ttk.LabelFrame(main, text="Progress", padding=15)
+        progress_frame.grid(row=1, column=0, columnspan=4, sticky="ew", pady=(0, 20))
+
+        self.countdown_label = ttk.Label(
+            progress_frame, text=f"Time left: {SPRINT_SECONDS:.1f} s",
+            font=("Arial", 14, "bold")
+        )
+        self.countdown_label.pack()
+
+        self.stats_label = ttk.Label(
+            progress_frame, text="Answered: 0 | Correct: 0 | 0.0 per min",
+            font=("Arial", 10)
+        )
+        self.stats_label.pack(pady=(5, 0))
+
+        # Display sequences
+        seq_frame = ttk.Frame(main)
+        seq_frame.grid(row=2, column=0, columnspan=4, sticky="ew", pady=(0, 20))
+
+        ttk.Label(seq_frame, text="Original Sequence:", font=("Arial", 12, "bold")).pack(anchor="w")
+        self.original_label = ttk.Label(seq_frame, font=("Courier", 18), relief="solid",
+                                        padding=10, background="white")
+        self.original_label.pack(fill="x", pady=(5, 20))
+
+        ttk.Label(seq_frame, text="Second Sequence:", font=("Arial", 12, "bold")).pack(anchor="w")
+        self.seq_text = SequenceDisplay(seq_frame)
+        self.seq_text.pack(fill="x", pady=(5, 0))
+
+        # Guess Buttons
+        guess_frame = ttk.Frame(main)
+        guess_frame.grid(row=3, column=0, columnspan=4, pady=20)
+
+        self.yes_btn = ttk.Button(guess_frame, text="✅ YES (Same) [A]",
+                                  command=lambda: self.make_guess(False), width=20)
+        self.yes_btn.grid(row=0, column=0, padx=10)
+
+        self.no_btn = ttk.Button(guess_frame, text="❌ NO (Different) [D]",
+                                 command=lambda: self.make_guess(True), width=20)
+        self.no_btn.grid(row=0, column=1, padx=10)
+
+        # Feedback for the previous answer, never blocks the next question
+        self.result_label = ttk.Label(main, text=f"Answer as many as you can in {SPRINT_SECONDS} seconds!",
+                                      font=("Arial", 14))
+        self.result_label.grid(row=4, column=0, columnspan=4, pady=10)
+
+        # Bind keyboard shortcuts
+        self.root.bind("<a>", lambda e: self.make_guess(False))
+        self.root.bind("<A>", lambda e: self.make_guess(False))
+        self.root.bind("<d>", lambda e: self.make_guess(True))
+        self.root.bind("<D>", lambda e: self.make_guess(True))
+
+        # Start the sprint
+        self.root.after(100, self.start_sprint)
+
+    def start_sprint(self):
+        """Show the first question and start the single sprint clock."""
+        self.running = True
+        self.show_next_question()
+        self.sprint_start = self.question_start
+        self.update_countdown()
+
+    def update_countdown(self):
+        """Update the countdown every 100ms and stop the sprint when it hits zero."""
+        if not self.running:
+            return
+        remaining = SPRINT_SECONDS - (time.perf_counter() - self.sprint_start)
+        if remaining <= 0:
+            self.finish()
+            return
+        self.countdown_label.config(text=f"Time left: {remaining:.1f} s")
+        self.root.after(100, self.update_countdown)
+
+    def show_next_question(self):
+        """Swap in the next pre-joined question from the ring buffer."""
+        self.current = self.ring.pop()
+        text_a, text_b, _ = self.current
+
+        self.original_label.config(text=text_a)
+        self.seq_text.show(text_b)
+        self.question_start = self.seq_text.rendered_at
+
+        # Top the ring back up once Tk is idle
+        self.root.after_idle(self.ring.fill, 1)
+
+    def make_guess(self, user_guess):
+        """
+        Process the user's guess and move straight on to the next question.
+
+        Args:
+            user_guess: True for "different", False for "same"
+        """
+        if not self.running:
+            return
+
+        elapsed = time.perf_counter() - self.question_start
+        text_a, text_b, changed_index = self.current
+        correct_answer = changed_index is not None
+
+        self.results.append((text_a, text_b, correct_answer, user_guess, elapsed))
+        append_event(answer_event("sprint", self.session_id, None, len(self.results) - 1,
+                                  None, *self.results[-1]))
+
+        if user_guess == correct_answer:
+            self.total_correct += 1
+            self.result_label.config(text=f"✅ Correct — {elapsed * 1000:.0f} ms", foreground="green")
+        elif correct_answer:
+            self.result_label.config(
+                text=f"❌ Different at position {changed_index + 1}: "
+                     f"{text_a[changed_index]} → {text_b[changed_index]}",
+                foreground="red",
+            )
+        else:
+            self.result_label.config(text="❌ Wrong — they were the same", foreground="red")
+
+        answered = len(self.results)
+        per_minute = answered * 60 / max(time.perf_counter() - self.sprint_start, 1e-9)
+        self.stats_label.config(
+            text=f"Answered: {answered} | Correct: {self.total_correct} | {per_minute:.1f} per min"
+        )
+
+        self.show_next_question()
+
+    def finish(self):
+        """Stop the sprint, record statistics and show the summary."""
+        self.running = False
+        duration = time.perf_counter() - self.sprint_start
+        self.countdown_label.config(text="Time left: 0.0 s")
+        self.yes_btn.config(state="disabled")
+        self.no_btn.config(state="disabled")
+
+        answered = len(self.results)
+        accuracy = (self.total_correct / answered * 100) if answered > 0 else 0
+        avg_time = (sum(r[4] for r in self.results) / answered * 1000) if answered > 0 else 0
+        per_minute = answered * 60 / duration if duration > 0 else 0
+
+        append_event(session_event("sprint", self.session_id, None, answered))
+        self.stats_manager.refresh()
+
+        summary = (
+            f"⚡ Sprint Complete! ⚡\n\n"
+            f"Questions Answered: {answered}\n"
+            f"Correct Answers: {self.total_correct}\n"
+            f"Accuracy: {accuracy:.1f}%\n"
+            f"Questions per Minute: {per_minute:.1f}\n"
+            f"Average Time: {avg_time:.0f} ms"
+        )
+
+        messagebox.showinfo("Sprint Summary", summary)
+        self.back_callback()
+
+    def back(self):
+        """Abandon the sprint and return to the main menu."""
+        self.running = False
+        self.back_callback()
@@ -1,6 +1,19 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from game_manager import StatisticsManager
+from data.profile_store import list_profiles
+from logic.downsample import lttb
+from config import TREND_MAX_POINTS
+
+ALL_PLAYERS = "All Players"
+
+# Trend metrics: display name -> (index in a trend point, unit)
+TREND_METRICS = {
+    "Accuracy": (2, "%"),
+    "Questions": (1, ""),
+    "Median Response Time": (3, " ms"),
+    "90th Percentile Response Time": (4, " ms"),
+}
 
 class StatisticsMenu:
     def __init__(self, root, back_callback):
@@ -13,6 +26,7 @@ class StatisticsMenu:
         """
         self.root = root
         self.back_callback = back_callback
+        self.player = None
         self.stats_manager = StatisticsManager()
         self.setup_gui()
         
@@ -38,44 +52,84 @@ class StatisticsMenu:
         ttk.Label(header_frame, text="📊 Statistics", 
                  font=("Arial", 18, "bold")).pack(side="right")
         
-        # Create Notebook (Tabs)
-        notebook = ttk.Notebook(main)
-        notebook.pack(fill="both", expand=True, pady=10)
-        
-        # Tab 1: Overview
-        overview_frame = ttk.Frame(notebook)
-        notebook.add(overview_frame, text="📈 Overview")
-        self.create_overview_tab(overview_frame)
-        
-        # Tab 2: Level Performance
-        level_frame = ttk.Frame(notebook)
-        notebook.add(level_frame, text="🎯 Level Performance")
-        self.create_level_tab(level_frame)
-        
-        # Tab 3: Sequence Type
-        type_frame = ttk.Frame(notebook)
-        notebook.add(type_frame, text="🔄 Sequence Type")
-        self.create_type_tab(type_frame)
-        
-        # Tab 4: Common Mistakes
-        mistakes_frame = ttk.Frame(notebook)
-        notebook.add(mistakes_frame, text="❌ Common Mistakes")
-        self.create_mistakes_tab(mistakes_frame)
+        # Player selection: one player's partition or the combined totals
+        player_frame = ttk.Frame(main)
+        player_frame.pack(fill="x")
+        
+        ttk.Label(player_frame, text="Player:", 
+                 font=("Arial", 10, "bold")).pack(side="left", padx=(0, 5))
+        self.player_var = tk.StringVar(value=self.player or ALL_PLAYERS)
+        self.player_box = player_box = ttk.Combobox(
+            player_frame,
+            textvariable=self.player_var,
+            values=[ALL_PLAYERS] + list_profiles(),
+            state="readonly",
+            width=25
+        )
+        player_box.pack(side="left")
+        player_box.bind("<<ComboboxSelected>>", lambda e: self.select_player(self.player_var.get()))
+        
+        # One snapshot shared by every tab until the next refresh
+        self.stats = self.stats_manager.get_statistics()
+        
+        # Create Notebook (Tabs). Tabs are empty until first shown.
+        self.notebook = ttk.Notebook(main)
+        self.notebook.pack(fill="both", expand=True, pady=10)
+        
+        self.tabs = {}
+        for text, builder in [
+            ("📈 Overview", self.create_overview_tab),
+            ("🎯 Level Performance", self.create_level_tab),
+            ("🔄 Sequence Type", self.create_type_tab),
+            ("❌ Common Mistakes", self.create_mistakes_tab),
+            ("📉 Trends", self.create_trends_tab),
+        ]:
+            frame = ttk.Frame(self.notebook)
+            self.notebook.add(frame, text=text)
+            self.tabs[str(frame)] = (frame, builder)
+        self.built_tabs = set()
+        self.notebook.bind("<<NotebookTabChanged>>", lambda e: self.build_current_tab())
         
         # Refresh and Clear buttons
         button_frame = ttk.Frame(main)
         button_frame.pack(pady=10)
         
         ttk.Button(button_frame, text="🔄 Refresh Statistics",
-                  command=self.setup_gui).pack(side="left", padx=5)
+                  command=self.refresh).pack(side="left", padx=5)
         
         ttk.Button(button_frame, text="🗑️ Clear All Statistics",
                   command=self.clear_statistics,
                   style="Danger.TButton").pack(side="left", padx=5)
+        
+        self.build_current_tab()
+    
+    def build_current_tab(self):
+        """Build the selected tab from the current snapshot if it has not been built yet."""
+        current = self.notebook.select()
+        if not current or current in self.built_tabs:
+            return
+        frame, builder = self.tabs[current]
+        for widget in frame.winfo_children():
+            widget.destroy()
+        builder(frame)
+        self.built_tabs.add(current)
+    
+    def refresh(self):
+        """
+        Take a new statistics snapshot and redraw in place.
+        
+        Only the visible tab is rebuilt now; the others are rebuilt from the
+        same snapshot when they are next selected.
+        """
+        self.stats_manager.refresh()
+        self.stats = self.stats_manager.get_statistics()
+        self.player_box.config(values=[ALL_PLAYERS] + list_profiles())
+        self.built_tabs.clear()
+        self.build_current_tab()
     
     def create_overview_tab(self, parent):
         """Create the overview tab."""
-        stats = self.stats_manager.get_statistics()
+        stats = self.stats
         
         # General Stats Frame
         general_frame = ttk.LabelFrame(parent, text="General Statistics", padding=15)
@@ -146,10 +200,25 @@ class StatisticsMenu:
             canvas.create_rectangle(0, 0, fill_width, 25, fill=color, outline="")
             canvas.create_text(width/2, 12.5, text=f"{accuracy_percent:.1f}%", 
                              font=("Arial", 10, "bold"))
+        
+        # Response time distribution, fitted from running sums
+        model = stats.get('latency_model')
+        if model:
+            model_frame = ttk.LabelFrame(parent, text="Response Time Distribution", padding=15)
+            model_frame.pack(fill="x", pady=10, padx=5)
+            
+            ttk.Label(model_frame,
+                     text=f"Typical: {model['median']:.0f} ms — 80% of correct answers between "
+                          f"{model['p10']:.0f} and {model['p90']:.0f} ms",
+                     font=("Arial", 10, "bold")).pack(anchor="w", pady=2)
+            ttk.Label(model_frame,
+                     text=f"Ex-Gaussian: μ {model['mu']:.0f} ms, σ {model['sigma']:.0f} ms, "
+                          f"τ {model['tau']:.0f} ms (slow tail) over {model['answers']} answers",
+                     font=("Arial", 9)).pack(anchor="w", pady=2)
     
     def create_level_tab(self, parent):
         """Create the level performance tab."""
-        stats = self.stats_manager.get_statistics()
+        stats = self.stats
         
         level_frame = ttk.Frame(parent)
         level_frame.pack(fill="both", expand=True, padx=10, pady=10)
@@ -194,7 +263,7 @@ class StatisticsMenu:
     
     def create_type_tab(self, parent):
         """Create the sequence type analysis tab."""
-        stats = self.stats_manager.get_statistics()
+        stats = self.stats
         
         type_frame = ttk.Frame(parent)
         type_frame.pack(fill="both", expand=True, padx=10, pady=10)
@@ -261,9 +330,9 @@ class StatisticsMenu:
     
     def create_mistakes_tab(self, parent):
         """Create the common mistakes tab."""
-        stats = self.stats_manager.get_statistics()
+        stats = self.stats
         
-        if not stats.get('top_mistakes'):
+        if not stats.get('top_pairs'):
             # Empty state
             empty_frame = ttk.Frame(parent)
             empty_frame.pack(expand=True)
@@ -283,32 +352,25 @@ class StatisticsMenu:
         ttk.Label(header_frame, text="Top 5 Most Confusing Character Pairs:", 
                  font=("Arial", 12, "bold")).pack(anchor="w")
         ttk.Label(header_frame, 
-                 text="These are the characters you most often mistake for each other.", 
+                 text="Changes you missed most often, and how often you miss them when shown.", 
                  font=("Arial", 9)).pack(anchor="w")
         
         # Create table
         table_frame = ttk.Frame(parent)
-        table_frame.pack(fill="both", expand=True)
+        table_frame.pack(fill="x")
         
         # Table headers
-        headers = ["Rank", "Characters", "Times Confused", "Difficulty Level"]
+        headers = ["Rank", "Characters", "Times Missed", "Miss Rate", "Difficulty Level"]
         for col, header in enumerate(headers):
             ttk.Label(table_frame, text=header, font=("Arial", 10, "bold"), 
                      borderwidth=1, relief="solid", padding=5).grid(
                 row=0, column=col, sticky="nsew", padx=1, pady=1)
         
         # Add data rows
-        for row, (mistake, count) in enumerate(stats['top_mistakes'], 1):
+        for row, (char1, char2, count, shown) in enumerate(stats['top_pairs'][:5], 1):
             # Rank with medal emojis
             rank_emoji = "🥇" if row == 1 else "🥈" if row == 2 else "🥉" if row == 3 else f"{row}"
             
-            # Split mistake (e.g., "O→0" becomes "O" and "0")
-            if "→" in mistake:
-                char1, char2 = mistake.split("→")
-                display_mistake = f"{char1} ⇄ {char2}"
-            else:
-                display_mistake = mistake
-            
             # Difficulty level based on count
             if count >= 10:
                 difficulty = "⚠️ Very Difficult"
@@ -328,26 +390,60 @@ class StatisticsMenu:
             char_frame = ttk.Frame(table_frame)
             char_frame.grid(row=row, column=1, sticky="nsew", padx=1, pady=1)
             
-            if "→" in mistake:
-                char1, char2 = mistake.split("→")
-                ttk.Label(char_frame, text=char1, font=("Courier", 12, "bold"), 
-                         foreground="red").pack(side="left", padx=2)
-                ttk.Label(char_frame, text="→", font=("Arial", 10)).pack(side="left", padx=2)
-                ttk.Label(char_frame, text=char2, font=("Courier", 12, "bold"), 
-                         foreground="blue").pack(side="left", padx=2)
+            ttk.Label(char_frame, text=char1, font=("Courier", 12, "bold"), 
+                     foreground="red").pack(side="left", padx=2)
+            ttk.Label(char_frame, text="→", font=("Arial", 10)).pack(side="left", padx=2)
+            ttk.Label(char_frame, text=char2, font=("Courier", 12, "bold"), 
+                     foreground="blue").pack(side="left", padx=2)
             
-            # Times confused
+            # Times missed
             ttk.Label(table_frame, text=str(count), padding=5).grid(
                 row=row, column=2, sticky="nsew", padx=1, pady=1)
             
+            # Miss rate
+            ttk.Label(table_frame, text=f"{count / shown * 100:.0f}% ({count}/{shown})", padding=5).grid(
+                row=row, column=3, sticky="nsew", padx=1, pady=1)
+            
             # Difficulty
             ttk.Label(table_frame, text=difficulty, padding=5, 
-                     foreground=color).grid(row=row, column=3, sticky="nsew", padx=1, pady=1)
+                     foreground=color).grid(row=row, column=4, sticky="nsew", padx=1, pady=1)
         
         # Configure grid weights
-        for i in range(4):
+        for i in range(5):
             table_frame.columnconfigure(i, weight=1)
         
+        # Characters you miss most often, whatever they were replaced with
+        hardest = [r for r in stats['char_miss_rates'] if r[1] > 0][:5]
+        if hardest:
+            chars_frame = ttk.LabelFrame(parent, text="Hardest Characters", padding=10)
+            chars_frame.pack(fill="x", pady=(15, 0), padx=5)
+            ttk.Label(chars_frame, 
+                     text="   ".join(f"{char}: {rate:.0f}% ({missed}/{shown})" 
+                                    for char, missed, shown, rate in hardest), 
+                     font=("Courier", 10)).pack(anchor="w")
+        
+        # Miss rate by changed position
+        positions = [p for p in stats['position_miss_rates'] if p[2] > 0]
+        if positions:
+            position_frame = ttk.LabelFrame(parent, text="Miss Rate by Position", padding=10)
+            position_frame.pack(fill="x", pady=(15, 0), padx=5)
+            
+            width, height = 700, 120
+            canvas = tk.Canvas(position_frame, width=width, height=height, bg="white", highlightthickness=0)
+            canvas.pack(fill="x")
+            
+            last = len(stats['position_miss_rates']) - 1
+            bar_width = width / len(positions)
+            for i, (position, missed, shown, rate) in enumerate(positions):
+                x0 = i * bar_width + 2
+                x1 = (i + 1) * bar_width - 2
+                bar_height = rate / 100 * (height - 30)
+                color = "red" if rate >= 40 else "orange" if rate >= 20 else "green"
+                canvas.create_rectangle(x0, height - 15 - bar_height, x1, height - 15, 
+                                       fill=color, outline="")
+                label = f"{position + 1}+" if position == last else str(position + 1)
+                canvas.create_text((x0 + x1) / 2, height - 7, text=label, font=("Arial", 7))
+        
         # Add practice tip
         tip_frame = ttk.LabelFrame(parent, text="💡 Practice Tip", padding=15)
         tip_frame.pack(fill="x", pady=20, padx=5)
@@ -360,11 +456,118 @@ class StatisticsMenu:
         ttk.Label(tip_frame, text=tip_text, font=("Arial", 9), 
                  wraplength=600).pack(anchor="w")
     
+    def create_trends_tab(self, parent):
+        """Create the trends tab with a daily/weekly line chart."""
+        stats = self.stats
+        self.trends = stats['trends']
+        
+        if not self.trends['daily']:
+            empty_frame = ttk.Frame(parent)
+            empty_frame.pack(expand=True)
+            
+            ttk.Label(empty_frame, text="📉", font=("Arial", 48)).pack(pady=10)
+            ttk.Label(empty_frame, text="No trends yet!", 
+                     font=("Arial", 16)).pack(pady=10)
+            ttk.Label(empty_frame, 
+                     text="Play on a few different days to see how you improve.", 
+                     font=("Arial", 10), foreground="gray").pack()
+            return
+        
+        # Period and metric selection
+        controls = ttk.Frame(parent)
+        controls.pack(fill="x", padx=5, pady=10)
+        
+        ttk.Label(controls, text="Period:", 
+                 font=("Arial", 10, "bold")).pack(side="left", padx=(0, 5))
+        self.trend_period = tk.StringVar(value="Daily")
+        period_box = ttk.Combobox(controls, textvariable=self.trend_period, 
+                                  values=["Daily", "Weekly"], state="readonly", width=10)
+        period_box.pack(side="left", padx=(0, 20))
+        
+        ttk.Label(controls, text="Metric:", 
+                 font=("Arial", 10, "bold")).pack(side="left", padx=(0, 5))
+        self.trend_metric = tk.StringVar(value="Accuracy")
+        metric_box = ttk.Combobox(controls, textvariable=self.trend_metric, 
+                                  values=list(TREND_METRICS), state="readonly", width=28)
+        metric_box.pack(side="left")
+        
+        period_box.bind("<<ComboboxSelected>>", lambda e: self.draw_trend())
+        metric_box.bind("<<ComboboxSelected>>", lambda e: self.draw_trend())
+        
+        self.trend_canvas = tk.Canvas(parent, width=700, height=300, bg="white", highlightthickness=0)
+        self.trend_canvas.pack(fill="both", expand=True, padx=5)
+        self.trend_canvas.bind("<Configure>", lambda e: self.draw_trend())
+        
+        self.trend_summary = ttk.Label(parent, font=("Arial", 9), foreground="gray")
+        self.trend_summary.pack(anchor="w", padx=5, pady=5)
+    
+    def draw_trend(self):
+        """Draw the selected trend series, downsampled to at most TREND_MAX_POINTS."""
+        canvas = self.trend_canvas
+        canvas.delete("all")
+        
+        points = self.trends[self.trend_period.get().lower()]
+        index, unit = TREND_METRICS[self.trend_metric.get()]
+        if not points:
+            return
+        
+        # Days on the x axis so gaps between sessions keep their width
+        series = lttb([(p[0].toordinal(), p[index]) for p in points], TREND_MAX_POINTS)
+        
+        width = max(canvas.winfo_width(), 200)
+        height = max(canvas.winfo_height(), 100)
+        left, right, top, bottom = 60, 20, 20, 30
+        
+        x_min, x_max = series[0][0], series[-1][0]
+        y_min = min(y for _, y in series)
+        y_max = max(y for _, y in series)
+        if unit == "%":
+            y_min, y_max = 0, 100
+        elif y_max == y_min:
+            y_max = y_min + 1
+        x_span = (x_max - x_min) or 1
+        
+        def to_canvas(x, y):
+            return (left + (x - x_min) / x_span * (width - left - right),
+                    height - bottom - (y - y_min) / (y_max - y_min) * (height - top - bottom))
+        
+        # Axes and labels
+        canvas.create_line(left, top, left, height - bottom, fill="gray")
+        canvas.create_line(left, height - bottom, width - right, height - bottom, fill="gray")
+        canvas.create_text(left - 5, top, text=f"{y_max:.0f}{unit}", anchor="e", font=("Arial", 8))
+        canvas.create_text(left - 5, height - bottom, text=f"{y_min:.0f}{unit}", anchor="e", font=("Arial", 8))
+        canvas.create_text(left, height - bottom + 12, text=points[0][0].isoformat(), 
+                          anchor="w", font=("Arial", 8))
+        canvas.create_text(width - right, height - bottom + 12, text=points[-1][0].isoformat(), 
+                          anchor="e", font=("Arial", 8))
+        
+        coords = [c for x, y in series for c in to_canvas(x, y)]
+        if len(series) > 1:
+            canvas.create_line(*coords, fill="#2a7ae2", width=2)
+        for x, y in series:
+            cx, cy = to_canvas(x, y)
+            canvas.create_oval(cx - 2, cy - 2, cx + 2, cy + 2, fill="#2a7ae2", outline="")
+        
+        shown = f"{len(series)} of {len(points)}" if len(series) < len(points) else str(len(points))
+        latest = points[-1]
+        self.trend_summary.config(
+            text=f"{shown} {self.trend_period.get().lower()} points  |  "
+                 f"Latest: {latest[1]} questions, {latest[2]:.1f}% accuracy, "
+                 f"median {latest[3]:.0f} ms, p90 {latest[4]:.0f} ms"
+        )
+    
+    def select_player(self, name):
+        """Load one player's statistics partition, or the combined totals."""
+        self.player = None if name == ALL_PLAYERS else name
+        self.stats_manager = StatisticsManager(self.player)
+        self.refresh()
+    
     def clear_statistics(self):
-        """Clear all statistics with confirmation."""
+        """Clear the shown statistics with confirmation."""
+        scope = f"statistics for {self.player}" if self.player else "all statistics"
         if messagebox.askyesno("Clear Statistics", 
-                              "Are you sure you want to clear all statistics?\nThis action cannot be undone."):
+                              f"Are you sure you want to clear {scope}?\nThis action cannot be undone."):
             self.stats_manager.clear_statistics()
             messagebox.showinfo("Statistics Cleared", 
-                              "All statistics have been cleared.")
-            self.setup_gui()
\ No newline at end of file
+                              f"{scope[0].upper()}{scope[1:]} have been cleared.")
+            self.refresh()
\ No newline at end of file